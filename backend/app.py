@@ -1,105 +1,92 @@
 from flask import Flask
 from flask_cors import CORS
+from config.compression import init_compression
 from config.database import init_db
-from routes.auth_routes import auth_bp
-from dotenv import load_dotenv
-import os
+from config.json_provider import init_json
+from config.logging_config import init_logging
+from config.query_stats import init_query_stats
+from config.settings import Config, check_secret_key
 from pathlib import Path
-from dotenv import load_dotenv
-load_dotenv()
-# Obtener la ruta del directorio actual
-BASE_DIR = Path(__file__).resolve().parent
-
-# Crear directorio para almacenar archivos subidos
-UPLOAD_FOLDER = BASE_DIR / 'uploads' / 'messages'
-UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
-
-# Cargar variables de entorno desde archivo .env en el directorio backend
-env_path = BASE_DIR / '.env'
-load_dotenv(dotenv_path=env_path)
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'tu-clave-secreta-aqui-cambiar-en-produccion')
-app.config['UPLOAD_FOLDER'] = str(UPLOAD_FOLDER)
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB máximo
-
-# Configuración de base de datos desde variables de entorno
-DB_USER = os.getenv('DB_USER', 'postgres')
-DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres123')
-DB_HOST = os.getenv('DB_HOST', 'localhost')
-DB_PORT = os.getenv('DB_PORT', '5433')  # Cambiar a 5433 si Docker usa ese puerto
-DB_NAME = os.getenv('DB_NAME', 'proyecto_db')
-
-# En Windows con Docker Desktop, mantener localhost ya que Docker mapea correctamente
-# No cambiar a 127.0.0.1 si ya es localhost
-if DB_HOST == 'localhost' and os.name == 'nt':
-    # En Windows, Docker Desktop mapea mejor con localhost
-    # Pero intentemos primero con localhost y luego con 127.0.0.1 si falla
-    pass
-
-# Construir URI de conexión con parámetros adicionales para Docker en Windows
-# Agregar parámetros para evitar problemas de conexión
-app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?connect_timeout=10'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-# Nota: SQLALCHEMY_ENGINE_OPTIONS se configura en database.py si es necesario
-
-# Mensaje de depuración (solo mostrar sin password por seguridad)
-print(f"[INFO] Conectando a PostgreSQL: postgresql://{DB_USER}:***@{DB_HOST}:{DB_PORT}/{DB_NAME}")
-
-CORS(app, origins=['http://localhost:3000'], supports_credentials=True)
-
-# Inicializar base de datos con manejo de errores
-try:
+import os
+
+
+def create_app(config=None):
+    """
+    Crea la aplicación Flask.
+    No abre conexiones ni ejecuta DDL: el esquema se verifica con `flask schema check`
+    y se crea con `flask schema create`.
+
+    config puede ser una clase/objeto de configuración o un diccionario con claves a sobrescribir.
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    check_secret_key(app.config)
+
+    # Primero el logging: lo usan las extensiones y los comandos
+    init_logging(app)
+    init_json(app)
+
+    # Crear directorio para almacenar archivos subidos
+    Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
+
+    # Antes que CORS y query_stats: los after_request corren en orden inverso y la compresión va última
+    init_compression(app)
+    CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
+
+    # Registra las extensiones; la primera conexión se abre en la primera consulta
     init_db(app)
-    print("[OK] Base de datos inicializada correctamente")
-except Exception as e:
-    error_msg = str(e)
-    print(f"[ERROR] Error al inicializar la base de datos:")
-    print(f"   Tipo: {type(e).__name__}")
-    print(f"   Mensaje: {error_msg}")
-    
-    # Verificar si es un error de conexión
-    if "could not connect" in error_msg.lower() or "connection refused" in error_msg.lower():
-        print("\n[INFO] Posibles soluciones:")
-        print("   1. Verifica que PostgreSQL esté corriendo: docker ps")
-        print("   2. Inicia PostgreSQL si no está corriendo: docker-compose up -d")
-        print("   3. Espera unos segundos después de iniciar Docker")
-        print("   4. Verifica los logs: docker logs proyecto_postgres")
-        print(f"   5. Prueba conectarte manualmente: psql -h localhost -U postgres -d proyecto_db")
-    elif "authentication failed" in error_msg.lower():
-        print("\n[INFO] Error de autenticación - Verifica las credenciales en .env")
-    elif "database" in error_msg.lower() and "does not exist" in error_msg.lower():
-        print("\n[INFO] La base de datos no existe - El contenedor debería crearla automáticamente")
-    
-    raise
-
-# Registrar rutas
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-
-# Registrar rutas de administración
-from routes.admin_routes import admin_bp
-app.register_blueprint(admin_bp, url_prefix='/api/admin')
-
-# Registrar rutas de mentores
-from routes.mentor_routes import mentor_bp
-app.register_blueprint(mentor_bp, url_prefix='/api/mentor')
-
-# Registrar rutas de usuario (perfil propio)
-from routes.user_routes import user_bp
-app.register_blueprint(user_bp, url_prefix='/api/user')
-
-# Registrar rutas de IA (Gemini)
-from routes.ai_routes import ai_bp
-app.register_blueprint(ai_bp, url_prefix='/api')
-
-# Registrar rutas de ventas
-from routes.sales_routes import sales_bp
-app.register_blueprint(sales_bp, url_prefix='/api/sales')
-
-@app.route('/')
-def index():
-    return {'message': 'API funcionando correctamente'}
+    init_query_stats(app)
 
-if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    register_blueprints(app)
+
+    from commands import register_commands
+    register_commands(app)
+
+    @app.route('/')
+    def index():
+        return {'message': 'API funcionando correctamente'}
 
+    return app
+
+
+def register_blueprints(app):
+    """Importa y registra las rutas solo cuando se construye la aplicación"""
+    from routes.auth_routes import auth_bp
+    from routes.admin_routes import admin_bp
+    from routes.mentor_routes import mentor_bp
+    from routes.user_routes import user_bp
+    from routes.ai_routes import ai_bp
+    from routes.sales_routes import sales_bp
+    from routes.internal_routes import internal_bp
+
+    # Registrar rutas
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+
+    # Registrar rutas de administración
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+
+    # Registrar rutas de mentores
+    app.register_blueprint(mentor_bp, url_prefix='/api/mentor')
+
+    # Registrar rutas de usuario (perfil propio)
+    app.register_blueprint(user_bp, url_prefix='/api/user')
+
+    # Registrar rutas de IA (Gemini)
+    app.register_blueprint(ai_bp, url_prefix='/api')
+
+    # Registrar rutas de ventas
+    app.register_blueprint(sales_bp, url_prefix='/api/sales')
+
+    # Registrar rutas internas de operación (telemetría)
+    app.register_blueprint(internal_bp, url_prefix='/api/internal')
+
+
+if __name__ == '__main__':
+    # Servidor de desarrollo. En producción: gunicorn -c gunicorn.conf.py wsgi:app
+    app = create_app()
+    app.run(debug=app.config['DEBUG'], port=int(os.getenv('PORT', '5000')))
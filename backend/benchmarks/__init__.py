@@ -0,0 +1 @@
+# Paquete de benchmarks: datos sintéticos (seed.py) y generador de carga (run.py)
@@ -0,0 +1,104 @@
+"""
+Logins por segundo según el costo de bcrypt.
+
+Cada "login" es una verificación de contraseña a través de config/password_hasher.py, con el
+mismo pool acotado que usa la API (la consulta del usuario es despreciable frente a bcrypt).
+Para cada costo reporta logins/s, latencia p50/p95 y cuántas peticiones se rechazaron con 503
+por cola llena. Sirve para elegir BCRYPT_LOG_ROUNDS y HASH_POOL_WORKERS en un hardware dado.
+
+Uso (desde backend/, no necesita base de datos):
+    python -m benchmarks.hashing --costs 10,11,12,13 --workers 2 --concurrency 16 --duration 10
+    python -m benchmarks.hashing --costs 12 --workers 0     # bcrypt en el hilo, como antes
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.run import percentile
+from config.password_hasher import HasherBusy, PasswordHasher, _hash
+
+PASSWORD = 'benchmark123'
+
+
+def measure(cost, args):
+    hasher = PasswordHasher()
+    hasher.configure(rounds=cost, workers=args.workers, queue_limit=args.queue_limit, timeout=args.timeout)
+    password_hash = _hash(PASSWORD, cost)
+    hasher.check(password_hash, PASSWORD)  # arrancar los procesos fuera de la medición
+
+    lock = threading.Lock()
+    latencies = []
+    rejected = [0]
+    deadline = time.perf_counter() + args.duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                hasher.check(password_hash, PASSWORD)
+            except HasherBusy:
+                with lock:
+                    rejected[0] += 1
+                # Un cliente real espera Retry-After; aquí basta con no girar en vacío
+                time.sleep(0.05)
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+
+    latencies.sort()
+    return {
+        'cost': cost,
+        'logins': len(latencies),
+        'logins_per_s': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'rejected_503': rejected[0],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Logins/s por costo de bcrypt')
+    parser.add_argument('--costs', default='10,11,12,13')
+    parser.add_argument('--workers', type=int, default=2, help='HASH_POOL_WORKERS (0 = en el hilo)')
+    parser.add_argument('--queue-limit', type=int, default=16, help='HASH_QUEUE_LIMIT')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16, help='Peticiones de login simultáneas')
+    parser.add_argument('--duration', type=float, default=10, help='Segundos por costo')
+    parser.add_argument('--output', default=None, help='Guardar resultados en JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    for cost in (int(c) for c in args.costs.split(',')):
+        print(f"[INFO] Costo {cost}: {args.workers} procesos, cola {args.queue_limit}, "
+              f"{args.concurrency} clientes, {args.duration} s")
+        results.append(measure(cost, args))
+
+    print(f"\n| costo | logins/s | p50 (ms) | p95 (ms) | rechazos 503 |")
+    print("|---|---|---|---|---|")
+    for row in results:
+        print(f"| {row['cost']} | {row['logins_per_s']} | {row['p50_ms']} | {row['p95_ms']} | {row['rejected_503']} |")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({'workers': args.workers, 'queue_limit': args.queue_limit,
+                                      'concurrency': args.concurrency, 'results': results}, indent=2))
+        print(f"\n[OK] Resultados guardados en {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+CPU de codificación JSON para respuestas grandes.
+
+Compara, sobre los mismos datos sintéticos:
+- antes:   valores convertidos en Python (float(), isoformat()) como hacían los to_dict y el
+           proveedor por defecto de Flask (claves ordenadas, ensure_ascii)
+- json:    config/json_provider.py con JSON_PROVIDER=json (stdlib, tipos nativos)
+- orjson:  config/json_provider.py con JSON_PROVIDER=orjson
+Cargas: una conversación completa, las ventas de un año de una usuaria y listados de usuarios
+de admin (una página y un volcado completo).
+
+Uso (desde backend/, no necesita base de datos):
+    python -m benchmarks.json_encoding --repeat 20
+    python -m benchmarks.json_encoding --messages 20000 --users 50000 --output benchmarks/results/json.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from config.json_provider import FastJSONProvider, orjson
+
+
+def _message(i, start):
+    return {
+        'id': i, 'user_id': 7, 'mentor_id': 3, 'sender_id': 7 if i % 2 else 3,
+        'content': f'Mensaje {i}: ¿cómo vamos con las ventas de esta semana? ' * (1 + i % 3),
+        'file_name': None, 'file_path': None, 'file_type': None, 'file_size': None,
+        'is_read': bool(i % 5), 'created_at': start + timedelta(minutes=7 * i),
+    }
+
+
+def _sale(i, start):
+    units = 1 + i % 40
+    price = Decimal('19.90') + Decimal(i % 13)
+    cost = Decimal('7.35') + Decimal(i % 5)
+    return {
+        'id': i, 'user_id': 7, 'sale_date': start + timedelta(days=i % 365),
+        'product_name': f'Producto {i % 17}', 'units_sold': units,
+        'price_per_unit': price, 'variable_cost_per_unit': cost,
+        'revenue': units * price, 'total_variable_costs': units * cost,
+        'gross_profit': units * (price - cost),
+        'created_at': datetime(2024, 1, 1) + timedelta(hours=i), 'updated_at': datetime(2024, 1, 1) + timedelta(hours=i),
+    }
+
+
+def _user(i, start):
+    mentor = 1 + i % 50
+    return {
+        'id': 100 + i, 'username': f'emprendedora{i}', 'email': f'emprendedora{i}@example.com',
+        'role': 'user', 'mentor_id': mentor,
+        'mentor': {'id': mentor, 'username': f'mentora{mentor}', 'email': f'mentora{mentor}@example.com', 'role': 'mentor'},
+        'business': {'name': f'Emprendimiento {i}', 'category': 'Alimentos', 'description': 'Panadería artesanal'},
+        'assigned_users_count': None, 'created_at': start + timedelta(minutes=i),
+    }
+
+
+def _preconverted(value):
+    """Lo que hacían los to_dict: cada Decimal y fecha convertido en Python antes de codificar"""
+    if isinstance(value, dict):
+        return {k: _preconverted(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_preconverted(v) for v in value]
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def build_payloads(args):
+    start = datetime(2024, 1, 1, 8, 30)
+    return {
+        'conversación': {'messages': [_message(i, start) for i in range(args.messages)], 'total': args.messages},
+        'ventas del año': {'sales': [_sale(i, date(2024, 1, 1)) for i in range(args.sales)]},
+        'usuarios (página)': {'users': [_user(i, start) for i in range(200)], 'next_cursor': 'abc', 'has_more': True},
+        'usuarios (todos)': {'users': [_user(i, start) for i in range(args.users)], 'total': args.users},
+    }
+
+
+def _encoders():
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    encoders = {'antes': lambda obj: default.response(_preconverted(obj)).get_data()}
+    app.config['JSON_PROVIDER'] = 'json'
+    stdlib = FastJSONProvider(app)
+    encoders['json'] = lambda obj: stdlib.response(obj).get_data()
+    if orjson is not None:
+        app.config['JSON_PROVIDER'] = 'orjson'
+        fast = FastJSONProvider(app)
+        encoders['orjson'] = lambda obj: fast.response(obj).get_data()
+    return app, encoders
+
+
+def measure(encode, payload, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode(payload)
+        timings.append(time.perf_counter() - start)
+        size = len(body)
+    return statistics.median(timings), size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Tiempo de codificación JSON por proveedor')
+    parser.add_argument('--messages', type=int, default=5000, help='Mensajes de la conversación')
+    parser.add_argument('--sales', type=int, default=365, help='Ventas del listado')
+    parser.add_argument('--users', type=int, default=10000, help='Usuarios del volcado completo')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', default=None, help='Guardar resultados en JSON')
+    args = parser.parse_args(argv)
+
+    if orjson is None:
+        print("[WARN] orjson no está instalado (pip install -r requirements.txt); se mide solo la stdlib")
+
+    app, encoders = _encoders()
+    payloads = build_payloads(args)
+    results = []
+    with app.app_context():
+        for name, payload in payloads.items():
+            row = {'payload': name}
+            for encoder_name, encode in encoders.items():
+                median, size = measure(encode, payload, args.repeat)
+                row[f'{encoder_name}_ms'] = round(median * 1000, 2)
+                row[f'{encoder_name}_kb'] = round(size / 1024, 1)
+            results.append(row)
+
+    names = list(encoders)
+    print("\n| respuesta | KB | " + " | ".join(f"{n} (ms)" for n in names) + " | mejora |")
+    print("|---|---|" + "---|" * len(names) + "---|")
+    for row in results:
+        best = row[f'{names[-1]}_ms']
+        speedup = f"{row['antes_ms'] / best:.1f}x" if best else '-'
+        print(f"| {row['payload']} | {row[f'{names[-1]}_kb']} | "
+              + " | ".join(str(row[f'{n}_ms']) for n in names) + f" | {speedup} |")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({'args': vars(args), 'results': results}, indent=2, ensure_ascii=False))
+        print(f"\n[OK] Resultados guardados en {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Generador de carga para la API.
+
+Recorre los endpoints de cada blueprint (auth, admin, bi, sales, mentor, user) con clientes
+concurrentes y reporta latencia p50/p95/p99, throughput, errores y consultas SQL por petición
+(header X-Query-Count, ver config/query_stats.py). Usa los ids del manifest que escribe
+benchmarks.seed, así dos ejecuciones con la misma semilla son comparables entre releases.
+
+Uso (desde backend/, con la API corriendo):
+    python -m benchmarks.run --base-url http://localhost:5000 --concurrency 16 --duration 30
+    python -m benchmarks.run --blueprints sales,mentor --output results/v1.2.json
+    python -m benchmarks.run --compare results/v1.1.json --output results/v1.2.json
+
+Los endpoints de IA (/api/ai/*) no se incluyen porque dependen de un servicio externo.
+
+Las rutas protegidas reciben un token firmado con el SECRET_KEY de la configuración (el mismo
+.env que usa la API), emitido localmente para no medir un login por petición.
+"""
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks.seed import MANIFEST_PATH
+from config.settings import Config
+from controllers.auth_controller import issue_token
+
+
+class Scenario:
+    """Un endpoint a medir: build(ctx, rng) devuelve (path, body) o (path, body, id del usuario autenticado)"""
+
+    def __init__(self, blueprint, name, method, build, weight=1):
+        self.blueprint = blueprint
+        self.name = name
+        self.method = method
+        self.build = build
+        self.weight = weight
+
+
+def _user(ctx, rng):
+    return rng.randint(*ctx['user_ids'])
+
+
+def _mentor(ctx, rng):
+    return rng.randint(*ctx['mentor_ids'])
+
+
+def _pair(ctx, rng):
+    pairs = ctx['assigned_pairs_sample']
+    return tuple(rng.choice(pairs)) if pairs else (_user(ctx, rng), _mentor(ctx, rng))
+
+
+def _month(ctx, rng):
+    return ctx['today'][:7]
+
+
+class TokenCache:
+    """Tokens por usuario, con el rol y mentor que tendrían tras un login real"""
+
+    def __init__(self, ctx, secret_key):
+        self.ctx = ctx
+        self.secret_key = secret_key
+        self.assignment = {user_id: mentor_id for user_id, mentor_id in ctx['assigned_pairs_sample']}
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def role_of(self, user_id):
+        if user_id == self.ctx['admin_id']:
+            return 'admin'
+        low, high = self.ctx['mentor_ids']
+        return 'mentor' if low <= user_id <= high else 'user'
+
+    def get(self, user_id):
+        with self._lock:
+            token = self._tokens.get(user_id)
+            if token is None:
+                token = issue_token(user_id, self.role_of(user_id), self.assignment.get(user_id),
+                                    secret_key=self.secret_key)
+                self._tokens[user_id] = token
+            return token
+
+
+def _as_user(template, user_id):
+    return template.format(user_id), None, user_id
+
+
+def _mentor_messages(ctx, rng):
+    user_id, mentor_id = _pair(ctx, rng)
+    return f'/api/mentor/messages?user_id={user_id}', None, mentor_id
+
+
+SCENARIOS = [
+    # auth
+    Scenario('auth', 'login', 'POST', lambda c, r: (
+        '/api/auth/login', {'username': f'user{_user(c, r)}', 'password': c['password']}), weight=2),
+
+    # admin
+    Scenario('admin', 'users_list', 'GET', lambda c, r: ('/api/admin/users', None, c['admin_id'])),
+    Scenario('admin', 'user_detail', 'GET', lambda c, r: (
+        f'/api/admin/users/{_user(c, r)}', None, c['admin_id']), weight=3),
+    Scenario('admin', 'mentors_list', 'GET', lambda c, r: ('/api/admin/mentors', None, c['admin_id'])),
+    Scenario('admin', 'mentor_users', 'GET', lambda c, r: (
+        f'/api/admin/mentors/{_mentor(c, r)}/users', None, c['admin_id']), weight=2),
+
+    # bi
+    Scenario('bi', 'statistics', 'GET', lambda c, r: ('/api/admin/bi/statistics', None, c['admin_id'])),
+    Scenario('bi', 'mentor_performance', 'GET', lambda c, r: (
+        '/api/admin/bi/mentor-performance', None, c['admin_id'])),
+
+    # sales
+    Scenario('sales', 'parameters', 'GET', lambda c, r: (
+        f'/api/sales/parameters/{_user(c, r)}?month_year={_month(c, r)}', None), weight=3),
+    Scenario('sales', 'sales_month', 'GET', lambda c, r: (
+        f'/api/sales/sales/{_user(c, r)}?month_year={_month(c, r)}', None), weight=3),
+    Scenario('sales', 'report', 'GET', lambda c, r: (
+        f'/api/sales/report/{_user(c, r)}?month_year={_month(c, r)}', None), weight=3),
+    Scenario('sales', 'create_sale', 'POST', lambda c, r: (f'/api/sales/sales/{_user(c, r)}', {
+        'sale_date': c['today'], 'units_sold': r.randint(1, 50),
+        'price_per_unit': 25.5, 'variable_cost_per_unit': 11.0, 'product_name': 'Bench'}), weight=2),
+
+    # mentor (la identidad sale del token)
+    Scenario('mentor', 'my_users', 'GET', lambda c, r: ('/api/mentor/my-users', None, _mentor(c, r)), weight=2),
+    Scenario('mentor', 'conversations', 'GET', lambda c, r: (
+        '/api/mentor/conversations', None, _mentor(c, r)), weight=2),
+    Scenario('mentor', 'invitations', 'GET', lambda c, r: ('/api/mentor/invitations', None, _mentor(c, r))),
+    Scenario('mentor', 'messages', 'GET', lambda c, r: _mentor_messages(c, r), weight=3),
+
+    # user
+    Scenario('user', 'profile', 'GET', lambda c, r: _as_user('/api/user/profile/{}', _user(c, r)), weight=3),
+    Scenario('user', 'invitations', 'GET', lambda c, r: _as_user('/api/user/mentor-invitations/{}', _user(c, r))),
+    Scenario('user', 'messages', 'GET', lambda c, r: _as_user('/api/user/messages/{}', _pair(c, r)[0]), weight=3),
+    Scenario('user', 'unread_count', 'GET', lambda c, r: _as_user(
+        '/api/user/messages/unread-count/{}', _pair(c, r)[0]), weight=3),
+]
+
+
+class Results:
+    """Muestras por escenario, protegidas por un lock (los hilos agregan en paralelo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+
+    def add(self, key, latency, status, query_count, size):
+        with self._lock:
+            self.latencies[key].append(latency)
+            self.bytes[key] += size
+            if query_count is not None:
+                self.queries[key].append(query_count)
+            if status >= 400:
+                self.errors[key] += 1
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def connect(base):
+    if base.scheme == 'https':
+        return http.client.HTTPSConnection(base.hostname, base.port or 443, timeout=60)
+    return http.client.HTTPConnection(base.hostname, base.port or 80, timeout=60)
+
+
+def worker(base, scenarios, weights, ctx, tokens, results, deadline, seed):
+    rng = random.Random(seed)
+    conn = connect(base)
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        path, body, *identity = scenario.build(ctx, rng)
+        headers = {'Accept': 'application/json', 'Accept-Encoding': 'identity'}
+        if identity:
+            headers['Authorization'] = f'Bearer {tokens.get(identity[0])}'
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        start = time.perf_counter()
+        try:
+            conn.request(scenario.method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+            latency = time.perf_counter() - start
+            query_count = response.getheader('X-Query-Count')
+            results.add(f'{scenario.blueprint}.{scenario.name}', latency, response.status,
+                        int(query_count) if query_count else None, len(data))
+        except (OSError, http.client.HTTPException):
+            results.add(f'{scenario.blueprint}.{scenario.name}', time.perf_counter() - start, 599, None, 0)
+            conn.close()
+            conn = connect(base)
+    conn.close()
+
+
+def summarize(results, elapsed):
+    summary = {}
+    for key in sorted(results.latencies):
+        values = sorted(results.latencies[key])
+        queries = results.queries.get(key) or []
+        summary[key] = {
+            'requests': len(values),
+            'errors': results.errors.get(key, 0),
+            'rps': round(len(values) / elapsed, 2),
+            'p50_ms': round(percentile(values, 50) * 1000, 2),
+            'p95_ms': round(percentile(values, 95) * 1000, 2),
+            'p99_ms': round(percentile(values, 99) * 1000, 2),
+            'avg_queries': round(sum(queries) / len(queries), 2) if queries else None,
+            'avg_kb': round(results.bytes[key] / len(values) / 1024, 2) if values else 0,
+        }
+    return summary
+
+
+def print_table(summary, baseline=None):
+    header = f"{'endpoint':32} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'sql/req':>8} {'KB':>8}"
+    print(header)
+    print('-' * len(header))
+    for key, row in summary.items():
+        line = (f"{key:32} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8} {row['p50_ms']:>8} "
+                f"{row['p95_ms']:>8} {row['p99_ms']:>8} {str(row['avg_queries']):>8} {row['avg_kb']:>8}")
+        if baseline and key in baseline:
+            before = baseline[key]['p95_ms']
+            if before:
+                line += f"   p95 {((row['p95_ms'] - before) / before * 100):+.1f}%"
+        print(line)
+
+
+def run(args):
+    manifest_path = Path(args.manifest)
+    if not manifest_path.exists():
+        print(f"[ERROR] No existe {manifest_path}. Ejecuta primero: python -m benchmarks.seed --truncate")
+        return 1
+    ctx = json.loads(manifest_path.read_text())
+
+    blueprints = set(args.blueprints.split(',')) if args.blueprints else None
+    scenarios = [s for s in SCENARIOS if blueprints is None or s.blueprint in blueprints]
+    if not scenarios:
+        print("[ERROR] No hay escenarios para los blueprints indicados")
+        return 1
+    weights = [s.weight for s in scenarios]
+
+    base = urlsplit(args.base_url)
+    tokens = TokenCache(ctx, args.secret_key)
+    results = Results()
+    print(f"[INFO] {len(scenarios)} escenarios, {args.concurrency} clientes, {args.duration} s contra {args.base_url}")
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(base, scenarios, weights, ctx, tokens, results, deadline, args.seed + i))
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results, elapsed)
+    total = sum(row['requests'] for row in summary.values())
+    baseline = json.loads(Path(args.compare).read_text())['endpoints'] if args.compare else None
+    print_table(summary, baseline)
+    print(f"\n[OK] {total} peticiones en {elapsed:.1f} s ({total / elapsed:.1f} req/s)")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({
+            'base_url': args.base_url,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'seed': args.seed,
+            'manifest_seed': ctx.get('seed'),
+            'total_rps': round(total / elapsed, 2),
+            'endpoints': summary,
+        }, indent=2))
+        print(f"[OK] Resultados guardados en {output}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de la API por blueprint')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30, help='Segundos de carga')
+    parser.add_argument('--blueprints', default=None, help='Lista separada por comas (auth,admin,bi,sales,mentor,user)')
+    parser.add_argument('--manifest', default=str(MANIFEST_PATH))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--secret-key', default=Config.SECRET_KEY,
+                        help='SECRET_KEY de la API para firmar tokens (por defecto el de .env)')
+    parser.add_argument('--output', default=None, help='Guardar resultados en JSON')
+    parser.add_argument('--compare', default=None, help='JSON de una ejecución anterior para comparar p95')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(run(parse_args()))
@@ -0,0 +1,326 @@
+"""
+Generador de datos sintéticos para benchmarks.
+
+Inserta con COPY (psycopg2.copy_expert) en bloques generados al vuelo, así la memoria no crece
+con el volumen. Con la misma semilla genera exactamente los mismos datos.
+
+Uso (desde backend/):
+    python -m benchmarks.seed --truncate
+    python -m benchmarks.seed --truncate --users 50000 --mentors 500 --sales 5000000 --messages 10000000
+
+ATENCIÓN: --truncate vacía users y todas las tablas que dependen de ella o se derivan de sus datos
+(TRUNCATE_TABLES). Usar solo contra una base local de pruebas.
+
+Al terminar siembra mentor_conversations desde los mensajes y reconstruye las tablas resumen de
+BI (como `flask --app app bi refresh --full`).
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+MANIFEST_PATH = RESULTS_DIR / 'seed_manifest.json'
+
+BENCHMARK_PASSWORD = 'benchmark123'
+
+CATEGORIES = [
+    'Alimentos', 'Artesanía', 'Textil', 'Belleza', 'Tecnología',
+    'Comercio', 'Servicios', 'Agricultura', 'Educación', 'Turismo'
+]
+PRODUCTS = ['Pan', 'Tortas', 'Chompas', 'Collares', 'Jabones', 'Queso', 'Café', 'Miel', 'Tejidos', 'Cerámica']
+FILE_TYPES = [
+    ('pdf', 'application/pdf'),
+    ('docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    ('txt', 'text/plain'),
+]
+MESSAGE_SNIPPETS = [
+    'Hola, ¿cómo van las ventas esta semana?',
+    'Te comparto el plan de costos que revisamos.',
+    'Subí los precios un 5% y las ventas se mantuvieron.',
+    'Revisa el flujo de caja antes de pedir el crédito.',
+    'Gracias por la recomendación, la aplicaré mañana.',
+    '¿Podemos revisar la meta mensual?',
+]
+
+
+class IteratorFile(io.TextIOBase):
+    """Adapta un generador de líneas a un objeto tipo archivo para COPY ... FROM STDIN"""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def _tsv(*values):
+    """Formato text de COPY: tabuladores, \\N para NULL"""
+    out = []
+    for value in values:
+        if value is None:
+            out.append('\\N')
+        else:
+            out.append(str(value).replace('\\', '\\\\').replace('\t', ' ').replace('\n', ' '))
+    return '\t'.join(out) + '\n'
+
+
+def copy_rows(cursor, table, columns, lines):
+    start = time.perf_counter()
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)",
+        IteratorFile(lines),
+        size=1 << 16
+    )
+    print(f"[OK] {table}: {cursor.rowcount} filas en {time.perf_counter() - start:.1f} s")
+
+
+class SyntheticData:
+    """Plan de ids y generadores deterministas para cada tabla"""
+
+    def __init__(self, users, mentors, sales, messages, invitations, seed, today=None):
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.today = today or date.today()
+        self.now = datetime.combine(self.today, datetime.min.time())
+
+        # ids: 1 = admin, luego mentores, luego emprendedoras
+        self.admin_id = 1
+        self.mentor_ids = range(2, 2 + mentors)
+        self.user_ids = range(2 + mentors, 2 + mentors + users)
+        self.sales = sales
+        self.messages = messages
+        self.invitations = invitations
+
+        # ~70% de emprendedoras con mentora, con carga desigual entre mentoras
+        self.assignment = {}
+        mentor_list = list(self.mentor_ids)
+        weights = [self.rng.uniform(0.2, 1.0) for _ in mentor_list]
+        for user_id in self.user_ids:
+            if mentor_list and self.rng.random() < 0.7:
+                self.assignment[user_id] = self.rng.choices(mentor_list, weights)[0]
+
+    def _created_at(self):
+        return self.now - timedelta(days=self.rng.randint(0, 730), seconds=self.rng.randint(0, 86399))
+
+    def _clamp(self, moment):
+        """Ninguna fecha sembrada queda en el futuro (adelantaría las marcas de agua de BI y exportación)"""
+        return min(moment, self.now)
+
+    def users(self, password_hash):
+        created = self.now - timedelta(days=800)
+        yield _tsv(self.admin_id, 'admin', 'admin@proyecto.com', password_hash, 'admin', None,
+                   None, None, None, created, created)
+        for mentor_id in self.mentor_ids:
+            created = self._created_at()
+            yield _tsv(mentor_id, f'mentor{mentor_id}', f'mentor{mentor_id}@bench.local', password_hash,
+                       'mentor', None, None, self.rng.choice(CATEGORIES), None, created, created)
+        for user_id in self.user_ids:
+            category = self.rng.choice(CATEGORIES)
+            created = self._created_at()
+            yield _tsv(user_id, f'user{user_id}', f'user{user_id}@bench.local', password_hash,
+                       'user', self.assignment.get(user_id),
+                       f'{self.rng.choice(PRODUCTS)} {user_id}', category,
+                       f'Emprendimiento de {category.lower()} con venta directa y por redes sociales',
+                       created, created)
+
+    def daily_sales(self):
+        per_user = max(1, self.sales // max(1, len(self.user_ids)))
+        remaining = self.sales
+        sale_id = 1
+        for user_id in self.user_ids:
+            if remaining <= 0:
+                break
+            price = round(self.rng.uniform(5, 120), 2)
+            cost = round(price * self.rng.uniform(0.3, 0.8), 2)
+            count = min(per_user, remaining)
+            for day in range(count):
+                sale_date = self.today - timedelta(days=day)
+                created = self._clamp(datetime.combine(sale_date, datetime.min.time()) + timedelta(hours=20))
+                yield _tsv(sale_id, user_id, sale_date, self.rng.choice(PRODUCTS), self.rng.randint(0, 60),
+                           price, cost, created, created)
+                sale_id += 1
+            remaining -= count
+
+    def monthly_parameters(self):
+        month_year = self.today.strftime('%Y-%m')
+        for index, user_id in enumerate(self.user_ids, start=1):
+            price = round(self.rng.uniform(5, 120), 2)
+            yield _tsv(index, user_id, self.rng.randint(100, 1500), round(self.rng.uniform(200, 3000), 2),
+                       round(self.rng.uniform(0, 800), 2), self.rng.choice([22, 26, 30]), price,
+                       round(price * 0.5, 2), month_year, self.now, self.now)
+
+    def mentor_messages(self):
+        pairs = list(self.assignment.items())
+        if not pairs:
+            return
+        per_pair = max(1, self.messages // len(pairs))
+        remaining = self.messages
+        message_id = 1
+        for user_id, mentor_id in pairs:
+            if remaining <= 0:
+                break
+            count = min(per_pair, remaining)
+            created = self.now - timedelta(days=self.rng.randint(30, 365))
+            for _ in range(count):
+                created += timedelta(minutes=self.rng.randint(5, 2000))
+                sender = user_id if self.rng.random() < 0.55 else mentor_id
+                if self.rng.random() < 0.1:
+                    ext, mime = self.rng.choice(FILE_TYPES)
+                    file_values = (f'documento_{message_id}.{ext}', f'uploads/messages/bench_{message_id}.{ext}',
+                                   mime, self.rng.randint(2_000, 4_000_000))
+                    content = None if self.rng.random() < 0.5 else self.rng.choice(MESSAGE_SNIPPETS)
+                else:
+                    file_values = (None, None, None, None)
+                    content = self.rng.choice(MESSAGE_SNIPPETS)
+                sent = self._clamp(created)
+                yield _tsv(message_id, user_id, mentor_id, sender, content, *file_values,
+                           sent < self.now - timedelta(days=2), sent, sent)
+                message_id += 1
+            remaining -= count
+
+    def mentor_invitations(self):
+        mentor_list = list(self.mentor_ids)
+        if not mentor_list:
+            return
+        invitation_id = 1
+        for user_id in self.rng.sample(list(self.user_ids), min(self.invitations, len(self.user_ids))):
+            created = self._created_at()
+            if user_id in self.assignment:
+                status, mentor_id = 'accepted', self.assignment[user_id]
+                responded = self._clamp(created + timedelta(hours=self.rng.randint(1, 96)))
+            else:
+                status, mentor_id = self.rng.choice(['pending', 'rejected']), self.rng.choice(mentor_list)
+                responded = None if status == 'pending' else self._clamp(created + timedelta(hours=self.rng.randint(1, 200)))
+            yield _tsv(invitation_id, user_id, mentor_id, status, 'Me gustaría recibir mentoría', created, responded,
+                       responded or created)
+            invitation_id += 1
+
+    def manifest(self):
+        return {
+            'seed': self.seed,
+            'generated_at': datetime.utcnow().isoformat(),
+            'today': self.today.isoformat(),
+            'password': BENCHMARK_PASSWORD,
+            'admin_id': self.admin_id,
+            'mentor_ids': [self.mentor_ids.start, self.mentor_ids.stop - 1],
+            'user_ids': [self.user_ids.start, self.user_ids.stop - 1],
+            'assigned_pairs_sample': list(self.assignment.items())[:2000],
+            'sales': self.sales,
+            'messages': self.messages,
+            'invitations': self.invitations,
+        }
+
+
+TABLE_COLUMNS = {
+    'users': ['id', 'username', 'email', 'password_hash', 'role', 'mentor_id',
+              'business_name', 'business_category', 'business_description', 'created_at', 'updated_at'],
+    'daily_sales': ['id', 'user_id', 'sale_date', 'product_name', 'units_sold',
+                    'price_per_unit', 'variable_cost_per_unit', 'created_at', 'updated_at'],
+    'monthly_parameters': ['id', 'user_id', 'target_monthly_sales', 'fixed_costs_monthly',
+                           'loan_monthly_payment', 'working_days_per_month', 'default_price_per_unit',
+                           'default_variable_cost_per_unit', 'month_year', 'created_at', 'updated_at'],
+    'mentor_messages': ['id', 'user_id', 'mentor_id', 'sender_id', 'content', 'file_name',
+                        'file_path', 'file_type', 'file_size', 'is_read', 'created_at', 'updated_at'],
+    'mentor_invitations': ['id', 'user_id', 'mentor_id', 'status', 'message', 'created_at', 'responded_at',
+                           'updated_at'],
+}
+
+# Tablas sembradas, las que dependen de users y las derivadas (rollups, cubo, marcas de exportación)
+TRUNCATE_TABLES = (
+    'mentor_messages', 'mentor_conversations', 'mentor_invitations', 'daily_sales', 'monthly_parameters',
+    'user_purges', 'bi_user_facts', 'bi_signups_daily', 'bi_role_category', 'bi_mentor_load',
+    'bi_rollup_state', 'bi_snapshots', 'sales_user_month', 'sales_cube', 'export_watermarks', 'users',
+)
+
+
+def seed(args):
+    from app import create_app
+    from config.database import db, bcrypt
+    from models.bi_rollup import refresh_rollups
+
+    app = create_app()
+    data = SyntheticData(args.users, args.mentors, args.sales, args.messages, args.invitations, args.seed)
+
+    with app.app_context():
+        password_hash = bcrypt.generate_password_hash(BENCHMARK_PASSWORD).decode('utf-8')
+        raw = db.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            if args.truncate:
+                cursor.execute(f"TRUNCATE {', '.join(TRUNCATE_TABLES)} RESTART IDENTITY CASCADE")
+            else:
+                cursor.execute("SELECT COUNT(*) FROM users")
+                if cursor.fetchone()[0]:
+                    print("[ERROR] La tabla users no está vacía. Usa --truncate sobre una base de pruebas")
+                    return 1
+
+            copy_rows(cursor, 'users', TABLE_COLUMNS['users'], data.users(password_hash))
+            copy_rows(cursor, 'monthly_parameters', TABLE_COLUMNS['monthly_parameters'], data.monthly_parameters())
+            copy_rows(cursor, 'daily_sales', TABLE_COLUMNS['daily_sales'], data.daily_sales())
+            copy_rows(cursor, 'mentor_invitations', TABLE_COLUMNS['mentor_invitations'], data.mentor_invitations())
+            copy_rows(cursor, 'mentor_messages', TABLE_COLUMNS['mentor_messages'], data.mentor_messages())
+            # Versión de cada conversación para el ETag, como la siembra la migración 0014
+            cursor.execute("""
+                INSERT INTO mentor_conversations (user_id, mentor_id, version, updated_at)
+                SELECT user_id, mentor_id, COUNT(*), MAX(created_at)
+                FROM mentor_messages
+                GROUP BY user_id, mentor_id
+            """)
+
+            # Ajustar secuencias a los ids insertados explícitamente
+            for table in TABLE_COLUMNS:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+                )
+            raw.commit()
+
+            start = time.perf_counter()
+            refresh_rollups(full=True)
+            print(f"[OK] Tablas resumen de BI reconstruidas en {time.perf_counter() - start:.1f} s")
+
+            cursor.execute("ANALYZE")
+            raw.commit()
+        finally:
+            raw.close()
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(json.dumps(data.manifest(), indent=2))
+    print(f"[OK] Manifest escrito en {MANIFEST_PATH}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Genera datos sintéticos para benchmarks (PostgreSQL local)')
+    parser.add_argument('--users', type=int, default=50_000)
+    parser.add_argument('--mentors', type=int, default=500)
+    parser.add_argument('--sales', type=int, default=5_000_000, help='Filas de daily_sales')
+    parser.add_argument('--messages', type=int, default=10_000_000, help='Filas de mentor_messages')
+    parser.add_argument('--invitations', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--truncate', action='store_true', help='Vaciar las tablas antes de insertar')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(seed(parse_args()))
@@ -0,0 +1,110 @@
+"""
+Compara modos de servir la API (clases de worker de gunicorn) con la misma carga.
+
+Para cada modo arranca gunicorn con gunicorn.conf.py y las variables GUNICORN_* del modo,
+ejecuta benchmarks.run con los mismos parámetros y al final imprime una tabla Markdown.
+
+Uso (desde backend/, con la base ya sembrada por benchmarks.seed):
+    python -m benchmarks.serving_modes --duration 60 --concurrency 32
+    python -m benchmarks.serving_modes --modes sync,gthread --blueprints sales,user
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks import run as load
+from benchmarks.seed import RESULTS_DIR
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    'sync': {'GUNICORN_WORKER_CLASS': 'sync', 'GUNICORN_THREADS': '1'},
+    'gthread': {'GUNICORN_WORKER_CLASS': 'gthread', 'GUNICORN_THREADS': '4'},
+    'gevent': {'GUNICORN_WORKER_CLASS': 'gevent', 'GUNICORN_WORKER_CONNECTIONS': '200',
+               'DB_POOL_SIZE': '20', 'DB_MAX_OVERFLOW': '10', 'HASH_POOL_WORKERS': '0'},
+}
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
+
+
+def run_mode(name, args):
+    env = dict(os.environ, **MODES[name])
+    env['GUNICORN_BIND'] = f'127.0.0.1:{args.port}'
+    env['GUNICORN_WORKERS'] = str(args.workers)
+    env['GUNICORN_ACCESS_LOG'] = ''
+
+    print(f"\n[INFO] Modo {name}: {MODES[name]}")
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env
+    )
+    try:
+        if not wait_for_port('127.0.0.1', args.port):
+            print(f"[ERROR] gunicorn ({name}) no abrió el puerto {args.port}")
+            return None
+        output = RESULTS_DIR / f'serving_{name}.json'
+        load.run(load.parse_args([
+            '--base-url', f'http://127.0.0.1:{args.port}',
+            '--concurrency', str(args.concurrency),
+            '--duration', str(args.duration),
+            '--output', str(output),
+        ] + (['--blueprints', args.blueprints] if args.blueprints else [])))
+        return json.loads(output.read_text())
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+def print_markdown(results):
+    blueprints = sorted({key.split('.')[0] for r in results.values() for key in r['endpoints']})
+    print("\n| modo | req/s | " + " | ".join(f"p95 máx {bp} (ms)" for bp in blueprints) + " | errores |")
+    print("|---" * (len(blueprints) + 3) + "|")
+    for name, result in results.items():
+        cells = []
+        for bp in blueprints:
+            rows = [row for key, row in result['endpoints'].items() if key.startswith(bp + '.')]
+            cells.append(str(max((row['p95_ms'] for row in rows), default='-')))
+        errors = sum(row['errors'] for row in result['endpoints'].values())
+        print(f"| {name} | {result['total_rps']} | " + " | ".join(cells) + f" | {errors} |")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara clases de worker de gunicorn con la misma carga')
+    parser.add_argument('--modes', default='sync,gthread,gevent')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=60)
+    parser.add_argument('--blueprints', default=None)
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.modes.split(','):
+        if name not in MODES:
+            print(f"[ERROR] Modo desconocido: {name}")
+            return 1
+        result = run_mode(name, args)
+        if result:
+            results[name] = result
+
+    if results:
+        print_markdown(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
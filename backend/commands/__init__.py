@@ -0,0 +1,15 @@
+# Paquete de comandos CLI (flask <comando>)
+
+
+def register_commands(app):
+    """Registra los grupos de comandos en app.cli"""
+    from commands.schema import schema_cli
+    from commands.migrations import db_cli
+    from commands.users import users_cli
+    from commands.bi import bi_cli
+    from commands.export import export_cli
+    app.cli.add_command(schema_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(bi_cli)
+    app.cli.add_command(export_cli)
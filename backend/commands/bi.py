@@ -0,0 +1,26 @@
+"""
+Comandos de las tablas resumen de BI (models/bi_rollup.py y models/sales_cube.py).
+
+Uso:
+    flask --app app bi refresh [--full]
+"""
+import logging
+import click
+from flask.cli import AppGroup, with_appcontext
+from models.bi_rollup import refresh_rollups
+
+logger = logging.getLogger(__name__)
+
+bi_cli = AppGroup('bi', help='Tablas resumen de Business Intelligence')
+
+
+@bi_cli.command('refresh')
+@click.option('--full', is_flag=True, help='Reconstruir todo desde users y daily_sales en lugar de aplicar solo los cambios')
+@with_appcontext
+def refresh_command(full):
+    """Pone al día las tablas resumen (para cron; los endpoints de BI también lo hacen al leer)"""
+    result = refresh_rollups(full=full)
+    if result['mode'] == 'full':
+        logger.info(f"Tablas resumen reconstruidas (marca de agua {result['watermark']})")
+    else:
+        logger.info(f"{result['processed']} usuarios aplicados (marca de agua {result['watermark']})")
@@ -0,0 +1,34 @@
+"""
+Exportación a Parquet para análisis fuera de línea (controllers/export_controller.py).
+
+Uso:
+    flask --app app export parquet [--full] [--table daily_sales ...] [--output /ruta]
+
+Requiere pyarrow (requirements-export.txt). Pensado para cron nocturno: sin --full solo exporta
+lo cambiado desde la ejecución anterior.
+"""
+import logging
+import click
+from flask.cli import AppGroup, with_appcontext
+from controllers.export_controller import EXPORT_TABLES, run_export
+
+logger = logging.getLogger(__name__)
+
+export_cli = AppGroup('export', help='Exportación de datos para análisis')
+
+
+@export_cli.command('parquet')
+@click.option('--full', is_flag=True, help='Reescribir las tablas completas en lugar de solo los cambios')
+@click.option('--table', 'tables', multiple=True, type=click.Choice(list(EXPORT_TABLES)),
+              help='Solo estas tablas (se puede repetir)')
+@click.option('--output', default=None, help='Directorio de salida (por defecto EXPORT_DIR)')
+@with_appcontext
+def parquet_command(full, tables, output):
+    """Exporta ventas, parámetros, usuarios y mensajes a Parquet particionado por mes y categoría"""
+    try:
+        results = run_export(tables=tables, full=full, output_dir=output)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    for name, result in results.items():
+        logger.info(f"{name}: {result['rows']} filas, {result['files']} archivos ({result['mode']}, "
+                    f"marca de agua {result['watermark']})")
@@ -0,0 +1,41 @@
+"""
+Comandos del ejecutor de migraciones versionadas (migrations/runner.py).
+
+Uso:
+    flask --app app db status
+    flask --app app db upgrade [--dry-run] [--target 0011]
+"""
+import logging
+import click
+from flask.cli import AppGroup, with_appcontext
+from config.database import db
+from migrations.runner import MigrationRunner
+
+logger = logging.getLogger(__name__)
+
+db_cli = AppGroup('db', help='Migraciones de esquema versionadas')
+
+
+@db_cli.command('status')
+@with_appcontext
+def status_command():
+    """Muestra las revisiones aplicadas y pendientes"""
+    runner = MigrationRunner(db.engine)
+    for module, applied in runner.status():
+        if applied:
+            logger.info(f"aplicada  {module.revision} {module.description} "
+                  f"(aplicada {applied.applied_at:%Y-%m-%d %H:%M}, {applied.duration_ms} ms)")
+        else:
+            logger.info(f"pendiente {module.revision} {module.description}")
+
+
+@db_cli.command('upgrade')
+@click.option('--dry-run', is_flag=True, help='Mostrar el SQL sin ejecutarlo')
+@click.option('--target', default=None, help='Aplicar hasta esta revisión (incluida)')
+@with_appcontext
+def upgrade_command(dry_run, target):
+    """Aplica las revisiones pendientes en orden"""
+    runner = MigrationRunner(db.engine)
+    applied = runner.upgrade(target=target, dry_run=dry_run)
+    if applied and not dry_run:
+        logger.info(f"{len(applied)} migraciones aplicadas")
@@ -0,0 +1,86 @@
+"""
+Comandos para verificar y crear el esquema de base de datos.
+Reemplazan la inicialización que antes se ejecutaba al importar app.py.
+
+Uso:
+    flask --app app schema check [--wait]
+    flask --app app schema create
+
+Para aplicar cambios sobre una base existente usar `flask db upgrade` (migrations/).
+"""
+import logging
+import sys
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from sqlalchemy.engine import make_url
+from config.database import db, wait_for_db, check_schema, import_models
+from migrations.runner import MigrationRunner
+
+logger = logging.getLogger(__name__)
+
+schema_cli = AppGroup('schema', help='Verificación y creación del esquema de base de datos')
+
+
+def log_connection_hints(error_msg):
+    """Muestra posibles soluciones según el tipo de error de conexión"""
+    error_msg = error_msg.lower()
+    if "could not connect" in error_msg or "connection refused" in error_msg:
+        logger.info("Posibles soluciones:")
+        logger.info("1. Verifica que PostgreSQL esté corriendo: docker ps")
+        logger.info("2. Inicia PostgreSQL si no está corriendo: docker-compose up -d")
+        logger.info("3. Espera unos segundos después de iniciar Docker")
+        logger.info("4. Verifica los logs: docker logs proyecto_postgres")
+        logger.info("5. Prueba conectarte manualmente: psql -h localhost -U postgres -d proyecto_db")
+    elif "authentication failed" in error_msg:
+        logger.info("Error de autenticación - Verifica las credenciales en .env")
+    elif "database" in error_msg and "does not exist" in error_msg:
+        logger.info("La base de datos no existe - El contenedor debería crearla automáticamente")
+
+
+@schema_cli.command('check')
+@click.option('--wait', is_flag=True, help='Reintentar la conexión mientras PostgreSQL arranca')
+@with_appcontext
+def check_command(wait):
+    """Verifica la conexión y que las tablas/columnas de los modelos existan"""
+    # Mensaje de depuración (solo mostrar sin password por seguridad)
+    url = make_url(current_app.config['SQLALCHEMY_DATABASE_URI'])
+    logger.info(f"Conectando a: {url.render_as_string(hide_password=True)}")
+    try:
+        if wait:
+            wait_for_db(current_app)
+        result = check_schema()
+    except Exception as e:
+        logger.error(f"No se pudo inspeccionar la base de datos: {str(e)}")
+        log_connection_hints(str(e))
+        sys.exit(2)
+
+    pending = MigrationRunner(db.engine).pending()
+    for module in pending:
+        logger.warning(f"Migración pendiente: {module.revision} {module.description}")
+
+    if not result['missing_tables'] and not result['missing_columns']:
+        logger.info("El esquema coincide con los modelos")
+        if pending:
+            sys.exit(1)
+        return
+
+    for table in result['missing_tables']:
+        logger.warning(f"Falta la tabla '{table}'")
+    for table, columns in result['missing_columns'].items():
+        logger.warning(f"Faltan columnas en '{table}': {', '.join(columns)}")
+    sys.exit(1)
+
+
+@schema_cli.command('create')
+@with_appcontext
+def create_command():
+    """Crea las tablas que falten (equivalente al antiguo db.create_all() al arrancar)"""
+    try:
+        wait_for_db(current_app)
+    except Exception as e:
+        log_connection_hints(str(e))
+        raise
+    import_models()
+    db.create_all()
+    logger.info("Tablas creadas correctamente")
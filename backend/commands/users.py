@@ -0,0 +1,57 @@
+"""
+Comandos de mantenimiento de usuarios.
+
+Uso:
+    flask --app app users purge [--purge-id 12]
+    flask --app app users import cohorte.csv [--mentor-id 5] [--dry-run] [--workers 8]
+"""
+import logging
+import os
+from pathlib import Path
+import click
+from flask.cli import AppGroup, with_appcontext
+from config.database import db
+from models.user_purge import UserPurge
+from controllers.user_purge_controller import run_purge
+from controllers.user_import_controller import UserImportController, parse_rows
+
+logger = logging.getLogger(__name__)
+
+users_cli = AppGroup('users', help='Mantenimiento de usuarios')
+
+
+@users_cli.command('purge')
+@click.option('--purge-id', type=int, default=None, help='Solo esta purga')
+@with_appcontext
+def purge_command(purge_id):
+    """Ejecuta las purgas pendientes, fallidas o interrumpidas (p. ej. tras reiniciar los workers)"""
+    query = db.session.query(UserPurge.id).filter(UserPurge.status != 'done')
+    if purge_id is not None:
+        query = query.filter(UserPurge.id == purge_id)
+    purge_ids = [row[0] for row in query.order_by(UserPurge.id).all()]
+    if not purge_ids:
+        logger.info("No hay purgas pendientes")
+        return
+    completed = sum(1 for pending_id in purge_ids if run_purge(pending_id, include_running=True))
+    logger.info(f"{completed} de {len(purge_ids)} purgas completadas")
+
+
+@users_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--mentor-id', default=None, help='Mentor por defecto (id, username o email)')
+@click.option('--dry-run', is_flag=True, help='Solo validar')
+@click.option('--workers', type=int, default=None, help='Procesos para bcrypt (por defecto uno por CPU)')
+@with_appcontext
+def import_command(path, mentor_id, dry_run, workers):
+    """Importa usuarios desde CSV o JSON como POST /api/admin/users/import, sin límite de filas"""
+    fmt = 'json' if path.lower().endswith('.json') else 'csv'
+    rows = parse_rows(Path(path).read_bytes(), fmt)
+    result, status = UserImportController.import_users(
+        rows, mentor_id, dry_run, max_rows=0, workers=workers if workers is not None else (os.cpu_count() or 1))
+    if status >= 400:
+        raise click.ClickException(result['error'])
+    for entry in result['rows']:
+        if entry['status'] == 'error':
+            logger.warning(f"Fila {entry['row']} ({entry['username']}): {'; '.join(entry['errors'])}")
+    logger.info(f"{result['created']} usuarios creados, {result['failed']} filas con errores "
+                f"de {result['total']}{' (dry-run)' if dry_run else ''} en {result['duration_ms']} ms")
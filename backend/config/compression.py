@@ -0,0 +1,119 @@
+"""
+Compresión de respuestas negociada con Accept-Encoding (br o gzip).
+
+Se comprimen las respuestas JSON y de texto de al menos COMPRESS_MIN_SIZE bytes; las más chicas
+no ganan nada y solo suman CPU. Brotli se usa si el paquete está instalado y el cliente lo
+acepta; si no, gzip. Las respuestas en streaming (config/streaming.py) se comprimen bloque a
+bloque con un flush después de cada uno, así el cliente sigue recibiendo datos a medida que se
+generan. Los archivos (send_file) y las respuestas que ya traen Content-Encoding no se tocan.
+
+Un ETag fuerte pasa a débil al comprimir (la representación cambia); If-None-Match usa la
+comparación débil, así los 304 de config/etag.py siguen funcionando.
+"""
+import gzip
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional en desarrollo; está en requirements.txt
+    brotli = None
+
+_COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'image/svg+xml')
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def _is_compressible(response):
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in _COMPRESSIBLE_TYPES
+
+
+def _choose_encoding():
+    """Codificación preferida que el cliente acepta (br antes que gzip a igual calidad)"""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def _compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+
+def _compress_stream(chunks, encoding, config):
+    if encoding == 'br':
+        compressor = _BrotliStream(config['COMPRESS_BROTLI_QUALITY'])
+    else:
+        compressor = _GzipStream(config['COMPRESS_LEVEL'])
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compressor.chunk(chunk)
+        yield compressor.finish()
+    finally:
+        # Cierra el generador original (stream_with_context libera ahí el contexto y la sesión)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    """after_request: comprime la respuesta si corresponde"""
+    config = current_app.config
+    if (request.method == 'HEAD'
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+            or not _is_compressible(response)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(_compress(data, encoding, config))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Registra la compresión (controlada por COMPRESS_ENABLED)"""
+    if app.config['COMPRESS_ENABLED']:
+        app.after_request(compress_response)
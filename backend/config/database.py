@@ -1,38 +1,103 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
+from sqlalchemy import inspect, text
+import logging
 import time
+from config.password_hasher import password_hasher
+
+logger = logging.getLogger(__name__)
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 
+def build_engine_options(config):
+    """Construye SQLALCHEMY_ENGINE_OPTIONS a partir de las variables DB_* de la configuración"""
+    from config.pool_stats import InstrumentedQueuePool
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+    # Parámetros propios de psycopg2/libpq
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        connect_args = {
+            'connect_timeout': config['DB_CONNECT_TIMEOUT'],
+            'application_name': config['DB_APPLICATION_NAME'],
+        }
+        if config['DB_STATEMENT_TIMEOUT_MS'] > 0:
+            connect_args['options'] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        options['connect_args'] = connect_args
+
+    return options
+
 def init_db(app):
-    """Inicializa la base de datos"""
+    """Registra las extensiones de base de datos (sin abrir conexiones ni ejecutar DDL)"""
+    # Las opciones explícitas en la configuración tienen prioridad
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
     db.init_app(app)
     bcrypt.init_app(app)
-    
-    # Intentar conectar con retry en caso de que PostgreSQL esté aún iniciando
-    max_retries = 5
-    retry_delay = 2
-    
+    password_hasher.init_app(app)
+
+def wait_for_db(app, max_retries=None, retry_delay=None):
+    """Espera a que PostgreSQL acepte conexiones (útil mientras el contenedor arranca)"""
+    max_retries = max_retries or app.config.get('DB_CONNECT_RETRIES', 5)
+    retry_delay = retry_delay or app.config.get('DB_CONNECT_RETRY_DELAY', 2)
+
     for attempt in range(max_retries):
         try:
             with app.app_context():
-                # Intentar una conexión simple primero
-                db.engine.connect()
-                print("[OK] Conexion a PostgreSQL establecida")
-                
-                # Crear las tablas
-                db.create_all()
-                print("[OK] Tablas creadas correctamente")
-                break
+                with db.engine.connect() as connection:
+                    connection.execute(text('SELECT 1'))
+                logger.info("Conexion a PostgreSQL establecida")
+                return
         except Exception as e:
             error_str = str(e)
             if attempt < max_retries - 1:
-                print(f"[WARNING] Intento {attempt + 1}/{max_retries} fallo. Reintentando en {retry_delay} segundos...")
-                print(f"   Error: {error_str[:200]}")
+                logger.warning(f"Intento {attempt + 1}/{max_retries} fallo. Reintentando en {retry_delay} segundos...")
+                logger.warning(f"Error: {error_str[:200]}")
                 time.sleep(retry_delay)
             else:
-                print(f"[ERROR] Error despues de {max_retries} intentos:")
-                print(f"   Error completo: {error_str}")
+                logger.error(f"Error despues de {max_retries} intentos:")
+                logger.error(f"Error completo: {error_str}")
                 raise
 
+def import_models():
+    """Importa todos los modelos para que estén registrados en db.metadata"""
+    import models.user  # noqa: F401
+    import models.mentor_invitation  # noqa: F401
+    import models.mentor_message  # noqa: F401
+    import models.mentor_conversation  # noqa: F401
+    import models.daily_sale  # noqa: F401
+    import models.user_purge  # noqa: F401
+    import models.bi_snapshot  # noqa: F401
+    import models.bi_rollup  # noqa: F401
+    import models.sales_cube  # noqa: F401
+    import models.export_watermark  # noqa: F401
+
+def check_schema():
+    """
+    Compara los modelos con la base de datos.
+    Devuelve un diccionario con tablas y columnas faltantes (debe llamarse dentro de app_context).
+    """
+    import_models()
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    missing_tables = []
+    missing_columns = {}
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            missing_tables.append(table.name)
+            continue
+        existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
+        missing = [col.name for col in table.columns if col.name not in existing_columns]
+        if missing:
+            missing_columns[table.name] = missing
+
+    return {'missing_tables': missing_tables, 'missing_columns': missing_columns}
@@ -0,0 +1,18 @@
+"""
+Respuestas de error comunes a rutas y controladores.
+"""
+import sys
+from werkzeug.exceptions import HTTPException
+from config.logging_config import current_request_id
+
+
+def internal_error(logger, message='Error del servidor'):
+    """
+    Registra la excepción en curso (con traceback) y devuelve un 500 genérico.
+    El detalle queda en el log; el cliente recibe el request_id para correlacionarlo.
+    Las HTTPException (p. ej. HasherBusy -> 503) se relanzan para que Flask responda su código.
+    """
+    if isinstance(sys.exc_info()[1], HTTPException):
+        raise
+    logger.exception(message)
+    return {'error': message, 'request_id': current_request_id()}, 500
@@ -0,0 +1,80 @@
+"""
+ETag y GET condicionales a partir de versiones de fila.
+
+El decorador conditional(version) calcula, antes de ejecutar la vista, una versión barata de
+los datos que devuelve (p. ej. COUNT + MAX(updated_at) de las filas del listado). El ETag es
+un hash de esa versión, la URL con sus parámetros, el usuario del token y ETAG_SEED (cambia
+con cada despliegue, por si cambia la forma del JSON). Si el cliente envía If-None-Match con
+ese ETag se responde 304 sin ejecutar la vista: ni la consulta completa ni la serialización.
+
+La versión se lee antes que los datos, así el ETag nunca es más nuevo que el cuerpo: si algo
+cambia en el medio, la siguiente petición simplemente recibe un 200.
+
+Uso (debajo de los decoradores de autenticación, que dejan g.current_user):
+    @admin_bp.route('/users', methods=['GET'])
+    @admin_required
+    @conditional(lambda: User.list_version())
+    def get_all_users(): ...
+"""
+import hashlib
+import logging
+from functools import wraps
+
+from flask import current_app, g, request
+
+from config.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def compute_etag(version):
+    """ETag fuerte para la versión dada en la petición actual"""
+    user = g.get('current_user') or {}
+    parts = (
+        current_app.config.get('ETAG_SEED', 'dev'),
+        request.path,
+        sorted(request.args.items(multi=True)),
+        user.get('user_id'),
+        user.get('role'),
+        version,
+    )
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def conditional(version):
+    """
+    Responde 304 si If-None-Match coincide con el ETag de version(*args, **kwargs).
+    version recibe los mismos argumentos que la vista; si devuelve None (p. ej. el recurso no
+    existe) la vista se ejecuta sin ETag.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not current_app.config.get('ETAG_ENABLED', True):
+                return f(*args, **kwargs)
+
+            try:
+                current = version(*args, **kwargs)
+            except Exception:
+                # Sin versión se responde como siempre; el error real (si lo hay) lo reporta la vista
+                logger.warning(f"No se pudo calcular la versión de {request.path}", exc_info=True)
+                db.session.rollback()
+                current = None
+            if current is None:
+                return f(*args, **kwargs)
+
+            etag = compute_etag(current)
+            # Comparación débil (RFC 9110): la respuesta comprimida lleva el mismo ETag como W/"..."
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # El navegador guarda la respuesta pero la revalida siempre con If-None-Match
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Authorization')
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,95 @@
+"""
+Proveedor JSON de la aplicación (jsonify, request.get_json y respuestas dict/list).
+
+Con JSON_PROVIDER=orjson (por defecto) y orjson instalado, las respuestas se codifican en C y
+directamente a bytes: datetime y date salen en ISO 8601 sin pasar por isoformat() en Python,
+Decimal se convierte a float y las filas de SQLAlchemy (Row) se escriben como listas.
+Sin orjson, o con JSON_PROVIDER=json, se usa json de la stdlib con las mismas conversiones,
+así la salida es equivalente en ambos casos.
+Las claves no se ordenan (el orden es el de los serializadores) y la salida es compacta.
+"""
+import dataclasses
+import decimal
+import json
+import logging
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional en desarrollo; está en requirements.txt
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Claves no-str (p. ej. ids enteros) como hace json de la stdlib
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(obj):
+    """Tipos que ninguno de los dos codificadores admite de forma nativa"""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Row):
+        return tuple(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _std_default(obj):
+    """Conversiones que orjson hace en C y json de la stdlib no"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return _default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson cuando está disponible; json de la stdlib con los mismos tipos si no"""
+
+    sort_keys = False
+    compact = True
+    ensure_ascii = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        requested = app.config.get('JSON_PROVIDER', 'orjson')
+        if requested == 'orjson' and orjson is None:
+            logger.warning("JSON_PROVIDER=orjson pero orjson no está instalado; se usa json de la stdlib")
+        self.use_orjson = requested == 'orjson' and orjson is not None
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode('utf-8')
+        kwargs.setdefault('default', _std_default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.use_orjson:
+            # bytes directo, sin decodificar a str para volver a codificar en la respuesta
+            body = orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        else:
+            body = self.dumps(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    app.json = FastJSONProvider(app)
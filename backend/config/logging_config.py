@@ -0,0 +1,187 @@
+"""
+Logging de la aplicación.
+
+- Salida JSON (LOG_FORMAT=json, por defecto) o texto legible (LOG_FORMAT=text).
+- Cada petición recibe un request_id (header X-Request-ID entrante o uno nuevo) que se
+  agrega a todos los registros y se devuelve en la respuesta.
+- Los handlers de la aplicación solo encolan el registro (QueueHandler); un hilo en segundo
+  plano (QueueListener) formatea y escribe en stdout, así la escritura no bloquea la petición.
+  Cada proceso tiene su listener: después de un fork (workers de gunicorn) se arranca otro.
+- Niveles por blueprint con LOG_LEVELS, p. ej. "admin=DEBUG,sales=WARNING" (loggers api.<blueprint>).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+
+# Atributos estándar de LogRecord: el resto se considera "extra" y se incluye en el JSON
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+_listener = None
+_queue_handler = None
+_configured = False
+
+
+def current_request_id():
+    """request_id de la petición en curso ('-' fuera de una petición)"""
+    if has_request_context():
+        return g.get('request_id', '-')
+    return '-'
+
+
+def get_logger(blueprint):
+    """Logger de un blueprint; su nivel se controla con LOG_LEVELS"""
+    return logging.getLogger(f'api.{blueprint}')
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = current_request_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro con los campos extra incluidos"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'pid': record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s')
+
+
+class _PreformattedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que conserva los campos extra: la versión estándar los aplana en el mensaje,
+    pero el JSON se arma en el hilo del listener.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        # Resolver el mensaje aquí (los args pueden cambiar antes de que el listener lo procese)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_log_levels(spec):
+    """'admin=DEBUG,sales=WARNING' -> {'api.admin': 'DEBUG', 'api.sales': 'WARNING'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        name, level = (part.strip() for part in item.split('=', 1))
+        if not name or not level:
+            continue
+        levels[name if '.' in name else f'api.{name}'] = level.upper()
+    return levels
+
+
+def configure_logging(level='INFO', fmt='json', blueprint_levels=None, use_queue=True):
+    """
+    Configura el logger raíz del proceso (solo la primera llamada tiene efecto).
+    use_queue=False escribe de forma síncrona (scripts interactivos que mezclan print/input).
+    """
+    global _listener, _configured
+
+    if _configured:
+        return
+    _configured = True
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    for name, logger_level in (blueprint_levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    if not use_queue:
+        stream_handler.addFilter(RequestIdFilter())
+        root.handlers = [stream_handler]
+        return
+
+    global _queue_handler
+    _queue_handler = _PreformattedQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(RequestIdFilter())
+    root.handlers = [_queue_handler]
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    # Los hilos no sobreviven a fork(): con preload_app el listener arrancó en el maestro de
+    # gunicorn y cada worker necesita el suyo
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def _restart_listener_in_child():
+    """Cola y hilo de escritura nuevos en el proceso hijo (la cola heredada no la lee nadie)"""
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *_listener.handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Vacía la cola y detiene el hilo de escritura"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _assign_request_id():
+    incoming = request.headers.get('X-Request-ID', '')
+    g.request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+
+
+def _echo_request_id(response):
+    response.headers['X-Request-ID'] = current_request_id()
+    return response
+
+
+def init_logging(app):
+    """Configura logging según LOG_LEVEL, LOG_FORMAT y LOG_LEVELS y registra el request_id"""
+    configure_logging(
+        level=app.config['LOG_LEVEL'],
+        fmt=app.config['LOG_FORMAT'],
+        blueprint_levels=parse_log_levels(app.config['LOG_LEVELS']),
+    )
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
+
+
+def configure_script_logging():
+    """Logging para scripts de scripts/: texto síncrono en consola"""
+    configure_logging(
+        level=os.getenv('LOG_LEVEL', 'INFO'),
+        fmt=os.getenv('LOG_FORMAT', 'text'),
+        blueprint_levels=parse_log_levels(os.getenv('LOG_LEVELS')),
+        use_queue=False,
+    )
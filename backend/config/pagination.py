@@ -0,0 +1,74 @@
+"""
+Paginación por cursor (keyset) para listados grandes.
+
+En vez de OFFSET (que recorre y descarta todas las filas anteriores) cada página continúa
+desde la clave de orden de la última fila: WHERE (columna, id) > (valor, id_último).
+Con un índice sobre (columna, id) cada página cuesta lo mismo, sea la primera o la milésima.
+El cursor es opaco para el cliente: JSON en base64 con el orden y la clave de la última fila.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from config.database import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Cursor mal formado o generado con otro orden"""
+
+
+def encode_cursor(sort, value, row_id):
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = json.dumps({'s': sort, 'v': value, 'id': row_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    """Devuelve (valor, id) de la última fila de la página anterior"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value = payload['v']
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+        row_id = int(payload['id'])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursor('Cursor inválido')
+    if payload.get('s') != sort:
+        raise InvalidCursor('El cursor corresponde a otro orden')
+    return value, row_id
+
+
+def parse_limit(limit):
+    """Tamaño de página pedido, acotado a [1, MAX_PAGE_SIZE]"""
+    if limit in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit debe ser un número entero')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, sort_column, id_column, sort, descending, cursor, limit):
+    """
+    Aplica orden, condición de cursor y LIMIT a una consulta (select() de SQLAlchemy).
+    Pide limit + 1 filas: la fila extra solo indica si hay otra página.
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort)
+        key = db.tuple_(sort_column, id_column)
+        query = query.where(key < (value, row_id) if descending else key > (value, row_id))
+    return keyset_order(query, sort_column, id_column, descending).limit(limit + 1)
+
+
+def keyset_order(query, sort_column, id_column, descending):
+    """Orden (columna, id) de los listados, el mismo que usan las páginas del cursor"""
+    if descending:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
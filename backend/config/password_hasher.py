@@ -0,0 +1,187 @@
+"""
+Hash de contraseñas con bcrypt fuera del hilo de la petición.
+
+bcrypt consume CPU a propósito (~250 ms con costo 12). Si corre en el hilo de la petición,
+una ráfaga de logins ocupa todos los workers. Aquí se ejecuta en un pool de procesos acotado:
+- HASH_POOL_WORKERS procesos por worker de la API (0 = en el mismo hilo, p. ej. con gevent). En
+  total hay GUNICORN_WORKERS * HASH_POOL_WORKERS procesos de bcrypt por host.
+- Si un proceso del pool muere, el pool queda roto (BrokenProcessPool): se descarta, se crea
+  otro y la operación se reintenta una vez.
+- Como máximo HASH_QUEUE_LIMIT operaciones esperando. Si la cola está llena se lanza
+  HasherBusy, que la API responde con 503 + Retry-After en vez de acumular latencia.
+- El costo sale de BCRYPT_LOG_ROUNDS; needs_rehash() detecta hashes con otro costo para
+  rehacerlos en el siguiente login.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+from flask import jsonify
+from werkzeug.exceptions import ServiceUnavailable
+
+from config.logging_config import current_request_id
+
+logger = logging.getLogger(__name__)
+
+
+class HasherBusy(ServiceUnavailable):
+    """El pool de hash está saturado; el cliente debe reintentar"""
+    description = 'Servidor ocupado, intenta de nuevo en unos segundos'
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password_hash, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        # Hash con formato inválido
+        return False
+
+
+def hash_cost(password_hash):
+    """Costo de un hash bcrypt ('$2b$12$...' -> 12); None si no tiene ese formato"""
+    parts = (password_hash or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """Pool de procesos acotado para bcrypt (uno por proceso de la API, creado al primer uso)"""
+
+    def __init__(self):
+        self.rounds = 12
+        self.workers = 0
+        self.queue_limit = 0
+        self.timeout = 10
+        self._executor = None
+        self._executor_pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.configure(
+            rounds=app.config['BCRYPT_LOG_ROUNDS'],
+            workers=app.config['HASH_POOL_WORKERS'],
+            queue_limit=app.config['HASH_QUEUE_LIMIT'],
+            timeout=app.config['HASH_TIMEOUT'],
+        )
+        app.register_error_handler(HasherBusy, _busy_response)
+
+    def configure(self, rounds, workers, queue_limit, timeout=10):
+        if workers != self.workers:
+            self.shutdown()
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_limit)
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def check(self, password_hash, password):
+        return self._run(_check, password_hash, password)
+
+    def hash_many(self, passwords, rounds=None, workers=None):
+        """
+        Hashea una lista completa (importaciones) en un pool propio y temporal, para no ocupar
+        los cupos del login. Devuelve los hashes en el mismo orden.
+        """
+        rounds = rounds or self.rounds
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        if workers <= 1 or len(passwords) < 2:
+            return [_hash(password, rounds) for password in passwords]
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(_hash, passwords, [rounds] * len(passwords), chunksize=chunksize))
+
+    def needs_rehash(self, password_hash):
+        return hash_cost(password_hash) != self.rounds
+
+    def _run(self, fn, *args):
+        slots = self._slots
+        if slots is None:
+            # Sin init_app (scripts sueltos): directo en el hilo actual
+            return fn(*args)
+        if not slots.acquire(blocking=False):
+            logger.debug("Pool de hash saturado; petición rechazada con 503")
+            raise HasherBusy()
+
+        if self.workers <= 0:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+
+        retried = False
+        while True:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                slots.release()
+                self._discard(executor)
+                if retried or not slots.acquire(blocking=False):
+                    raise HasherBusy()
+                retried = True
+                continue
+            except Exception:
+                slots.release()
+                raise
+            # El cupo se libera cuando el proceso termina, no cuando se deja de esperar
+            future.add_done_callback(lambda _: slots.release())
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                logger.warning(f"bcrypt tardó más de {self.timeout} s; petición rechazada con 503")
+                raise HasherBusy()
+            except BrokenProcessPool:
+                self._discard(executor)
+                if retried or not slots.acquire(blocking=False):
+                    raise HasherBusy()
+                retried = True
+
+    def _get_executor(self):
+        # Tras un fork (gunicorn) el pool del proceso padre no sirve: se crea uno por proceso
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    # spawn: los procesos no heredan hilos ni conexiones del worker
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _discard(self, executor):
+        """Descarta un pool roto (un proceso murió); el siguiente uso crea otro"""
+        with self._lock:
+            if self._executor is executor:
+                logger.warning("Pool de hash roto (un proceso terminó de forma inesperada); se recrea")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def shutdown(self):
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+
+def _busy_response(error):
+    response = jsonify({'error': error.description, 'request_id': current_request_id()})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+password_hasher = PasswordHasher()
+atexit.register(password_hasher.shutdown)
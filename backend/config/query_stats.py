@@ -0,0 +1,131 @@
+"""
+Contador de consultas SQL por petición y detector de N+1.
+
+Cada petición acumula número de sentencias y tiempo en base de datos. Al responder se agrega
+un header Server-Timing y se escribe una línea de log estructurada. Si una misma forma de
+sentencia (SQL con parámetros) se repite QUERY_N_PLUS_ONE_THRESHOLD veces o más en la misma
+petición se registra como posible N+1.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(([^()]*)\)', re.IGNORECASE)
+_POSTCOMPILE_RE = re.compile(r'__\[POSTCOMPILE_[^\]]+\]')
+
+
+def statement_shape(statement):
+    """Normaliza una sentencia para agrupar las que solo difieren en literales o tamaño de IN (...)"""
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    shape = _POSTCOMPILE_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('IN (?)', shape)
+    shape = _NUMBER_RE.sub('?', shape)
+    return shape
+
+
+class RequestQueryStats:
+    """Estadísticas de SQL de una petición"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.duration += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold):
+        """Formas de sentencia repetidas threshold veces o más (sospechosas de N+1)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get('query_start_time')
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    if has_request_context():
+        stats = g.get('query_stats')
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute no se ejecuta si la sentencia falla
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_start_time'):
+        conn.info['query_start_time'].pop()
+
+
+def _start_request():
+    g.request_start = time.perf_counter()
+    g.query_stats = RequestQueryStats()
+
+
+def _finish_request(response):
+    from flask import current_app
+
+    stats = g.pop('query_stats', None)
+    if stats is None:
+        return response
+
+    total_ms = (time.perf_counter() - g.get('request_start', time.perf_counter())) * 1000
+    db_ms = stats.duration * 1000
+    response.headers.add(
+        'Server-Timing',
+        f'db;dur={db_ms:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}'
+    )
+    response.headers['X-Query-Count'] = str(stats.count)
+
+    threshold = current_app.config['QUERY_N_PLUS_ONE_THRESHOLD']
+    repeated = stats.repeated(threshold)
+    payload = {
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'queries': stats.count,
+        'db_ms': round(db_ms, 2),
+        'total_ms': round(total_ms, 2),
+        'n_plus_one': [{'count': n, 'statement': shape[:300]} for shape, n in repeated],
+    }
+    message = (
+        f"method={payload['method']} path={payload['path']} status={payload['status']} "
+        f"queries={payload['queries']} db_ms={payload['db_ms']} total_ms={payload['total_ms']}"
+    )
+    # Logger del blueprint para que LOG_LEVELS (p. ej. "admin=WARNING") también aplique aquí
+    logger = logging.getLogger(f"api.{request.blueprint or 'app'}")
+    if repeated:
+        logger.warning(
+            f"{message} n_plus_one={len(repeated)} worst={repeated[0][1]}x {repeated[0][0][:120]!r}",
+            extra={'query_stats': payload}
+        )
+    else:
+        logger.info(message, extra={'query_stats': payload})
+    return response
+
+
+def init_query_stats(app):
+    """Registra los hooks de SQLAlchemy y de Flask (controlado por QUERY_STATS_ENABLED)"""
+    if not app.config['QUERY_STATS_ENABLED']:
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,144 @@
+"""
+Configuración de la aplicación leída desde variables de entorno.
+Se evalúa al llamar a create_app(), nunca al importar los módulos de rutas.
+"""
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Cargar variables de entorno desde archivo .env en el directorio backend
+load_dotenv(dotenv_path=BASE_DIR / '.env')
+load_dotenv()
+
+
+# Valor de ejemplo de env.example: firma tokens que cualquiera puede falsificar (rol admin incluido)
+PLACEHOLDER_SECRET_KEY = 'tu-clave-secreta-aqui-cambiar-en-produccion'
+
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class Config:
+    """Configuración por defecto (desarrollo y producción)"""
+
+    # Firma los tokens de acceso (rol y mentor van en los claims). Fuera de debug/testing la app no
+    # arranca sin uno propio: ver check_secret_key()
+    SECRET_KEY = os.getenv('SECRET_KEY', PLACEHOLDER_SECRET_KEY)
+    # Costo de bcrypt; los hashes con otro costo se rehacen en el siguiente login
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+    # Pool de procesos para bcrypt (config/password_hasher.py) por worker de la API; 0 = en el hilo
+    # de la petición. Por host son GUNICORN_WORKERS * HASH_POOL_WORKERS procesos (2*CPU+1 por defecto)
+    HASH_POOL_WORKERS = int(os.getenv('HASH_POOL_WORKERS', '1'))
+    HASH_QUEUE_LIMIT = int(os.getenv('HASH_QUEUE_LIMIT', '16'))
+    HASH_TIMEOUT = float(os.getenv('HASH_TIMEOUT', '10'))
+    # Importación masiva (POST /api/admin/users/import): filas por petición y procesos del pool
+    # temporal de bcrypt dentro del worker. Cohortes más grandes: `flask users import` (sin límite
+    # de filas, un proceso por CPU)
+    IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', '1000'))
+    HASH_IMPORT_WORKERS = int(os.getenv('HASH_IMPORT_WORKERS', '2'))
+    # Costo de las contraseñas importadas; 0 = BCRYPT_LOG_ROUNDS. Un costo menor es opcional y
+    # queda así hasta el primer login de cada cuenta
+    BCRYPT_IMPORT_ROUNDS = int(os.getenv('BCRYPT_IMPORT_ROUNDS', '0'))
+    # Operaciones masivas (POST /api/admin/users/bulk/*): usuarios por petición
+    BULK_MAX_USERS = int(os.getenv('BULK_MAX_USERS', '10000'))
+    # Asignación automática (POST /api/admin/mentors/match): máximo de usuarios por mentor.
+    # 0 = reparto parejo entre todos los mentores
+    MENTOR_CAPACITY = int(os.getenv('MENTOR_CAPACITY', '0'))
+    # Purga de usuarios dados de baja (controllers/user_purge_controller.py): filas por bloque e
+    # hilos por worker. 0 = la purga corre dentro de la petición DELETE
+    PURGE_CHUNK_SIZE = int(os.getenv('PURGE_CHUNK_SIZE', '1000'))
+    PURGE_WORKERS = int(os.getenv('PURGE_WORKERS', '1'))
+    # Antigüedad máxima (segundos) de los snapshots de BI (models/bi_snapshot.py)
+    BI_SNAPSHOT_MAX_AGE = int(os.getenv('BI_SNAPSHOT_MAX_AGE', '60'))
+    # Exportación a Parquet (flask export parquet): directorio, filas por lectura del cursor y
+    # base de lectura opcional (p. ej. una réplica; vacío = la de la aplicación)
+    EXPORT_DIR = os.getenv('EXPORT_DIR') or str(BASE_DIR / 'exports')
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '50000'))
+    EXPORT_DATABASE_URL = os.getenv('EXPORT_DATABASE_URL', '')
+
+    # Vigencia (segundos) de los tokens firmados que emite /api/auth/login
+    ACCESS_TOKEN_MAX_AGE = int(os.getenv('ACCESS_TOKEN_MAX_AGE', str(8 * 3600)))
+    UPLOAD_FOLDER = str(BASE_DIR / 'uploads' / 'messages')
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB máximo
+    CORS_ORIGINS = [os.getenv('FRONTEND_URL', 'http://localhost:3000')]
+
+    # Configuración de base de datos desde variables de entorno
+    DB_USER = os.getenv('DB_USER', 'postgres')
+    DB_PASSWORD = os.getenv('DB_PASSWORD', 'postgres123')
+    DB_HOST = os.getenv('DB_HOST', 'localhost')
+    DB_PORT = os.getenv('DB_PORT', '5433')  # Cambiar a 5433 si Docker usa ese puerto
+    DB_NAME = os.getenv('DB_NAME', 'proyecto_db')
+    DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+
+    SQLALCHEMY_DATABASE_URI = os.getenv(
+        'DATABASE_URL',
+        f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+    )
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Pool de conexiones (por proceso/worker). Ver config/database.py -> build_engine_options
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # segundos esperando una conexión libre
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # segundos antes de reciclar una conexión
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)  # detecta conexiones muertas tras reinicios de Postgres
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))  # 0 = sin límite
+    DB_APPLICATION_NAME = os.getenv('DB_APPLICATION_NAME', 'innovahack-api')
+
+    # Codificador de las respuestas JSON (config/json_provider.py): 'orjson' o 'json' (stdlib)
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+
+    # Compresión br/gzip de las respuestas (config/compression.py) a partir de COMPRESS_MIN_SIZE bytes
+    COMPRESS_ENABLED = _env_bool('COMPRESS_ENABLED', True)
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))  # gzip 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))  # 0-11; >5 es lento para respuestas dinámicas
+    # Filas por bloque de las respuestas con ?stream=1 (config/streaming.py)
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1000'))
+
+    # GET condicionales (config/etag.py). ETAG_SEED entra en cada ETag: usar la versión desplegada
+    # para que un cambio en la forma del JSON invalide lo que tengan guardado los navegadores
+    ETAG_ENABLED = _env_bool('ETAG_ENABLED', True)
+    ETAG_SEED = os.getenv('APP_VERSION', 'dev')
+
+    # Contador de consultas por petición (Server-Timing) y detector de N+1
+    QUERY_STATS_ENABLED = _env_bool('QUERY_STATS_ENABLED', True)
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', '5'))
+
+    # Endpoints internos (/api/internal/*). Deshabilitados si no hay token configurado
+    INTERNAL_API_TOKEN = os.getenv('INTERNAL_API_TOKEN')
+
+    # Reintentos de conexión usados solo por los comandos `flask schema ...`
+    DB_CONNECT_RETRIES = int(os.getenv('DB_CONNECT_RETRIES', '5'))
+    DB_CONNECT_RETRY_DELAY = float(os.getenv('DB_CONNECT_RETRY_DELAY', '2'))
+
+    # Logging (config/logging_config.py). En una terminal interactiva el formato por defecto es texto
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text' if sys.stdout.isatty() else 'json')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # por blueprint: "admin=DEBUG,sales=WARNING"
+
+    DEBUG = _env_bool('FLASK_DEBUG')
+    TESTING = False
+
+
+def check_secret_key(config):
+    """
+    RuntimeError si SECRET_KEY falta o es el valor de ejemplo fuera de DEBUG/TESTING: con una clave
+    conocida cualquiera puede firmar un token de admin.
+    """
+    secret_key = config.get('SECRET_KEY')
+    if secret_key and secret_key != PLACEHOLDER_SECRET_KEY:
+        return
+    if config.get('DEBUG') or config.get('TESTING'):
+        return
+    raise RuntimeError(
+        'SECRET_KEY no está configurado (o es el valor de ejemplo). Definir un valor aleatorio, '
+        'p. ej. python -c "import secrets; print(secrets.token_urlsafe(48))"'
+    )
@@ -0,0 +1,55 @@
+"""
+Respuestas JSON en streaming para colecciones grandes.
+
+stream_collection() escribe {"<clave>": [...], "total": N, ...} de a bloques mientras lee las
+filas con Serializer.stream() (yield_per, cursor del lado del servidor en Postgres). La memoria
+del worker queda acotada a un bloque de STREAM_BATCH_SIZE filas sin importar el tamaño del
+resultado. El JSON final es el mismo que el de la respuesta normal; total va al final porque
+recién se conoce al terminar.
+
+Los endpoints lo activan con ?stream=1. Un error a mitad de camino ya no puede cambiar el
+código de estado: se registra y la respuesta queda truncada (JSON inválido para el cliente).
+"""
+import logging
+
+from flask import Response, current_app, request, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+
+def stream_requested():
+    """True si la petición pide ?stream=1"""
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+def stream_collection(key, serializer, statement, **extra):
+    """
+    Response que serializa statement con serializer a medida que se leen las filas.
+    La consulta se ejecuta antes de devolver la respuesta, así un error de SQL sigue siendo un 500.
+    extra: claves adicionales del objeto raíz (se escriben después de la lista).
+    """
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    rows = serializer.stream(statement, batch_size)
+    dumps = current_app.json.dumps
+
+    def generate():
+        total = 0
+        try:
+            yield '{' + dumps(key) + ':['
+            batch = []
+            for row in rows:
+                batch.append(dumps(serializer.dump(row)))
+                if len(batch) >= batch_size:
+                    yield (',' if total else '') + ','.join(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                yield (',' if total else '') + ','.join(batch)
+                total += len(batch)
+            yield '],' + dumps({'total': total, **extra})[1:]
+        except Exception:
+            logger.exception(f"Error a mitad del streaming de {request.path} ({total} filas enviadas)")
+        finally:
+            rows.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -1,30 +1,142 @@
-from models.user import User
+from models.user import User, CONFLICT_ERRORS
+from models.user_purge import UserPurge
+from sqlalchemy.exc import IntegrityError
 from config.database import db
 from flask import jsonify
+from datetime import datetime, timedelta
 import re
+from config.pagination import InvalidCursor, encode_cursor, keyset_order, keyset_page, parse_limit
+from config.streaming import stream_collection
+from config.errors import internal_error
+from config.logging_config import get_logger
+from serializers import UserSerializer
+from controllers.user_purge_controller import purge_serializer, schedule_purge, soft_delete_user
+
+logger = get_logger('admin')
+
+# Claves de ?sort= del listado de usuarios; el desempate siempre es users.id
+USER_SORT_KEYS = ('created_at', 'username', 'email', 'id')
+user_serializer = UserSerializer()
+
+
+def _parse_date(value, end=False):
+    """'2024-05-01' o ISO 8601; con end=True una fecha sin hora incluye todo ese día"""
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed.replace(tzinfo=None)
+
+
+def _parse_sort(sort):
+    """(sort, descendente, columna) de ?sort=; ValueError si la columna no es válida"""
+    sort = sort or '-created_at'
+    sort_key = sort.lstrip('-')
+    if sort_key not in USER_SORT_KEYS:
+        raise ValueError(f"sort inválido; opciones: {', '.join(USER_SORT_KEYS)} (prefijo - para descendente)")
+    return sort, sort.startswith('-'), sort_key
+
+
+def user_fields_serializer(fields):
+    """UserSerializer con los campos de ?fields= (todos si no se indica)"""
+    selected = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+    try:
+        return UserSerializer(only=selected)
+    except ValueError as e:
+        raise ValueError(f"{e}; opciones: {', '.join(UserSerializer.fields)}")
+
+
+def user_filters(role=None, mentor_id=None, created_from=None, created_to=None):
+    """Condiciones de los filtros de usuarios de admin; ValueError con el mensaje para el cliente"""
+    # Los dados de baja (pendientes de purga) no se listan
+    criteria = [User.deleted_at.is_(None)]
+    if role:
+        roles = [r.strip() for r in role.split(',') if r.strip()]
+        if any(r not in ('admin', 'mentor', 'user') for r in roles):
+            raise ValueError('role inválido')
+        criteria.append(User.role.in_(roles))
+    if mentor_id:
+        if mentor_id == 'none':
+            criteria.append(User.mentor_id.is_(None))
+        elif mentor_id.isdigit():
+            criteria.append(User.mentor_id == int(mentor_id))
+        else:
+            raise ValueError("mentor_id debe ser un número o 'none'")
+    try:
+        if created_from:
+            criteria.append(User.created_at >= _parse_date(created_from))
+        if created_to:
+            criteria.append(User.created_at < _parse_date(created_to, end=True))
+    except ValueError:
+        raise ValueError('Fechas inválidas; usa YYYY-MM-DD o ISO 8601')
+    return criteria
+
 
 class AdminController:
     """Controlador para operaciones de administración"""
     
     @staticmethod
-    def get_all_users():
-        """Obtiene todos los usuarios"""
+    def get_all_users(role=None, mentor_id=None, created_from=None, created_to=None,
+                      sort=None, fields=None, limit=None, cursor=None):
+        """
+        Lista usuarios por páginas (cursor), con filtros opcionales y solo los campos pedidos.
+        Toda la página sale de una sola consulta planificada por UserSerializer: el mentor con un
+        JOIN y el número de usuarios asignados con una subconsulta, sin cargas por usuario.
+        """
+        try:
+            sort, descending, sort_key = _parse_sort(sort)
+            serializer = user_fields_serializer(fields)
+            limit = parse_limit(limit)
+            query = serializer.select(extra=[sort_key]).where(*user_filters(role, mentor_id, created_from, created_to))
+
+            query = keyset_page(query, getattr(User, sort_key), User.id, sort, descending, cursor, limit)
+            users = serializer.all(query)
+
+            has_more = len(users) > limit
+            users = users[:limit]
+            next_cursor = None
+            if has_more:
+                last = users[-1]
+                next_cursor = encode_cursor(sort, getattr(last, sort_key), last.id)
+            return {
+                'users': serializer.dump_many(users),
+                'count': len(users),
+                'limit': limit,
+                'sort': sort,
+                'next_cursor': next_cursor,
+                'has_more': has_more,
+            }, 200
+        except (InvalidCursor, ValueError) as e:
+            return {'error': str(e)}, 400
+        except Exception:
+            return internal_error(logger, 'Error al obtener usuarios')
+
+    @staticmethod
+    def stream_users(role=None, mentor_id=None, created_from=None, created_to=None, sort=None, fields=None):
+        """
+        Todos los usuarios que cumplen los filtros, en el mismo orden que las páginas, escritos en
+        streaming (config/streaming.py) en lugar de armar la lista completa en memoria.
+        """
         try:
-            users = User.query.all()
-            return {'users': [user.to_dict() for user in users], 'total': len(users)}, 200
-        except Exception as e:
-            return {'error': f'Error al obtener usuarios: {str(e)}'}, 500
+            sort, descending, sort_key = _parse_sort(sort)
+            serializer = user_fields_serializer(fields)
+            query = serializer.select().where(*user_filters(role, mentor_id, created_from, created_to))
+            query = keyset_order(query, getattr(User, sort_key), User.id, descending)
+            return stream_collection('users', serializer, query, sort=sort), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception:
+            return internal_error(logger, 'Error al obtener usuarios')
     
     @staticmethod
     def get_user_by_id(user_id):
         """Obtiene un usuario por ID"""
         try:
-            user = User.query.get(user_id)
+            user = user_serializer.first(user_serializer.select().where(User.id == user_id))
             if not user:
                 return {'error': 'Usuario no encontrado'}, 404
-            return {'user': user.to_dict()}, 200
-        except Exception as e:
-            return {'error': f'Error al obtener usuario: {str(e)}'}, 500
+            return {'user': user_serializer.dump(user)}, 200
+        except Exception:
+            return internal_error(logger, 'Error al obtener usuario')
     
     @staticmethod
     def create_user(username, email, password, role='user'):
@@ -37,29 +149,35 @@ class AdminController:
             return {'error': 'La contraseña debe tener al menos 6 caracteres'}, 400
         
         # Validar formato de email
+        username = username.strip()
+        email = email.strip().lower()
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, email):
             return {'error': 'Email inválido'}, 400
         
+        if '@' in username:
+            return {'error': 'El nombre de usuario no puede contener @'}, 400
+        
         # Validar role
         if role not in ['admin', 'mentor', 'user']:
             role = 'user'
         
-        # Verificar si el usuario ya existe
-        if User.query.filter_by(username=username).first():
-            return {'error': 'El nombre de usuario ya está en uso'}, 400
-        
-        if User.query.filter_by(email=email).first():
-            return {'error': 'El email ya está registrado'}, 400
+        # Verificar si el usuario ya existe (una sola consulta)
+        conflict = User.find_conflict(username, email)
+        if conflict:
+            return {'error': CONFLICT_ERRORS[conflict]}, 400
         
         try:
             new_user = User(username=username, email=email, password=password, role=role)
             db.session.add(new_user)
             db.session.commit()
-            return {'message': 'Usuario creado correctamente', 'user': new_user.to_dict()}, 201
-        except Exception as e:
+            return {'message': 'Usuario creado correctamente', 'user': user_serializer.dump(new_user)}, 201
+        except IntegrityError:
             db.session.rollback()
-            return {'error': f'Error al crear usuario: {str(e)}'}, 500
+            return {'error': 'El nombre de usuario o email ya está en uso'}, 400
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al crear usuario')
     
     @staticmethod
     def update_user(user_id, username=None, email=None, password=None, role=None):
@@ -68,23 +186,30 @@ class AdminController:
             user = User.query.get(user_id)
             if not user:
                 return {'error': 'Usuario no encontrado'}, 404
+            if user.deleted_at is not None:
+                return {'error': 'El usuario está dado de baja'}, 400
             
             # Actualizar campos si se proporcionan
-            if username and username != user.username:
-                # Verificar si el nuevo username ya existe
-                if User.query.filter(User.username == username, User.id != user_id).first():
-                    return {'error': 'El nombre de usuario ya está en uso'}, 400
-                user.username = username
+            new_username = username.strip() if username and username.strip() != user.username else None
+            new_email = email.strip().lower() if email and email.strip().lower() != user.email else None
+            
+            if new_username and '@' in new_username:
+                return {'error': 'El nombre de usuario no puede contener @'}, 400
             
-            if email and email != user.email:
+            if new_email:
                 # Validar formato de email
                 email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-                if not re.match(email_regex, email):
+                if not re.match(email_regex, new_email):
                     return {'error': 'Email inválido'}, 400
-                # Verificar si el nuevo email ya existe
-                if User.query.filter(User.email == email, User.id != user_id).first():
-                    return {'error': 'El email ya está registrado'}, 400
-                user.email = email
+            
+            # Verificar username y email nuevos en una sola consulta
+            conflict = User.find_conflict(new_username, new_email, exclude_id=user_id)
+            if conflict:
+                return {'error': CONFLICT_ERRORS[conflict]}, 400
+            if new_username:
+                user.username = new_username
+            if new_email:
+                user.email = new_email
             
             if password:
                 if len(password) < 6:
@@ -98,26 +223,40 @@ class AdminController:
                     user.mentor_id = None
             
             db.session.commit()
-            return {'message': 'Usuario actualizado correctamente', 'user': user.to_dict()}, 200
-        except Exception as e:
+            return {'message': 'Usuario actualizado correctamente', 'user': user_serializer.dump(user)}, 200
+        except Exception:
             db.session.rollback()
-            return {'error': f'Error al actualizar usuario: {str(e)}'}, 500
+            return internal_error(logger, 'Error al actualizar usuario')
     
     @staticmethod
-    def delete_user(user_id):
-        """Elimina un usuario"""
+    def delete_user(user_id, requested_by=None):
+        """
+        Da de baja un usuario al instante y encola el borrado de sus datos
+        (controllers/user_purge_controller.py). Responde 202 con la purga para seguir su progreso.
+        """
         try:
             user = User.query.get(user_id)
             if not user:
                 return {'error': 'Usuario no encontrado'}, 404
-            
+            if user.id == requested_by:
+                return {'error': 'No puedes eliminar tu propia cuenta'}, 400
+            if user.deleted_at is not None:
+                purge = UserPurge.query.filter_by(user_id=user.id).order_by(UserPurge.id.desc()).first()
+                return {'message': 'El usuario ya se está eliminando', 'purge': purge_serializer.dump(purge)}, 202
+
             username = user.username
-            db.session.delete(user)
+            purge = soft_delete_user(user, requested_by)
             db.session.commit()
-            return {'message': f'Usuario {username} eliminado correctamente'}, 200
-        except Exception as e:
+            purge_id = purge.id
+            schedule_purge(purge_id)
+            purge = db.session.get(UserPurge, purge_id)
+            return {
+                'message': f'Usuario {username} eliminado; sus datos se borran en segundo plano',
+                'purge': purge_serializer.dump(purge),
+            }, 202
+        except Exception:
             db.session.rollback()
-            return {'error': f'Error al eliminar usuario: {str(e)}'}, 500
+            return internal_error(logger, 'Error al eliminar usuario')
     
     @staticmethod
     def assign_user_to_mentor(user_id, mentor_id):
@@ -127,6 +266,9 @@ class AdminController:
             if not user:
                 return {'error': 'Usuario no encontrado'}, 404
             
+            if user.deleted_at is not None:
+                return {'error': 'El usuario está dado de baja'}, 400
+            
             if user.role == 'admin':
                 return {'error': 'No se puede asignar un administrador a un mentor'}, 400
             
@@ -147,37 +289,37 @@ class AdminController:
             mentor_name = mentor.username if mentor_id else None
             return {
                 'message': f'Usuario asignado correctamente al mentor {mentor_name}' if mentor_id else 'Asignación de mentor removida',
-                'user': user.to_dict()
+                'user': user_serializer.dump(user)
             }, 200
-        except Exception as e:
+        except Exception:
             db.session.rollback()
-            return {'error': f'Error al asignar usuario: {str(e)}'}, 500
+            return internal_error(logger, 'Error al asignar usuario')
     
     @staticmethod
     def get_mentor_users(mentor_id):
         """Obtiene los usuarios asignados a un mentor"""
         try:
-            mentor = User.query.get(mentor_id)
+            mentor = user_serializer.first(user_serializer.select().where(User.id == mentor_id))
             if not mentor:
                 return {'error': 'Mentor no encontrado'}, 404
             
             if mentor.role != 'mentor':
                 return {'error': 'El usuario no es un mentor'}, 400
             
-            assigned_users = User.query.filter_by(mentor_id=mentor_id).all()
+            assigned_users = user_serializer.all(user_serializer.select().where(User.mentor_id == mentor_id))
             return {
-                'mentor': mentor.to_dict(),
-                'users': [user.to_dict() for user in assigned_users],
+                'mentor': user_serializer.dump(mentor),
+                'users': user_serializer.dump_many(assigned_users),
                 'total': len(assigned_users)
             }, 200
-        except Exception as e:
-            return {'error': f'Error al obtener usuarios del mentor: {str(e)}'}, 500
+        except Exception:
+            return internal_error(logger, 'Error al obtener usuarios del mentor')
     
     @staticmethod
     def get_all_mentors():
         """Obtiene todos los mentores"""
         try:
-            mentors = User.query.filter_by(role='mentor').all()
-            return {'mentors': [mentor.to_dict() for mentor in mentors], 'total': len(mentors)}, 200
-        except Exception as e:
-            return {'error': f'Error al obtener mentores: {str(e)}'}, 500
+            mentors = user_serializer.all(user_serializer.select().where(User.role == 'mentor'))
+            return {'mentors': user_serializer.dump_many(mentors), 'total': len(mentors)}, 200
+        except Exception:
+            return internal_error(logger, 'Error al obtener mentores')
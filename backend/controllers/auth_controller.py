@@ -1,9 +1,20 @@
-from models.user import User
+from models.user import User, CONFLICT_ERRORS
+from sqlalchemy.exc import IntegrityError
 from config.database import db
-from flask import jsonify
+from flask import jsonify, g, current_app
 from functools import wraps
 from flask import request
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 import re
+from config.errors import internal_error
+from config.logging_config import get_logger
+from serializers import UserSerializer
+
+logger = get_logger('auth')
+user_serializer = UserSerializer()
+
+TOKEN_SALT = 'access-token'
+
 
 class AuthController:
     """Controlador para autenticación"""
@@ -19,20 +30,24 @@ class AuthController:
             return {'error': 'La contraseña debe tener al menos 6 caracteres'}, 400
         
         # Validar formato de email
+        username = username.strip()
+        email = email.strip().lower()
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         if not re.match(email_regex, email):
             return {'error': 'Email inválido'}, 400
         
+        # El login distingue email/username por la '@'
+        if '@' in username:
+            return {'error': 'El nombre de usuario no puede contener @'}, 400
+        
         # Validar role (solo 'admin', 'mentor' o 'user')
         if role not in ['admin', 'mentor', 'user']:
             role = 'user'  # Por defecto user si el role no es válido
         
-        # Verificar si el usuario ya existe
-        if User.query.filter_by(username=username).first():
-            return {'error': 'El nombre de usuario ya está en uso'}, 400
-        
-        if User.query.filter_by(email=email).first():
-            return {'error': 'El email ya está registrado'}, 400
+        # Verificar si el usuario ya existe (una sola consulta, sin distinguir mayúsculas)
+        conflict = User.find_conflict(username, email)
+        if conflict:
+            return {'error': CONFLICT_ERRORS[conflict]}, 400
         
         try:
             # Crear nuevo usuario
@@ -40,10 +55,14 @@ class AuthController:
             db.session.add(new_user)
             db.session.commit()
             
-            return {'message': 'Usuario registrado correctamente', 'user': new_user.to_dict()}, 201
-        except Exception as e:
+            return {'message': 'Usuario registrado correctamente', 'user': user_serializer.dump(new_user)}, 201
+        except IntegrityError:
+            # Otra petición registró el mismo username/email entre la verificación y el commit
+            db.session.rollback()
+            return {'error': 'El nombre de usuario o email ya está en uso'}, 400
+        except Exception:
             db.session.rollback()
-            return {'error': f'Error al registrar usuario: {str(e)}'}, 500
+            return internal_error(logger, 'Error al registrar usuario')
     
     @staticmethod
     def login(username, password):
@@ -51,43 +70,110 @@ class AuthController:
         if not username or not password:
             return {'error': 'Usuario y contraseña son obligatorios'}, 400
         
-        # Buscar usuario por username o email
-        user = User.query.filter(
-            (User.username == username) | (User.email == username)
-        ).first()
+        # Buscar usuario por username o email (un índice según el formato)
+        user = User.find_for_login(username)
         
         if not user or not user.check_password(password):
             return {'error': 'Credenciales inválidas'}, 401
+
+        # Si cambió BCRYPT_LOG_ROUNDS, aprovechar que tenemos la contraseña en claro para rehacer el hash
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.warning("No se pudo actualizar el costo del hash", exc_info=True)
         
-        # En una aplicación real, aquí generarías un token JWT
         return {
             'message': 'Login exitoso',
-            'user': user.to_dict()
+            'user': user_serializer.dump(user),
+            'token': issue_token(user.id, user.role, user.mentor_id),
+            'expires_in': current_app.config['ACCESS_TOKEN_MAX_AGE']
+        }, 200
+
+    @staticmethod
+    def refresh(user_id):
+        """Emite un token nuevo con el rol y mentor actuales del usuario"""
+        user = User.query.get(user_id)
+        if not user or user.deleted_at is not None:
+            return {'error': 'Usuario no encontrado'}, 401
+        return {
+            'token': issue_token(user.id, user.role, user.mentor_id),
+            'expires_in': current_app.config['ACCESS_TOKEN_MAX_AGE']
         }, 200
     
     @staticmethod
     def get_user_by_id(user_id):
         """Obtiene un usuario por ID"""
-        user = User.query.get(user_id)
+        user = user_serializer.first(user_serializer.select().where(User.id == user_id))
         if not user:
             return {'error': 'Usuario no encontrado'}, 404
-        return {'user': user.to_dict()}, 200
+        return {'user': user_serializer.dump(user)}, 200
+
+def _token_serializer(secret_key=None):
+    return URLSafeTimedSerializer(secret_key or current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+def issue_token(user_id, role, mentor_id=None, secret_key=None):
+    """Genera un token firmado con la identidad del usuario (expira según ACCESS_TOKEN_MAX_AGE)"""
+    return _token_serializer(secret_key).dumps({'user_id': user_id, 'role': role, 'mentor_id': mentor_id})
+
+def verify_token(token):
+    """
+    Devuelve los claims del token o lanza SignatureExpired / BadSignature.
+    No consulta la base de datos: un cambio de rol o de mentor se refleja al renovar el token.
+    """
+    return _token_serializer().loads(token, max_age=current_app.config['ACCESS_TOKEN_MAX_AGE'])
+
+def is_active_user(user_id):
+    """True si el usuario existe y no está dado de baja"""
+    return db.session.query(User.id).filter(User.id == user_id, User.deleted_at.is_(None)).scalar() is not None
 
 def token_required(f):
-    """Decorador para proteger rutas que requieren autenticación"""
+    """Decorador para proteger rutas que requieren autenticación (deja los claims en g.current_user)"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        # En una implementación completa, aquí verificarías el token JWT
-        # Por ahora, esta es una estructura básica
-        token = request.headers.get('Authorization')
-        
-        if not token:
+        header = request.headers.get('Authorization', '')
+        scheme, _, token = header.partition(' ')
+        if scheme.lower() != 'bearer' or not token:
             return jsonify({'error': 'Token de acceso requerido'}), 401
-        
-        # Aquí validarías el token JWT real
-        # user_id = verify_token(token)
-        # ...
-        
+
+        try:
+            g.current_user = verify_token(token.strip())
+        except SignatureExpired:
+            return jsonify({'error': 'Token expirado'}), 401
+        except BadSignature:
+            return jsonify({'error': 'Token inválido'}), 401
+
+        # Las escrituras verifican que el usuario no esté dado de baja (una consulta por clave
+        # primaria): su token sigue firmado hasta que expira y la purga no debe recibir filas nuevas
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and not is_active_user(g.current_user['user_id']):
+            return jsonify({'error': 'Usuario dado de baja'}), 401
+
+        return f(*args, **kwargs)
+    return decorated
+
+def role_required(*roles):
+    """Decorador para requerir uno de los roles indicados (incluye token_required)"""
+    def decorator(f):
+        @wraps(f)
+        @token_required
+        def decorated(*args, **kwargs):
+            if g.current_user['role'] not in roles:
+                return jsonify({'error': 'Acceso denegado para este rol'}), 403
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+def owner_required(f):
+    """Decorador para rutas /<user_id>: el token debe pertenecer a ese usuario (incluye token_required)"""
+    @wraps(f)
+    @token_required
+    def decorated(*args, **kwargs):
+        if kwargs.get('user_id') != g.current_user['user_id']:
+            return jsonify({'error': 'No puedes acceder a los datos de otro usuario'}), 403
         return f(*args, **kwargs)
     return decorated
 
+admin_required = role_required('admin')
+mentor_required = role_required('mentor')
@@ -1,99 +1,289 @@
 from models.user import User
+from models.mentor_message import MentorMessage
+from models.mentor_invitation import MentorInvitation
+from models.bi_snapshot import BISnapshot
+from models.bi_rollup import BIMentorLoad, BIRoleCategory, BISignupsDaily, ensure_fresh, refresh_rollups
+from models.sales_cube import NO_MENTOR, SalesCube
 from config.database import db
-from flask import jsonify
-from sqlalchemy import func, extract
-from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from datetime import date, datetime, timedelta
+from config.errors import internal_error
+from config.logging_config import get_logger
+
+logger = get_logger('admin')
+
+STATISTICS_SNAPSHOT = 'statistics'
+# Ventana del crecimiento mensual: altas de los últimos 180 días (por día), agrupadas por mes
+MONTHLY_WINDOW_DAYS = 180
+SCORECARD_SNAPSHOT = 'mentor_scorecard'
+# Mensajes e invitaciones de los últimos 90 días; ingresos de los últimos 6 meses completos
+SCORECARD_WINDOW_DAYS = 90
+SCORECARD_REVENUE_MONTHS = 6
+
+
+def _compute_statistics():
+    """
+    Resumen, distribución por rol y categoría, asignación de mentor, desglose por mentor y altas
+    por mes leídos de las tablas resumen (models/bi_rollup.py), que antes se ponen al día con los
+    usuarios cambiados desde la última vez. Ninguna consulta recorre users.
+    """
+    refresh_rollups()
+    roles = dict(db.session.query(BIRoleCategory.role, func.sum(BIRoleCategory.users))
+                 .group_by(BIRoleCategory.role).all())
+    total_admins = int(roles.get('admin', 0))
+    total_mentors = int(roles.get('mentor', 0))
+    total_users_role = int(roles.get('user', 0))
+    total_users = int(sum(roles.values()))
+
+    loads = (db.session.query(User.username, BIMentorLoad.mentees)
+             .join(User, User.id == BIMentorLoad.mentor_id)
+             .filter(User.role == 'mentor', BIMentorLoad.mentees > 0)
+             .order_by(BIMentorLoad.mentor_id)
+             .all())
+    mentor_breakdown = [{'mentor': username, 'count': mentees} for username, mentees in loads]
+    users_with_mentor = sum(mentees for _, mentees in loads)
+    users_without_mentor = total_users_role - users_with_mentor
+
+    categories = (db.session.query(BIRoleCategory.category, BIRoleCategory.users)
+                  .filter(BIRoleCategory.role == 'user')
+                  .order_by(BIRoleCategory.users.desc(), BIRoleCategory.category)
+                  .all())
+    category_distribution = [{'category': category or None, 'count': count} for category, count in categories]
+
+    since = (datetime.utcnow() - timedelta(days=MONTHLY_WINDOW_DAYS)).date()
+    monthly = {}
+    for day, count in (db.session.query(BISignupsDaily.day, BISignupsDaily.users)
+                       .filter(BISignupsDaily.day >= since)
+                       .order_by(BISignupsDaily.day)):
+        label = f"{day.year}-{day.month:02d}"
+        monthly[label] = monthly.get(label, 0) + count
+    monthly_breakdown = [{'month': label, 'count': count} for label, count in monthly.items() if count]
+
+    return {
+        'overview': {
+            'total_users': total_users,
+            'total_admins': total_admins,
+            'total_mentors': total_mentors,
+            'total_users_role': total_users_role,
+            'users_with_mentor': users_with_mentor,
+            'users_without_mentor': users_without_mentor
+        },
+        'role_distribution': [
+            {'role': 'admin', 'count': total_admins, 'color': '#c33'},
+            {'role': 'mentor', 'count': total_mentors, 'color': '#856404'},
+            {'role': 'user', 'count': total_users_role, 'color': '#1976d2'}
+        ],
+        'mentor_assignment': [
+            {'status': 'Con mentor', 'count': users_with_mentor, 'color': '#28a745'},
+            {'status': 'Sin mentor', 'count': users_without_mentor, 'color': '#dc3545'}
+        ],
+        'mentor_breakdown': mentor_breakdown,
+        'category_distribution': category_distribution,
+        'monthly_users': monthly_breakdown
+    }
+
+
+
+def _seconds_between(later, earlier):
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.extract('epoch', later - earlier)
+    return (func.julianday(later) - func.julianday(earlier)) * 86400
+
+
+def _median_by_mentor(values):
+    """
+    {mentor_id: (mediana, cantidad)} de values (subconsulta con mentor_id y seconds). La mediana
+    sale de row_number() y count() por mentor: el valor del medio, o el promedio de los dos del
+    medio (percentile_cont no existe en SQLite).
+    """
+    ranked = db.select(
+        values.c.mentor_id, values.c.seconds,
+        func.row_number().over(partition_by=values.c.mentor_id, order_by=values.c.seconds).label('position'),
+        func.count().over(partition_by=values.c.mentor_id).label('total'),
+    ).subquery()
+    rows = db.session.execute(
+        db.select(ranked.c.mentor_id, func.avg(ranked.c.seconds), func.max(ranked.c.total))
+        .where(ranked.c.position.between((ranked.c.total + 1) // 2, (ranked.c.total + 2) // 2))
+        .group_by(ranked.c.mentor_id)
+    ).all()
+    return {mentor_id: (float(median), total) for mentor_id, median, total in rows}
+
+
+def _first_responses(since):
+    """
+    Tiempo hasta la primera respuesta del mentor a cada turno de su emprendedora. Los mensajes de
+    cada conversación se ordenan por fecha; un turno empieza cuando cambia quien escribe
+    (lag(sender_id)) y su respuesta es el comienzo del turno siguiente (lead(created_at)).
+    """
+    conversation = (MentorMessage.user_id, MentorMessage.mentor_id)
+    messages = db.select(
+        MentorMessage.user_id, MentorMessage.mentor_id, MentorMessage.sender_id, MentorMessage.created_at,
+        func.lag(MentorMessage.sender_id).over(
+            partition_by=conversation, order_by=(MentorMessage.created_at, MentorMessage.id)).label('previous_sender'),
+    ).where(MentorMessage.created_at >= since,
+            MentorMessage.sender_id.in_((MentorMessage.user_id, MentorMessage.mentor_id))).subquery()
+    turns = db.select(
+        messages.c.user_id, messages.c.mentor_id, messages.c.sender_id, messages.c.created_at,
+        func.lead(messages.c.created_at).over(
+            partition_by=(messages.c.user_id, messages.c.mentor_id), order_by=messages.c.created_at,
+        ).label('answered_at'),
+    ).where(db.or_(messages.c.previous_sender.is_(None),
+                   messages.c.previous_sender != messages.c.sender_id)).subquery()
+    responses = db.select(
+        turns.c.mentor_id, _seconds_between(turns.c.answered_at, turns.c.created_at).label('seconds'),
+    ).where(turns.c.sender_id == turns.c.user_id, turns.c.answered_at.isnot(None)).subquery()
+    return _median_by_mentor(responses)
+
+
+def _invitation_stats(since):
+    """{mentor_id: (recibidas, aceptadas, rechazadas)} y la mediana del tiempo de respuesta"""
+    counts = {
+        mentor_id: (total, int(accepted or 0), int(rejected or 0))
+        for mentor_id, total, accepted, rejected in db.session.query(
+            MentorInvitation.mentor_id, func.count(),
+            func.sum(db.case((MentorInvitation.status == 'accepted', 1), else_=0)),
+            func.sum(db.case((MentorInvitation.status == 'rejected', 1), else_=0)),
+        ).filter(MentorInvitation.created_at >= since).group_by(MentorInvitation.mentor_id)
+    }
+    responded = db.select(
+        MentorInvitation.mentor_id,
+        _seconds_between(MentorInvitation.responded_at, MentorInvitation.created_at).label('seconds'),
+    ).where(MentorInvitation.created_at >= since, MentorInvitation.responded_at.isnot(None)).subquery()
+    return counts, _median_by_mentor(responded)
+
+
+def _previous_month(month):
+    return date(month.year - 1, 12, 1) if month.month == 1 else date(month.year, month.month - 1, 1)
+
+
+def _revenue_by_month(today):
+    """
+    {mentor_id: [{'month', 'revenue', 'growth_pct'}]} de los últimos SCORECARD_REVENUE_MONTHS meses
+    completos, desde el cubo de ventas (models/sales_cube.py). El crecimiento compara con el mes
+    anterior (lag); si ese mes no tuvo ventas queda en None.
+    """
+    end = today.replace(day=1)
+    start = end
+    for _ in range(SCORECARD_REVENUE_MONTHS):
+        start = _previous_month(start)
+    monthly = (db.select(SalesCube.mentor_id, SalesCube.month, func.sum(SalesCube.revenue).label('revenue'))
+               .where(SalesCube.month >= _previous_month(start), SalesCube.month < end,
+                      SalesCube.mentor_id != NO_MENTOR)
+               .group_by(SalesCube.mentor_id, SalesCube.month)
+               .subquery())
+    window = {'partition_by': monthly.c.mentor_id, 'order_by': monthly.c.month}
+    rows = db.session.execute(
+        db.select(monthly.c.mentor_id, monthly.c.month, monthly.c.revenue,
+                  func.lag(monthly.c.month, type_=db.Date).over(**window),
+                  func.lag(monthly.c.revenue, type_=monthly.c.revenue.type).over(**window))
+        .order_by(monthly.c.mentor_id, monthly.c.month)
+    ).all()
+    result = {}
+    for mentor_id, month, revenue, previous_month, previous_revenue in rows:
+        if month < start:
+            continue  # Solo sirve de base para el primer mes
+        revenue = float(revenue or 0)
+        previous = float(previous_revenue or 0) if previous_month == _previous_month(month) else 0.0
+        result.setdefault(mentor_id, []).append({
+            'month': f"{month.year}-{month.month:02d}",
+            'revenue': round(revenue, 2),
+            'growth_pct': round((revenue - previous) / previous * 100, 1) if previous > 0 else None,
+        })
+    return result
+
+
+def _compute_scorecard():
+    """Métricas de cada mentor con ventas, mensajes e invitaciones (una consulta por métrica)"""
+    today = date.today()
+    since = datetime.utcnow() - timedelta(days=SCORECARD_WINDOW_DAYS)
+    responses = _first_responses(since)
+    messages = dict(db.session.query(MentorMessage.mentor_id, func.count())
+                    .filter(MentorMessage.created_at >= since)
+                    .group_by(MentorMessage.mentor_id).all())
+    invitations, invitation_times = _invitation_stats(since)
+    revenue = _revenue_by_month(today)
+
+    mentors = []
+    for mentor_id in sorted(set(responses) | set(messages) | set(invitations) | set(revenue)):
+        median_response, answered = responses.get(mentor_id, (None, 0))
+        received, accepted, rejected = invitations.get(mentor_id, (0, 0, 0))
+        median_invitation = invitation_times.get(mentor_id, (None, 0))[0]
+        months = revenue.get(mentor_id, [])
+        mentors.append({
+            'mentor_id': mentor_id,
+            'messages': messages.get(mentor_id, 0),
+            'answered_turns': answered,
+            'median_first_response_minutes': round(median_response / 60, 1) if median_response is not None else None,
+            'invitations_received': received,
+            'invitations_accepted': accepted,
+            'invitations_rejected': rejected,
+            'invitation_acceptance_rate': round(accepted / (accepted + rejected) * 100, 1) if accepted + rejected else None,
+            'median_invitation_response_hours': round(median_invitation / 3600, 1) if median_invitation is not None else None,
+            'revenue_by_month': months,
+            'revenue_growth_pct': months[-1]['growth_pct'] if months else None,
+        })
+    return {'window_days': SCORECARD_WINDOW_DAYS, 'mentors': mentors}
+
+
+def _seconds_since_midnight():
+    """Antigüedad máxima del scorecard: se calcula una vez por día (UTC)"""
+    now = datetime.utcnow()
+    return max(1, int((now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()))
+
 
 class BIController:
     """Controlador para Business Intelligence y estadísticas"""
     
     @staticmethod
-    def get_statistics():
-        """Obtiene estadísticas generales del sistema"""
+    def get_statistics(refresh=False):
+        """
+        Estadísticas generales del sistema. Se leen de las tablas resumen (_compute_statistics) y
+        se guardan como snapshot por BI_SNAPSHOT_MAX_AGE segundos: el dashboard cuesta un número
+        fijo de consultas sin importar la cantidad de usuarios.
+        refresh=True recalcula aunque el snapshot esté vigente.
+        """
         try:
-            # Estadísticas básicas
-            total_users = User.query.count()
-            total_admins = User.query.filter_by(role='admin').count()
-            total_mentors = User.query.filter_by(role='mentor').count()
-            total_users_role = User.query.filter_by(role='user').count()
-            
-            # Usuarios con mentor asignado
-            users_with_mentor = User.query.filter(User.role == 'user', User.mentor_id.isnot(None)).count()
-            users_without_mentor = total_users_role - users_with_mentor
-            
-            # Estadísticas por mentor
-            mentors_with_users = User.query.filter_by(role='mentor').all()
-            mentor_breakdown = []
-            for mentor in mentors_with_users:
-                assigned_count = len(mentor.assigned_users)
-                if assigned_count > 0:
-                    mentor_breakdown.append({
-                        'mentor': mentor.username,
-                        'count': assigned_count
-                    })
-            
-            # Usuarios creados por mes (últimos 6 meses)
-            six_months_ago = datetime.utcnow() - timedelta(days=180)
-            monthly_users_raw = db.session.query(
-                extract('year', User.created_at).label('year'),
-                extract('month', User.created_at).label('month'),
-                func.count(User.id).label('count')
-            ).filter(
-                User.created_at >= six_months_ago
-            ).group_by(
-                extract('year', User.created_at),
-                extract('month', User.created_at)
-            ).order_by(extract('year', User.created_at), extract('month', User.created_at)).all()
-            
-            monthly_breakdown = [
-                {'month': f"{int(year)}-{int(month):02d}", 'count': count}
-                for year, month, count in monthly_users_raw
-            ]
-            
-            # Usuarios por rol
-            role_distribution = [
-                {'role': 'admin', 'count': total_admins, 'color': '#c33'},
-                {'role': 'mentor', 'count': total_mentors, 'color': '#856404'},
-                {'role': 'user', 'count': total_users_role, 'color': '#1976d2'}
-            ]
-            
-            # Usuarios con/sin mentor
-            mentor_assignment = [
-                {'status': 'Con mentor', 'count': users_with_mentor, 'color': '#28a745'},
-                {'status': 'Sin mentor', 'count': users_without_mentor, 'color': '#dc3545'}
-            ]
-            
-            return {
-                'overview': {
-                    'total_users': total_users,
-                    'total_admins': total_admins,
-                    'total_mentors': total_mentors,
-                    'total_users_role': total_users_role,
-                    'users_with_mentor': users_with_mentor,
-                    'users_without_mentor': users_without_mentor
-                },
-                'role_distribution': role_distribution,
-                'mentor_assignment': mentor_assignment,
-                'mentor_breakdown': mentor_breakdown,
-                'monthly_users': monthly_breakdown
-            }, 200
-        except Exception as e:
-            return {'error': f'Error al obtener estadísticas: {str(e)}'}, 500
+            payload, computed_at = BISnapshot.get_or_compute(
+                STATISTICS_SNAPSHOT, current_app.config['BI_SNAPSHOT_MAX_AGE'], _compute_statistics, refresh)
+            return {**payload, 'generated_at': computed_at}, 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al obtener estadísticas')
     
     @staticmethod
-    def get_mentor_performance():
-        """Obtiene métricas de rendimiento de mentores"""
+    def get_mentor_performance(refresh=False):
+        """
+        Rendimiento de mentores: usuarios asignados (bi_mentor_load, al día) y el scorecard de
+        _compute_scorecard(), que se calcula una vez por día y se guarda como snapshot: mediana de
+        la primera respuesta, mensajes por emprendedora por semana, invitaciones aceptadas y su
+        tiempo de respuesta, e ingresos de sus emprendedoras mes a mes.
+        refresh=True recalcula el scorecard.
+        """
         try:
-            mentors = User.query.filter_by(role='mentor').all()
+            ensure_fresh(current_app.config['BI_SNAPSHOT_MAX_AGE'])
+            scorecard, computed_at = BISnapshot.get_or_compute(
+                SCORECARD_SNAPSHOT, _seconds_since_midnight(), _compute_scorecard, refresh)
+            metrics = {item['mentor_id']: item for item in scorecard['mentors']}
+            weeks = scorecard['window_days'] / 7
+            mentors = (db.session.query(User.id, User.username, User.email,
+                                        func.coalesce(BIMentorLoad.mentees, 0))
+                       .outerjoin(BIMentorLoad, BIMentorLoad.mentor_id == User.id)
+                       .filter(User.role == 'mentor')
+                       .all())
             
             performance_data = []
-            for mentor in mentors:
-                assigned_count = len(mentor.assigned_users)
+            for mentor_id, username, email, assigned_count in mentors:
+                mentor_metrics = dict(metrics.get(mentor_id, {}))
+                mentor_metrics.pop('mentor_id', None)
+                messages = mentor_metrics.get('messages', 0)
                 performance_data.append({
-                    'mentor_id': mentor.id,
-                    'mentor_name': mentor.username,
+                    'mentor_id': mentor_id,
+                    'mentor_name': username,
                     'assigned_users': assigned_count,
-                    'email': mentor.email
+                    'email': email,
+                    **mentor_metrics,
+                    'messages_per_mentee_week': round(messages / assigned_count / weeks, 2) if assigned_count else None,
                 })
             
             # Ordenar por cantidad de usuarios asignados
@@ -101,8 +291,10 @@ class BIController:
             
             return {
                 'mentors': performance_data,
-                'total_mentors': len(performance_data)
+                'total_mentors': len(performance_data),
+                'window_days': scorecard['window_days'],
+                'generated_at': computed_at
             }, 200
-        except Exception as e:
-            return {'error': f'Error al obtener rendimiento de mentores: {str(e)}'}, 500
-
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al obtener rendimiento de mentores')
@@ -0,0 +1,283 @@
+"""
+Exportación de ventas, parámetros, usuarios y mensajes a Parquet para análisis fuera de línea.
+
+Cada tabla se escribe en EXPORT_DIR/<tabla>/month=YYYY-MM/category=<categoría>/part-<ejecución>.parquet
+(particiones al estilo Hive: pyarrow.dataset, DuckDB o Spark las leen como columnas). La
+categoría es la business_category de la emprendedora (la de la fila en users). Los tipos se
+toman de los modelos: Numeric como decimal128 con su precisión, Date como date32 y DateTime
+como timestamp[us].
+
+- Incremental: solo las filas con updated_at posterior a la marca de agua de la tabla
+  (export_watermarks, migración 0020), releídas con WATERMARK_OVERLAP de margen. Cada ejecución
+  agrega archivos nuevos; una fila editada aparece en más de uno y vale la de updated_at mayor
+  por id. Los borrados físicos de ventas no dejan rastro: una exportación full los refleja.
+- Full: reescribe la tabla entera y reemplaza su directorio.
+
+Las filas se leen con un cursor del lado del servidor, de a EXPORT_BATCH_SIZE, en una transacción
+de solo lectura REPEATABLE READ en Postgres (todas las tablas ven el mismo momento).
+EXPORT_DATABASE_URL permite leer de una réplica. Los archivos se escriben primero en un
+directorio temporal y se mueven al final: una ejecución fallida no deja archivos a medias ni
+avanza la marca de agua.
+
+Los mensajes se exportan sin content ni file_path (conversaciones privadas); los usuarios, sin
+username, email ni contraseña.
+"""
+import shutil
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import quote
+from flask import current_app
+from sqlalchemy import create_engine
+from models.user import User
+from models.daily_sale import DailySale, MonthlyParameters
+from models.mentor_message import MentorMessage
+from models.export_watermark import ExportWatermark
+from config.database import db
+from config.logging_config import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependencia opcional; está en requirements-export.txt
+    pa = pq = None
+
+logger = get_logger('admin')
+
+WATERMARK_OVERLAP = timedelta(minutes=5)
+# Valor de partición de month/category vacíos (el que usan Hive y pyarrow para NULL)
+DEFAULT_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# model: tabla exportada; columns: columnas en el archivo; month: columna de la partición por mes
+# (fecha, fecha y hora o 'YYYY-MM'); owner: columna con el id de la emprendedora (su categoría)
+ExportTable = namedtuple('ExportTable', 'model columns month owner')
+
+EXPORT_TABLES = {
+    'daily_sales': ExportTable(
+        DailySale,
+        (DailySale.id, DailySale.user_id, DailySale.sale_date, DailySale.product_name, DailySale.units_sold,
+         DailySale.price_per_unit, DailySale.variable_cost_per_unit, DailySale.created_at, DailySale.updated_at),
+        DailySale.sale_date, DailySale.user_id),
+    'monthly_parameters': ExportTable(
+        MonthlyParameters,
+        (MonthlyParameters.id, MonthlyParameters.user_id, MonthlyParameters.month_year,
+         MonthlyParameters.target_monthly_sales, MonthlyParameters.fixed_costs_monthly,
+         MonthlyParameters.loan_monthly_payment, MonthlyParameters.working_days_per_month,
+         MonthlyParameters.default_price_per_unit, MonthlyParameters.default_variable_cost_per_unit,
+         MonthlyParameters.created_at, MonthlyParameters.updated_at),
+        MonthlyParameters.month_year, MonthlyParameters.user_id),
+    'users': ExportTable(
+        User,
+        (User.id, User.role, User.mentor_id, User.business_name, User.business_category,
+         User.created_at, User.updated_at, User.deleted_at),
+        User.created_at, User.id),
+    'mentor_messages': ExportTable(
+        MentorMessage,
+        (MentorMessage.id, MentorMessage.user_id, MentorMessage.mentor_id, MentorMessage.sender_id,
+         MentorMessage.file_name, MentorMessage.file_type, MentorMessage.file_size, MentorMessage.is_read,
+         MentorMessage.created_at, MentorMessage.updated_at),
+        MentorMessage.created_at, MentorMessage.user_id),
+}
+
+
+def _arrow_type(column_type):
+    """Tipo de Arrow de una columna de SQLAlchemy"""
+    if isinstance(column_type, db.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, db.BigInteger):
+        return pa.int64()
+    if isinstance(column_type, db.Integer):
+        return pa.int32()
+    if isinstance(column_type, db.Float):
+        return pa.float64()
+    if isinstance(column_type, db.Numeric):
+        return pa.decimal128(column_type.precision or 18, column_type.scale or 0)
+    if isinstance(column_type, db.DateTime):
+        return pa.timestamp('us')
+    if isinstance(column_type, db.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _schema(spec):
+    return pa.schema([
+        pa.field(column.key, _arrow_type(column.type), nullable=column.nullable)
+        for column in spec.columns
+    ])
+
+
+def _partition(month, category):
+    """Ruta relativa month=.../category=... de una fila"""
+    if isinstance(month, str):
+        month = month[:7] or None
+    elif month is not None:
+        month = f"{month.year}-{month.month:02d}"
+    category = (category or '').strip()
+    return (f"month={month or DEFAULT_PARTITION}/"
+            f"category={quote(category, safe='') if category else DEFAULT_PARTITION}")
+
+
+def _statement(spec, since):
+    """SELECT de las columnas, la partición y la categoría de la emprendedora (filas con updated_at >= since)"""
+    model = spec.model
+    if model is User:
+        category = User.business_category
+        statement = db.select(*spec.columns, category)
+    else:
+        owner = db.aliased(User)
+        category = owner.business_category
+        statement = (db.select(*spec.columns, category)
+                     .select_from(model)
+                     .outerjoin(owner, owner.id == spec.owner))
+    if since is not None:
+        statement = statement.where(model.updated_at >= since)
+    return statement
+
+
+class _PartitionWriters:
+    """Un ParquetWriter por partición, abiertos mientras dura la exportación de la tabla"""
+
+    def __init__(self, root, schema, run_name):
+        self.root = root
+        self.schema = schema
+        self.run_name = run_name
+        self.writers = {}
+
+    def write(self, partition, columns):
+        writer = self.writers.get(partition)
+        if writer is None:
+            path = self.root / partition / f'part-{self.run_name}.parquet'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self.writers[partition] = pq.ParquetWriter(path, self.schema, compression='zstd')
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        return len(self.writers)
+
+
+def _export_table(connection, name, spec, since, staging, run_name, batch_size):
+    """Escribe las filas de la tabla en staging; devuelve (filas, archivos, mayor updated_at)"""
+    schema = _schema(spec)
+    writers = _PartitionWriters(staging / name, schema, run_name)
+    width = len(spec.columns)
+    month_index = [column.key for column in spec.columns].index(spec.month.key)
+    updated_index = [column.key for column in spec.columns].index('updated_at')
+    rows, watermark = 0, None
+    try:
+        result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(
+            _statement(spec, since))
+        for batch in result.partitions():
+            grouped = {}
+            for row in batch:
+                grouped.setdefault(_partition(row[month_index], row[width]), []).append(row[:width])
+                updated_at = row[updated_index]
+                if updated_at is not None and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+            for partition, partition_rows in grouped.items():
+                writers.write(partition, list(zip(*partition_rows)))
+            rows += len(batch)
+    finally:
+        files = writers.close()
+    return rows, files, watermark
+
+
+def _publish(staging_table, target, full):
+    """Mueve los archivos de staging a EXPORT_DIR; full reemplaza el directorio de la tabla"""
+    if full:
+        previous = target.with_name(f'{target.name}.previous')
+        shutil.rmtree(previous, ignore_errors=True)
+        if target.exists():
+            target.rename(previous)
+        if staging_table.exists():
+            staging_table.rename(target)
+        else:
+            target.mkdir(parents=True)
+        shutil.rmtree(previous, ignore_errors=True)
+        return
+    if not staging_table.exists():
+        return
+    for path in staging_table.rglob('*.parquet'):
+        destination = target / path.relative_to(staging_table)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        path.replace(destination)
+
+
+def _source_engine():
+    """Engine de lectura: EXPORT_DATABASE_URL (p. ej. una réplica) o el de la aplicación"""
+    url = current_app.config['EXPORT_DATABASE_URL']
+    return create_engine(url, pool_pre_ping=True) if url else None
+
+
+def run_export(tables=None, full=False, output_dir=None):
+    """
+    Exporta las tablas pedidas (todas por defecto) y actualiza sus marcas de agua.
+    Devuelve {tabla: {'mode', 'rows', 'files', 'watermark'}}.
+    """
+    if pa is None:
+        raise RuntimeError('pyarrow no está instalado: pip install -r requirements-export.txt')
+    tables = list(tables or EXPORT_TABLES)
+    unknown = [name for name in tables if name not in EXPORT_TABLES]
+    if unknown:
+        raise ValueError(f"Tablas desconocidas: {', '.join(unknown)}; opciones: {', '.join(EXPORT_TABLES)}")
+
+    root = Path(output_dir or current_app.config['EXPORT_DIR'])
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    now = datetime.utcnow()
+    run_name = now.strftime('%Y%m%dT%H%M%S') + ('-full' if full else '')
+    staging = root / f'.staging-{run_name}'
+    states = {state.table_name: state for state in
+              db.session.query(ExportWatermark).filter(ExportWatermark.table_name.in_(tables))}
+
+    replica = _source_engine()
+    engine = replica or db.engine
+    results = {}
+    try:
+        with engine.connect() as connection:
+            if connection.dialect.name == 'postgresql':
+                connection = connection.execution_options(isolation_level='REPEATABLE READ',
+                                                          postgresql_readonly=True)
+            with connection.begin():
+                for name in tables:
+                    state = states.get(name)
+                    table_full = full or state is None or state.watermark is None
+                    since = None if table_full else state.watermark - WATERMARK_OVERLAP
+                    started = time.perf_counter()
+                    rows, files, watermark = _export_table(connection, name, EXPORT_TABLES[name], since,
+                                                           staging, run_name, batch_size)
+                    logger.info(f"Exportación de {name}: {rows} filas en {files} archivos "
+                                f"({'full' if table_full else 'incremental'}) en "
+                                f"{int((time.perf_counter() - started) * 1000)} ms")
+                    previous = state.watermark if state is not None else None
+                    results[name] = {
+                        'mode': 'full' if table_full else 'incremental',
+                        'rows': rows,
+                        'files': files,
+                        'watermark': max(filter(None, (previous if not table_full else None, watermark)),
+                                         default=None),
+                    }
+
+        # Publicar y guardar las marcas solo cuando todas las tablas se escribieron
+        for name, result in results.items():
+            _publish(staging / name, root / name, result['mode'] == 'full')
+            state = states.get(name)
+            if state is None:
+                state = ExportWatermark(table_name=name)
+                db.session.add(state)
+            state.watermark = result['watermark']
+            state.exported_at = now
+            state.mode = result['mode']
+            state.rows = result['rows']
+            state.files = result['files']
+        db.session.commit()
+        return results
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if replica is not None:
+            replica.dispose()
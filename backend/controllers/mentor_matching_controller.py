@@ -0,0 +1,221 @@
+"""
+Asignación automática de mentores a las emprendedoras sin mentor.
+
+Reemplaza la asignación de a una (assign_user_to_mentor / invitaciones) por un cálculo en lote:
+- Se leen en dos consultas las usuarias sin mentor (rol 'user', sin invitación pendiente) y la
+  carga actual de cada mentor (usuarios asignados).
+- Cada usuaria va al mentor de menor carga de su misma business_category que tenga lugar; si no
+  hay, al de menor carga de todos. Ningún mentor supera capacity. Con montículos por categoría el
+  costo es O((usuarias + mentores) · log mentores): 100k × 1k se resuelve en menos de un segundo.
+- El resultado se aplica en una transacción con un solo UPDATE ... FROM unnest(...) en Postgres
+  (WHERE mentor_id IS NULL, así no se pisa una asignación hecha mientras tanto). dry_run=True solo
+  devuelve la propuesta.
+"""
+import heapq
+import math
+import time
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy.dialects.postgresql import ARRAY
+from models.user import User
+from models.mentor_invitation import MentorInvitation
+from config.database import db
+from config.errors import internal_error
+from config.logging_config import get_logger
+
+logger = get_logger('admin')
+
+# Ids por sentencia UPDATE ... WHERE id IN (...) fuera de Postgres (SQLite admite hasta 32766 parámetros)
+UPDATE_CHUNK_SIZE = 5000
+
+
+def _category(value):
+    """Categoría normalizada para comparar (None si está vacía)"""
+    value = (value or '').strip().lower()
+    return value or None
+
+
+def _pop_available(heap, loads, capacity):
+    """
+    Mentor de menor carga con lugar en heap, o None. Las entradas con una carga que ya no es la
+    actual quedaron viejas al asignar y se descartan; las de mentores llenos también.
+    """
+    while heap:
+        load, mentor_id = heap[0]
+        if load != loads[mentor_id] or load >= capacity:
+            heapq.heappop(heap)
+            continue
+        return mentor_id
+    return None
+
+
+def solve(users, mentors, capacity):
+    """
+    Asignación balanceada con límite de capacidad.
+    users: [(id, categoría)] en orden de prioridad; mentors: [(id, categoría, carga actual)].
+    Devuelve (asignaciones [(user_id, mentor_id, misma_categoría)], ids sin lugar).
+    """
+    loads = {}
+    categories = {}
+    by_category = defaultdict(list)
+    everyone = []
+    for mentor_id, category, load in mentors:
+        loads[mentor_id] = load
+        categories[mentor_id] = category
+        everyone.append((load, mentor_id))
+        if category:
+            by_category[category].append((load, mentor_id))
+    heapq.heapify(everyone)
+    for heap in by_category.values():
+        heapq.heapify(heap)
+
+    assignments, unassigned = [], []
+    for user_id, category in users:
+        mentor_id = None
+        if category in by_category:
+            mentor_id = _pop_available(by_category[category], loads, capacity)
+        if mentor_id is None:
+            mentor_id = _pop_available(everyone, loads, capacity)
+        if mentor_id is None:
+            unassigned.append(user_id)
+            continue
+
+        loads[mentor_id] += 1
+        load = loads[mentor_id]
+        heapq.heappush(everyone, (load, mentor_id))
+        if categories[mentor_id]:
+            heapq.heappush(by_category[categories[mentor_id]], (load, mentor_id))
+        assignments.append((user_id, mentor_id, category is not None and category == categories[mentor_id]))
+    return assignments, unassigned
+
+
+def _load_unassigned_users():
+    """(id, categoría) de las usuarias sin mentor ni invitación pendiente, las más antiguas primero"""
+    pending = (db.select(MentorInvitation.id)
+               .where(MentorInvitation.user_id == User.id, MentorInvitation.status == 'pending')
+               .exists())
+    rows = (db.session.query(User.id, User.business_category)
+            .filter(User.role == 'user', User.mentor_id.is_(None), ~pending)
+            .order_by(User.created_at, User.id)
+            .all())
+    return [(user_id, _category(category)) for user_id, category in rows]
+
+
+def _load_mentors():
+    """(id, username, categoría, carga) de cada mentor, con la carga contada en la misma consulta"""
+    assigned = db.aliased(User)
+    rows = (db.session.query(User.id, User.username, User.business_category, db.func.count(assigned.id))
+            .outerjoin(assigned, assigned.mentor_id == User.id)
+            .filter(User.role == 'mentor')
+            .group_by(User.id, User.username, User.business_category)
+            .order_by(User.id)
+            .all())
+    return [(mentor_id, username, _category(category), load) for mentor_id, username, category, load in rows]
+
+
+def _apply(assignments):
+    """
+    Guarda las asignaciones; devuelve las filas actualizadas. Solo se tocan usuarias que siguen
+    sin mentor. En Postgres es un único UPDATE ... FROM unnest(ids, mentores); en otras bases
+    (desarrollo) un UPDATE por mentor, en bloques de UPDATE_CHUNK_SIZE ids.
+    """
+    still_unassigned = (User.role == 'user', User.mentor_id.is_(None))
+    options = {'synchronize_session': False}
+    if db.session.get_bind().dialect.name == 'postgresql':
+        matched = (db.func.unnest(
+                       db.bindparam('user_ids', [user_id for user_id, _, _ in assignments], type_=ARRAY(db.Integer)),
+                       db.bindparam('mentor_ids', [mentor_id for _, mentor_id, _ in assignments],
+                                    type_=ARRAY(db.Integer)))
+                   .table_valued('user_id', 'mentor_id')
+                   .render_derived(name='matched'))
+        return db.session.execute(
+            db.update(User).where(User.id == matched.c.user_id, *still_unassigned)
+            .values(mentor_id=matched.c.mentor_id),
+            execution_options=options,
+        ).rowcount
+
+    by_mentor = defaultdict(list)
+    for user_id, mentor_id, _ in assignments:
+        by_mentor[mentor_id].append(user_id)
+    updated = 0
+    for mentor_id, user_ids in by_mentor.items():
+        for start in range(0, len(user_ids), UPDATE_CHUNK_SIZE):
+            chunk = user_ids[start:start + UPDATE_CHUNK_SIZE]
+            updated += db.session.execute(
+                db.update(User).where(User.id.in_(chunk), *still_unassigned).values(mentor_id=mentor_id),
+                execution_options=options,
+            ).rowcount
+    return updated
+
+
+class MentorMatchingController:
+    """Asignación en lote de mentores a usuarias sin mentor"""
+
+    @staticmethod
+    def match(capacity=None, dry_run=False):
+        """
+        Calcula y (salvo dry_run) aplica la asignación. capacity es el máximo de usuarios por mentor;
+        si no se indica se usa MENTOR_CAPACITY y, si es 0, el reparto parejo
+        ceil((asignados + sin mentor) / mentores), que alcanza para asignar a todas.
+        """
+        started = time.perf_counter()
+        try:
+            users = _load_unassigned_users()
+            mentors = _load_mentors()
+            if not mentors:
+                return {'error': 'No hay mentores para asignar'}, 400
+
+            if capacity is None:
+                capacity = current_app.config['MENTOR_CAPACITY']
+            if not capacity:
+                total = sum(load for *_, load in mentors) + len(users)
+                capacity = math.ceil(total / len(mentors))
+
+            solve_started = time.perf_counter()
+            assignments, unassigned = solve(users, [(m_id, category, load) for m_id, _, category, load in mentors],
+                                            capacity)
+            solve_ms = int((time.perf_counter() - solve_started) * 1000)
+
+            applied = 0
+            if not dry_run and assignments:
+                applied = _apply(assignments)
+                db.session.commit()
+
+            new_users = defaultdict(int)
+            for _, mentor_id, _ in assignments:
+                new_users[mentor_id] += 1
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            logger.info(f"Asignación de mentores: {len(users)} usuarias, {len(mentors)} mentores, "
+                        f"{len(assignments)} asignadas, {len(unassigned)} sin lugar (capacidad {capacity}) "
+                        f"en {duration_ms} ms{' (dry-run)' if dry_run else ''}")
+            return {
+                'dry_run': dry_run,
+                'capacity': capacity,
+                'users_considered': len(users),
+                'assigned': len(assignments),
+                'applied': applied,
+                # Asignadas por otro camino entre la lectura y el UPDATE: quedan con ese mentor
+                'conflicts': len(assignments) - applied if not dry_run else 0,
+                'category_matches': sum(1 for *_, same in assignments if same),
+                'unassigned': unassigned,
+                'mentors': [
+                    {
+                        'id': mentor_id,
+                        'username': username,
+                        'business_category': category,
+                        'load_before': load,
+                        'new_users': new_users[mentor_id],
+                        'load_after': load + new_users[mentor_id],
+                    }
+                    for mentor_id, username, category, load in mentors
+                ],
+                'assignments': [
+                    {'user_id': user_id, 'mentor_id': mentor_id, 'category_match': same}
+                    for user_id, mentor_id, same in assignments
+                ],
+                'solve_ms': solve_ms,
+                'duration_ms': duration_ms,
+            }, 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al asignar mentores')
@@ -0,0 +1,201 @@
+"""
+Analítica de ventas de toda la plataforma para admins.
+
+Lee el cubo de ventas (models/sales_cube.py), que se actualiza con cada venta: unidades,
+ingresos, costos variables y ganancia bruta por mes, business_category y mentor, agrupados por
+cualquier combinación de esas dimensiones. La consulta recorre celdas del cubo, no daily_sales.
+
+Las usuarias en riesgo siguen la regla de SalesController.get_sales_report: con meta mensual
+(monthly_parameters del mes), la proyección de unidades a fin de mes queda por debajo del 80%
+de la meta. Se calcula al consultar porque depende del día de hoy: una fila por usuaria con
+meta, con sus unidades del mes leídas de sales_user_month.
+"""
+from datetime import date
+from flask import current_app
+from models.user import User
+from models.daily_sale import MonthlyParameters, month_range
+from models.bi_rollup import BIUserFact, ensure_fresh
+from models.sales_cube import NO_MENTOR, SalesCube, SalesUserMonth
+from config.database import db
+from config.errors import internal_error
+from config.logging_config import get_logger
+
+logger = get_logger('admin')
+
+DIMENSIONS = ('month', 'category', 'mentor')
+MAX_MONTHS = 60
+# Proyección mínima (fracción de la meta) para no estar en riesgo, como en get_sales_report
+AT_RISK_RATIO = 0.8
+
+
+def parse_group_by(value):
+    """Dimensiones de 'month,category,mentor' (en ese orden); ValueError si alguna no existe"""
+    requested = [item.strip() for item in (value or 'month').split(',') if item.strip()]
+    unknown = [item for item in requested if item not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"group_by inválido: {', '.join(unknown)}; opciones: {', '.join(DIMENSIONS)}")
+    return [dimension for dimension in DIMENSIONS if dimension in requested]
+
+
+def _months(start, end):
+    """Primer día de cada mes en [start, end)"""
+    months = []
+    while start < end:
+        months.append(start)
+        start = date(start.year + 1, 1, 1) if start.month == 12 else date(start.year, start.month + 1, 1)
+    return months
+
+
+def _label(month):
+    return f"{month.year}-{month.month:02d}"
+
+
+def _days_elapsed(month, today):
+    """Días transcurridos del mes al día de hoy, como en get_sales_report"""
+    following = date(month.year + 1, 1, 1) if month.month == 12 else date(month.year, month.month + 1, 1)
+    if today < month:
+        return 0
+    return min((today - month).days + 1, (following - month).days)
+
+
+def _default_range(today):
+    """Los últimos 12 meses, incluido el actual"""
+    year, month = (today.year, today.month - 11) if today.month > 11 else (today.year - 1, today.month + 1)
+    return f"{year}-{month:02d}", _label(today)
+
+
+def _parameters_month():
+    """monthly_parameters.month_year ('YYYY-MM') como fecha del primer día, para unir con sales_user_month"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return db.func.to_date(MonthlyParameters.month_year, 'YYYY-MM')
+    return db.func.date(MonthlyParameters.month_year + '-01')
+
+
+def _key(group_by, month, category, mentor_id):
+    values = {'month': month, 'category': category, 'mentor': mentor_id}
+    return tuple(values[dimension] for dimension in group_by)
+
+
+def _at_risk(group_by, months, filters, today):
+    """{clave: (usuarias con meta, en riesgo)} de los meses pedidos"""
+    by_label = {_label(month): month for month in months}
+    rows = (db.session.query(MonthlyParameters.month_year, BIUserFact.category,
+                             db.func.coalesce(BIUserFact.mentor_id, NO_MENTOR),
+                             MonthlyParameters.target_monthly_sales, MonthlyParameters.working_days_per_month,
+                             db.func.coalesce(SalesUserMonth.units, 0))
+            .join(BIUserFact, BIUserFact.user_id == MonthlyParameters.user_id)
+            .outerjoin(SalesUserMonth, db.and_(SalesUserMonth.user_id == MonthlyParameters.user_id,
+                                               SalesUserMonth.month == _parameters_month()))
+            .filter(MonthlyParameters.month_year.in_(list(by_label)),
+                    MonthlyParameters.target_monthly_sales > 0,
+                    BIUserFact.role == 'user',
+                    *filters(BIUserFact.category, BIUserFact.mentor_id))
+            .all())
+    result = {}
+    for label, category, mentor_id, target, working_days, units in rows:
+        month = by_label[label]
+        key = _key(group_by, month, category, mentor_id)
+        tracked, at_risk = result.get(key, (0, 0))
+        days_elapsed = _days_elapsed(month, today)
+        projected = int(units) / days_elapsed * (working_days or 0) if days_elapsed else 0
+        risky = days_elapsed > 0 and projected < target * AT_RISK_RATIO
+        result[key] = (tracked + 1, at_risk + risky)
+    return result
+
+
+class SalesAnalyticsController:
+    """Ventas de todas las emprendedoras agregadas por mes, categoría y mentor"""
+
+    @staticmethod
+    def get_sales_cube(group_by=None, month_from=None, month_to=None, category=None, mentor_id=None):
+        """
+        Totales de ventas agrupados por group_by ('month', 'category' y/o 'mentor') entre
+        month_from y month_to ('YYYY-MM', por defecto los últimos 12 meses). category ('' = sin
+        categoría) y mentor_id ('none' = sin mentor) filtran. Sin 'month' en group_by, sellers y
+        at_risk suman usuarias por mes.
+        """
+        try:
+            today = date.today()
+            group_by = parse_group_by(group_by)
+            if not month_from:
+                month_from, default_to = _default_range(today)
+                month_to = month_to or default_to
+            start, end = month_range(month_from, month_to)
+            months = _months(start, end)
+            if len(months) > MAX_MONTHS:
+                raise ValueError(f'Máximo {MAX_MONTHS} meses por consulta')
+            if mentor_id is not None and mentor_id != 'none' and not str(mentor_id).isdigit():
+                raise ValueError('mentor_id debe ser un id o none')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def filters(category_column, mentor_column):
+            conditions = []
+            if category is not None:
+                conditions.append(category_column == category.strip()[:80])
+            if mentor_id == 'none':
+                conditions.append(db.func.coalesce(mentor_column, NO_MENTOR) == NO_MENTOR)
+            elif mentor_id is not None:
+                conditions.append(mentor_column == int(mentor_id))
+            return conditions
+
+        try:
+            ensure_fresh(current_app.config['BI_SNAPSHOT_MAX_AGE'])
+            columns = {'month': SalesCube.month, 'category': SalesCube.category, 'mentor': SalesCube.mentor_id}
+            dimensions = [columns[dimension] for dimension in group_by]
+            cells = (db.session.query(*dimensions, db.func.sum(SalesCube.units), db.func.sum(SalesCube.revenue),
+                                      db.func.sum(SalesCube.variable_costs), db.func.sum(SalesCube.sales_days),
+                                      db.func.sum(SalesCube.sellers))
+                     .filter(SalesCube.month >= start, SalesCube.month < end,
+                             *filters(SalesCube.category, SalesCube.mentor_id))
+                     .group_by(*dimensions)
+                     .all())
+            totals = {tuple(cell[:len(group_by)]): cell[len(group_by):] for cell in cells}
+            risk = _at_risk(group_by, months, filters, today)
+
+            mentor_ids = {key[group_by.index('mentor')] for key in (*totals, *risk)} if 'mentor' in group_by else set()
+            mentor_ids.discard(NO_MENTOR)
+            usernames = dict(db.session.query(User.id, User.username).filter(User.id.in_(mentor_ids)).all()) \
+                if mentor_ids else {}
+
+            rows = []
+            for key in sorted(set(totals) | set(risk)):
+                units, revenue, variable_costs, sales_days, sellers = totals.get(key, (0, 0, 0, 0, 0))
+                tracked, at_risk = risk.get(key, (0, 0))
+                row = {}
+                for dimension, value in zip(group_by, key):
+                    if dimension == 'month':
+                        row['month'] = _label(value)
+                    elif dimension == 'category':
+                        row['category'] = value or None
+                    else:
+                        row['mentor'] = None if value == NO_MENTOR else {'id': value, 'username': usernames.get(value)}
+                revenue, variable_costs = float(revenue or 0), float(variable_costs or 0)
+                row.update({
+                    'units': int(units or 0),
+                    'revenue': round(revenue, 2),
+                    'variable_costs': round(variable_costs, 2),
+                    'gross_profit': round(revenue - variable_costs, 2),
+                    'sales_days': int(sales_days or 0),
+                    'sellers': int(sellers or 0),
+                    'users_with_target': tracked,
+                    'at_risk': at_risk,
+                })
+                rows.append(row)
+
+            summary = {
+                column: sum(row[column] for row in rows)
+                for column in ('units', 'sales_days', 'sellers', 'users_with_target', 'at_risk')
+            }
+            for column in ('revenue', 'variable_costs', 'gross_profit'):
+                summary[column] = round(sum(row[column] for row in rows), 2)
+            return {
+                'group_by': group_by,
+                'month_from': _label(start),
+                'month_to': _label(months[-1]),
+                'rows': rows,
+                'totals': summary,
+            }, 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al obtener la analítica de ventas')
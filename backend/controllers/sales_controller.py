@@ -1,9 +1,24 @@
-from models.daily_sale import DailySale, MonthlyParameters
+from models.daily_sale import DailySale, MonthlyParameters, month_range
+from models.sales_cube import apply_sale_change
 from models.user import User
 from config.database import db
 from datetime import datetime, date, timedelta
-from sqlalchemy import func, extract
+from sqlalchemy import func
 from decimal import Decimal
+from serializers import DailySaleSerializer, MonthlyParametersSerializer
+from config.streaming import stream_collection
+
+sale_serializer = DailySaleSerializer()
+parameters_serializer = MonthlyParametersSerializer()
+
+def _cube_values(sale):
+    """(unidades, precio, costo variable) con que la venta suma al cubo de ventas"""
+    return sale.units_sold, sale.price_per_unit, sale.variable_cost_per_unit
+
+def _as_floats(row):
+    """Los serializadores devuelven Decimal; los cálculos del reporte trabajan en float"""
+    return {key: float(value) if isinstance(value, Decimal) else value for key, value in row.items()}
+
 
 class SalesController:
     """Controlador para gestión de ventas diarias"""
@@ -36,7 +51,7 @@ class SalesController:
             db.session.add(params)
             db.session.commit()
         
-        return {'parameters': params.to_dict()}, 200
+        return {'parameters': parameters_serializer.dump(params)}, 200
 
     @staticmethod
     def update_monthly_parameters(user_id: int, month_year: str, **kwargs):
@@ -67,7 +82,7 @@ class SalesController:
             params.default_variable_cost_per_unit = Decimal(str(kwargs['default_variable_cost_per_unit'])) if kwargs['default_variable_cost_per_unit'] is not None else None
         
         db.session.commit()
-        return {'message': 'Parámetros actualizados', 'parameters': params.to_dict()}, 200
+        return {'message': 'Parámetros actualizados', 'parameters': parameters_serializer.dump(params)}, 200
 
     @staticmethod
     def create_daily_sale(user_id: int, sale_date: str, units_sold: int, 
@@ -87,14 +102,16 @@ class SalesController:
         
         if existing_sale:
             # Actualizar venta existente
+            previous = _cube_values(existing_sale)
             existing_sale.units_sold = int(units_sold)
             existing_sale.price_per_unit = Decimal(str(price_per_unit))
             existing_sale.variable_cost_per_unit = Decimal(str(variable_cost_per_unit))
             if product_name is not None:
                 existing_sale.product_name = product_name
             existing_sale.updated_at = datetime.utcnow()
+            apply_sale_change(user_id, sale_date_obj, previous, _cube_values(existing_sale))
             db.session.commit()
-            return {'message': 'Venta actualizada', 'sale': existing_sale.to_dict()}, 200
+            return {'message': 'Venta actualizada', 'sale': sale_serializer.dump(existing_sale)}, 200
         else:
             # Crear nueva venta
             new_sale = DailySale(
@@ -106,25 +123,36 @@ class SalesController:
                 product_name=product_name
             )
             db.session.add(new_sale)
+            apply_sale_change(user_id, sale_date_obj, new=_cube_values(new_sale))
             db.session.commit()
-            return {'message': 'Venta creada', 'sale': new_sale.to_dict()}, 201
+            return {'message': 'Venta creada', 'sale': sale_serializer.dump(new_sale)}, 201
 
     @staticmethod
-    def get_daily_sales(user_id: int, month_year: str = None):
-        """Obtiene las ventas diarias del usuario para un mes"""
+    def get_daily_sales(user_id: int, month_year: str = None, month_to: str = None, stream: bool = False):
+        """
+        Obtiene las ventas diarias del usuario para un mes o, con month_to, para varios meses.
+        stream=True escribe la respuesta a medida que lee las filas (config/streaming.py).
+        """
         if not month_year:
             today = date.today()
             month_year = today.strftime('%Y-%m')
         
-        year, month = map(int, month_year.split('-'))
+        try:
+            start, end = month_range(month_year, month_to)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         
-        sales = DailySale.query.filter(
+        # Rango de fechas (no extract()) para que la consulta use idx_user_date
+        query = sale_serializer.select().where(
             DailySale.user_id == user_id,
-            extract('year', DailySale.sale_date) == year,
-            extract('month', DailySale.sale_date) == month
-        ).order_by(DailySale.sale_date.asc()).all()
+            DailySale.sale_date >= start,
+            DailySale.sale_date < end
+        ).order_by(DailySale.sale_date.asc())
+        if stream:
+            return stream_collection('sales', sale_serializer, query), 200
         
-        return {'sales': [s.to_dict() for s in sales]}, 200
+        sales = sale_serializer.all(query)
+        return {'sales': sale_serializer.dump_many(sales)}, 200
 
     @staticmethod
     def delete_daily_sale(user_id: int, sale_id: int):
@@ -134,6 +162,7 @@ class SalesController:
             return {'error': 'Venta no encontrada'}, 404
         
         db.session.delete(sale)
+        apply_sale_change(user_id, sale.sale_date, old=_cube_values(sale))
         db.session.commit()
         return {'message': 'Venta eliminada'}, 200
 
@@ -146,11 +175,11 @@ class SalesController:
         
         # Obtener parámetros mensuales
         params_result, _ = SalesController.get_monthly_parameters(user_id, month_year)
-        params = params_result['parameters']
+        params = _as_floats(params_result['parameters'])
         
         # Obtener ventas del mes
         sales_result, _ = SalesController.get_daily_sales(user_id, month_year)
-        sales = sales_result['sales']
+        sales = [_as_floats(sale) for sale in sales_result['sales']]
         
         # Calcular estadísticas acumuladas
         total_units = sum(s['units_sold'] for s in sales)
@@ -0,0 +1,91 @@
+from models.user import User
+from config.database import db
+from config.pagination import InvalidCursor, encode_cursor, keyset_page, parse_limit
+from config.errors import internal_error
+from config.logging_config import get_logger
+from serializers import MentorSummarySerializer
+from controllers.admin_controller import user_filters, user_fields_serializer
+
+logger = get_logger('search')
+
+# Orden del cursor de las búsquedas: relevancia descendente y id como desempate
+RELEVANCE_SORT = '-relevance'
+MAX_QUERY_LENGTH = 100
+mentor_serializer = MentorSummarySerializer()
+
+
+def _clean_query(text):
+    text = (text or '').strip()
+    if len(text) > MAX_QUERY_LENGTH:
+        raise ValueError(f'q admite hasta {MAX_QUERY_LENGTH} caracteres')
+    return text
+
+
+def _page(key, serializer, criteria, sort_expression, sort, descending, text, limit, cursor):
+    """
+    Una página por cursor en una sola consulta. sort_expression se selecciona junto a cada objeto
+    (p. ej. la relevancia calculada) para armar el cursor de la página siguiente.
+    """
+    query = serializer.select().add_columns(sort_expression.label('sort_value')).where(*criteria)
+    query = keyset_page(query, sort_expression, User.id, sort, descending, cursor, limit)
+    rows = db.session.execute(query).unique().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last, value = rows[-1]
+        next_cursor = encode_cursor(sort, value, last.id)
+    return {
+        key: serializer.dump_many([obj for obj, _ in rows]),
+        'count': len(rows),
+        'limit': limit,
+        'q': text,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+
+
+class SearchController:
+    """Búsqueda de usuarios y mentores por nombre, email y emprendimiento (User.search)"""
+
+    @staticmethod
+    def search_users(q=None, role=None, mentor_id=None, created_from=None, created_to=None,
+                     fields=None, limit=None, cursor=None):
+        """
+        Búsqueda de admin sobre todos los usuarios, con los mismos filtros y ?fields= que el listado.
+        Resultados por relevancia, paginados por cursor.
+        """
+        try:
+            text = _clean_query(q)
+            if not text:
+                return {'error': 'q es requerido'}, 400
+            serializer = user_fields_serializer(fields)
+            limit = parse_limit(limit)
+            condition, relevance = User.search(text)
+            criteria = [condition, *user_filters(role, mentor_id, created_from, created_to)]
+            return _page('users', serializer, criteria, relevance, RELEVANCE_SORT, True, text, limit, cursor), 200
+        except (InvalidCursor, ValueError) as e:
+            return {'error': str(e)}, 400
+        except Exception:
+            return internal_error(logger, 'Error al buscar usuarios')
+
+    @staticmethod
+    def search_mentors(q=None, limit=None, cursor=None):
+        """
+        Mentores para elegir mentora: por relevancia si hay q; si no, todos por nombre, de a páginas.
+        """
+        try:
+            text = _clean_query(q)
+            limit = parse_limit(limit)
+            criteria = [User.role == 'mentor']
+            if not text:
+                return _page('mentors', mentor_serializer, criteria, User.username, 'username', False,
+                             text, limit, cursor), 200
+            condition, relevance = User.search(text)
+            return _page('mentors', mentor_serializer, criteria + [condition], relevance, RELEVANCE_SORT, True,
+                         text, limit, cursor), 200
+        except (InvalidCursor, ValueError) as e:
+            return {'error': str(e)}, 400
+        except Exception:
+            return internal_error(logger, 'Error al buscar mentores')
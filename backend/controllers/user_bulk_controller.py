@@ -0,0 +1,214 @@
+"""
+Operaciones masivas de admin sobre usuarios: reasignar mentor, cambiar rol y eliminar.
+
+Frente a llamar a los endpoints de a un usuario:
+- Los usuarios pedidos se validan con una sola consulta (id, rol) por lote.
+- Los cambios se aplican con un UPDATE ... WHERE id IN (...) por tabla, todos en una
+  transacción: o se aplica todo lo válido o nada.
+- La eliminación es la baja de DELETE /api/admin/users/<id> (user_purge_controller): se marcan
+  todos en una transacción y sus datos y adjuntos se borran en segundo plano.
+Los usuarios dados de baja (rol 'deleted') no admiten cambios.
+Los ids inexistentes o que no admiten el cambio se informan en 'skipped' y no impiden aplicar
+el resto. dry_run=True solo valida.
+"""
+import time
+from flask import current_app, g
+from models.user import User
+from controllers.user_purge_controller import soft_delete_user, schedule_purge
+from config.database import db
+from config.errors import internal_error
+from config.logging_config import get_logger
+
+logger = get_logger('admin')
+
+ROLES = ('admin', 'mentor', 'user')
+DELETED_REASON = 'Usuario dado de baja'
+
+
+def parse_user_ids(value):
+    """Lista de ids (enteros positivos, sin repetir, en el orden recibido); ValueError si no lo es"""
+    if not isinstance(value, list) or not value:
+        raise ValueError('user_ids debe ser una lista de ids no vacía')
+    ids = []
+    for item in value:
+        if isinstance(item, bool) or not isinstance(item, (int, str)) or not str(item).isdigit():
+            raise ValueError(f'id de usuario inválido: {item!r}')
+        ids.append(int(item))
+    max_users = current_app.config['BULK_MAX_USERS']
+    if len(ids) > max_users:
+        raise ValueError(f'Máximo {max_users} usuarios por operación')
+    return list(dict.fromkeys(ids))
+
+
+def _load_roles(user_ids):
+    """{id: rol} de los usuarios que existen, en una consulta"""
+    return dict(db.session.query(User.id, User.role).filter(User.id.in_(user_ids)).all())
+
+
+def _split(user_ids, roles, reject):
+    """
+    Separa los ids aplicables de los omitidos. reject(id, rol) devuelve el motivo para omitirlo o None.
+    """
+    valid, skipped = [], []
+    for user_id in user_ids:
+        if user_id not in roles:
+            skipped.append({'id': user_id, 'reason': 'Usuario no encontrado'})
+            continue
+        reason = reject(user_id, roles[user_id])
+        if reason:
+            skipped.append({'id': user_id, 'reason': reason})
+        else:
+            valid.append(user_id)
+    return valid, skipped
+
+
+def _summary(action, requested, applied, skipped, dry_run, started, **extra):
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    logger.info(f"Operación masiva {action}: {requested} pedidos, {applied} aplicados, {len(skipped)} omitidos "
+                f"en {duration_ms} ms{' (dry-run)' if dry_run else ''}")
+    return {
+        'action': action,
+        'dry_run': dry_run,
+        'requested': requested,
+        'applied': applied,
+        'skipped': skipped,
+        'duration_ms': duration_ms,
+        **extra,
+    }
+
+
+def _update_users(user_ids, **values):
+    """UPDATE users SET ... WHERE id IN (...); updated_at lo completa el onupdate del modelo"""
+    if not user_ids:
+        return 0
+    result = db.session.execute(
+        db.update(User).where(User.id.in_(user_ids)).values(**values),
+        execution_options={'synchronize_session': False},
+    )
+    return result.rowcount
+
+
+class UserBulkController:
+    """Operaciones de admin sobre muchos usuarios en una transacción"""
+
+    @staticmethod
+    def reassign(user_ids=None, from_mentor_id=None, mentor_id=None, dry_run=False):
+        """
+        Asigna mentor_id (None = quitar mentor) a los usuarios indicados o, con from_mentor_id, a
+        todos los usuarios de ese mentor. Solo se reasignan usuarios con rol 'user'.
+        """
+        started = time.perf_counter()
+        try:
+            if mentor_id is not None:
+                mentor_role = db.session.query(User.role).filter(User.id == mentor_id).scalar()
+                if mentor_role is None:
+                    return {'error': 'Mentor no encontrado'}, 404
+                if mentor_role != 'mentor':
+                    return {'error': 'El usuario seleccionado no es un mentor'}, 400
+
+            if from_mentor_id is not None:
+                user_ids = [row[0] for row in db.session.query(User.id)
+                            .filter(User.mentor_id == from_mentor_id, User.role == 'user')
+                            .order_by(User.id).all()]
+                roles = {user_id: 'user' for user_id in user_ids}
+            else:
+                roles = _load_roles(user_ids)
+
+            def reject(user_id, role):
+                if role == 'deleted':
+                    return DELETED_REASON
+                if role == 'admin':
+                    return 'No se puede asignar un administrador a un mentor'
+                if role == 'mentor':
+                    return 'No se puede asignar un mentor a otro mentor'
+                return None
+
+            valid, skipped = _split(user_ids, roles, reject)
+            applied = len(valid)
+            if not dry_run and valid:
+                applied = _update_users(valid, mentor_id=mentor_id)
+                db.session.commit()
+            return _summary('reassign', len(user_ids), applied, skipped, dry_run, started,
+                            mentor_id=mentor_id, from_mentor_id=from_mentor_id), 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al reasignar usuarios')
+
+    @staticmethod
+    def change_role(user_ids, role, dry_run=False):
+        """
+        Cambia el rol de los usuarios indicados. Con las reglas de assign_user_to_mentor, admins y
+        mentores no tienen mentor; los mentores que dejan de serlo liberan a sus usuarios asignados.
+        """
+        started = time.perf_counter()
+        if role not in ROLES:
+            return {'error': f"role inválido; opciones: {', '.join(ROLES)}"}, 400
+        try:
+            current_admin = g.current_user['user_id']
+
+            def reject(user_id, current_role):
+                if user_id == current_admin:
+                    return 'No puedes cambiar tu propio rol'
+                if current_role == 'deleted':
+                    return DELETED_REASON
+                if current_role == role:
+                    return f'Ya tiene el rol {role}'
+                return None
+
+            valid, skipped = _split(user_ids, _load_roles(user_ids), reject)
+            applied = len(valid)
+            released = 0
+            if not dry_run and valid:
+                values = {'role': role}
+                if role != 'user':
+                    values['mentor_id'] = None
+                applied = _update_users(valid, **values)
+                if role != 'mentor':
+                    released = db.session.execute(
+                        db.update(User).where(User.mentor_id.in_(valid)).values(mentor_id=None),
+                        execution_options={'synchronize_session': False},
+                    ).rowcount
+                db.session.commit()
+            return _summary('change_role', len(user_ids), applied, skipped, dry_run, started,
+                            role=role, released_users=released), 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al cambiar roles')
+
+    @staticmethod
+    def delete(user_ids, dry_run=False):
+        """
+        Da de baja a los usuarios indicados en una transacción y encola la purga de cada uno
+        (ventas, parámetros, invitaciones, mensajes y sus adjuntos). Los usuarios asignados a un
+        mentor dado de baja quedan sin mentor.
+        """
+        started = time.perf_counter()
+        try:
+            current_admin = g.current_user['user_id']
+
+            def reject(user_id, role):
+                if user_id == current_admin:
+                    return 'No puedes eliminar tu propia cuenta'
+                return DELETED_REASON if role == 'deleted' else None
+
+            valid, skipped = _split(user_ids, _load_roles(user_ids), reject)
+            applied = len(valid)
+            released = 0
+            purge_ids = []
+            if not dry_run and valid:
+                released = db.session.execute(
+                    db.update(User).where(User.mentor_id.in_(valid), User.id.not_in(valid)).values(mentor_id=None),
+                    execution_options={'synchronize_session': False},
+                ).rowcount
+                users = User.query.filter(User.id.in_(valid), User.deleted_at.is_(None)).order_by(User.id).all()
+                purges = [soft_delete_user(user, current_admin) for user in users]
+                db.session.commit()
+                applied = len(purges)
+                purge_ids = [purge.id for purge in purges]
+                for purge_id in purge_ids:
+                    schedule_purge(purge_id)
+            return _summary('delete', len(user_ids), applied, skipped, dry_run, started,
+                            released_users=released, purge_ids=purge_ids), 200
+        except Exception:
+            db.session.rollback()
+            return internal_error(logger, 'Error al eliminar usuarios')
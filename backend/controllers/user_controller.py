@@ -1,18 +1,22 @@
-from models.user import User
+from models.user import User, CONFLICT_ERRORS
 from models.mentor_invitation import MentorInvitation
 from config.database import db
 import re
 from datetime import datetime
+from serializers import MentorInvitationSerializer, UserSerializer
+
+user_serializer = UserSerializer()
+invitation_serializer = MentorInvitationSerializer()
 
 class UserController:
     """Operaciones de usuario (perfil propio)"""
 
     @staticmethod
     def get_profile(user_id: int):
-        user = User.query.get(user_id)
+        user = user_serializer.first(user_serializer.select().where(User.id == user_id))
         if not user:
             return {'error': 'Usuario no encontrado'}, 404
-        return {'user': user.to_dict()}, 200
+        return {'user': user_serializer.dump(user)}, 200
 
     @staticmethod
     def update_profile(user_id: int, username=None, email=None, password=None):
@@ -20,20 +24,27 @@ class UserController:
         if not user:
             return {'error': 'Usuario no encontrado'}, 404
 
+        new_username = username.strip() if username and username.strip() != user.username else None
+        new_email = email.strip().lower() if email and email.strip().lower() != user.email else None
+
         # username
-        if username and username != user.username:
-            if User.query.filter(User.username == username, User.id != user_id).first():
-                return {'error': 'El nombre de usuario ya está en uso'}, 400
-            user.username = username
+        if new_username and '@' in new_username:
+            return {'error': 'El nombre de usuario no puede contener @'}, 400
 
         # email
-        if email and email != user.email:
+        if new_email:
             email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_regex, email):
+            if not re.match(email_regex, new_email):
                 return {'error': 'Email inválido'}, 400
-            if User.query.filter(User.email == email, User.id != user_id).first():
-                return {'error': 'El email ya está registrado'}, 400
-            user.email = email
+
+        # Unicidad de ambos en una sola consulta
+        conflict = User.find_conflict(new_username, new_email, exclude_id=user_id)
+        if conflict:
+            return {'error': CONFLICT_ERRORS[conflict]}, 400
+        if new_username:
+            user.username = new_username
+        if new_email:
+            user.email = new_email
 
         # password
         if password:
@@ -42,7 +53,7 @@ class UserController:
             user.set_password(password)
 
         db.session.commit()
-        return {'message': 'Perfil actualizado', 'user': user.to_dict()}, 200
+        return {'message': 'Perfil actualizado', 'user': user_serializer.dump(user)}, 200
 
     @staticmethod
     def update_business(user_id: int, name=None, category=None, description=None):
@@ -60,7 +71,7 @@ class UserController:
         db.session.commit()
         return {
             'message': 'Emprendimiento actualizado',
-            'user': user.to_dict()
+            'user': user_serializer.dump(user)
         }, 200
 
     @staticmethod
@@ -92,13 +103,17 @@ class UserController:
         )
         db.session.add(invitation)
         db.session.commit()
-        return {'message': 'Invitación enviada', 'invitation': invitation.to_dict()}, 201
+        return {'message': 'Invitación enviada', 'invitation': invitation_serializer.dump(invitation)}, 201
 
     @staticmethod
     def list_my_invitations(user_id: int):
-        invitations = MentorInvitation.query.filter_by(user_id=user_id).order_by(MentorInvitation.created_at.desc()).all()
+        invitations = invitation_serializer.all(
+            invitation_serializer.select()
+            .where(MentorInvitation.user_id == user_id)
+            .order_by(MentorInvitation.created_at.desc())
+        )
         return {
-            'invitations': [inv.to_dict() for inv in invitations],
+            'invitations': invitation_serializer.dump_many(invitations),
             'total': len(invitations)
         }, 200
 
@@ -0,0 +1,269 @@
+"""
+Importación masiva de usuarios (cohortes de emprendedoras) desde CSV o JSON.
+
+Frente a llamar POST /api/admin/users por fila:
+- La unicidad de username/email se verifica con una consulta por lote de 5000 valores
+  (lower(...) IN (...), usa los índices de la migración 0012), no dos SELECT por fila.
+- Las contraseñas se hashean en paralelo en un pool de procesos con BCRYPT_LOG_ROUNDS (o
+  BCRYPT_IMPORT_ROUNDS si se configura un costo menor; el login lo rehace, ver
+  User.password_needs_rehash). En la API el pool tiene HASH_IMPORT_WORKERS procesos y la
+  importación hasta IMPORT_MAX_ROWS filas; `flask users import` usa un proceso por CPU y sin límite.
+- Las filas válidas se insertan con un INSERT multi-fila por lote (executemany con RETURNING)
+  en una sola transacción.
+El resultado incluye el estado de cada fila; las filas con errores no impiden importar el resto.
+"""
+import csv
+import io
+import json
+import re
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from models.user import User
+from config.database import db
+from config.password_hasher import password_hasher
+from config.errors import internal_error
+from config.logging_config import get_logger
+
+logger = get_logger('admin')
+
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+IMPORT_ROLES = ('user', 'mentor')
+LOOKUP_CHUNK = 5000
+FIELDS = ('username', 'email', 'password', 'role', 'mentor', 'business_name', 'business_category',
+          'business_description')
+
+
+def parse_rows(content, fmt):
+    """Convierte el contenido CSV o JSON en una lista de diccionarios con las claves de FIELDS"""
+    if fmt == 'json':
+        data = json.loads(content) if isinstance(content, (str, bytes)) else content
+        if isinstance(data, dict):
+            data = data.get('users')
+        if not isinstance(data, list):
+            raise ValueError("El JSON debe ser una lista de usuarios o {'users': [...]}")
+        rows = data
+    else:
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames:
+            raise ValueError('El CSV no tiene encabezados')
+        rows = list(reader)
+
+    normalized = []
+    for row in rows:
+        if not isinstance(row, dict):
+            normalized.append({})
+            continue
+        clean = {}
+        for key, value in row.items():
+            key = (key or '').strip().lower()
+            if key in FIELDS and value is not None:
+                clean[key] = str(value).strip()
+        normalized.append(clean)
+    return normalized
+
+
+class UserImportController:
+    """Importación masiva de usuarios"""
+
+    @staticmethod
+    def import_users(rows, default_mentor=None, dry_run=False, max_rows=None, workers=None):
+        """
+        Importa las filas válidas. max_rows y workers valen por defecto IMPORT_MAX_ROWS y
+        HASH_IMPORT_WORKERS (los de la API); el comando de CLI pasa los suyos (0 = sin límite).
+        """
+        started = time.perf_counter()
+        if max_rows is None:
+            max_rows = current_app.config['IMPORT_MAX_ROWS']
+        if not rows:
+            return {'error': 'No hay filas para importar'}, 400
+        if max_rows and len(rows) > max_rows:
+            return {'error': f'Máximo {max_rows} filas por importación; usa flask users import'}, 400
+
+        # Reporte por fila (número 1-based, sin contar el encabezado del CSV)
+        report = [{'row': i + 1, 'username': row.get('username'), 'status': 'pending', 'errors': []}
+                  for i, row in enumerate(rows)]
+
+        UserImportController._validate_fields(rows, report)
+        UserImportController._check_duplicates_in_batch(rows, report)
+        UserImportController._check_existing(rows, report)
+        mentor_ids = UserImportController._resolve_mentors(rows, report, default_mentor)
+
+        valid = [i for i, entry in enumerate(report) if not entry['errors']]
+        for entry in report:
+            entry['status'] = 'error' if entry['errors'] else ('valid' if dry_run else 'pending')
+
+        created = 0
+        if valid and not dry_run:
+            try:
+                created = UserImportController._insert(rows, valid, mentor_ids, report, workers)
+            except IntegrityError:
+                db.session.rollback()
+                return {'error': 'Otro proceso creó usuarios con los mismos datos durante la importación. '
+                                 'Vuelve a intentarlo'}, 409
+            except Exception:
+                db.session.rollback()
+                return internal_error(logger, 'Error al importar usuarios')
+
+        for entry in report:
+            if not entry['errors']:
+                del entry['errors']
+
+        failed = sum(1 for entry in report if entry['status'] == 'error')
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(f"Importación de usuarios: {len(rows)} filas, {created} creadas, {failed} con errores "
+                    f"en {duration_ms} ms{' (dry-run)' if dry_run else ''}")
+        return {
+            'dry_run': dry_run,
+            'total': len(rows),
+            'created': created,
+            'valid': len(valid),
+            'failed': failed,
+            'duration_ms': duration_ms,
+            'rows': report,
+        }, (200 if dry_run else 201)
+
+    @staticmethod
+    def _validate_fields(rows, report):
+        for row, entry in zip(rows, report):
+            username = row.get('username')
+            email = row.get('email')
+            password = row.get('password')
+            if not username or not email or not password:
+                entry['errors'].append('username, email y password son obligatorios')
+                continue
+            if '@' in username:
+                entry['errors'].append('El nombre de usuario no puede contener @')
+            if not EMAIL_REGEX.match(email):
+                entry['errors'].append('Email inválido')
+            if len(password) < 6:
+                entry['errors'].append('La contraseña debe tener al menos 6 caracteres')
+            role = (row.get('role') or 'user').lower()
+            if role not in IMPORT_ROLES:
+                entry['errors'].append("Rol inválido: solo 'user' o 'mentor'")
+            row['role'] = role
+            row['email'] = email.lower()
+
+    @staticmethod
+    def _check_duplicates_in_batch(rows, report):
+        """La primera aparición de un username/email gana; las siguientes se marcan como error"""
+        seen = {'username': {}, 'email': {}}
+        for row, entry in zip(rows, report):
+            if entry['errors']:
+                continue
+            for field in ('username', 'email'):
+                key = row[field].lower()
+                first = seen[field].get(key)
+                if first is not None:
+                    entry['errors'].append(f'{field} repetido en la fila {first}')
+                else:
+                    seen[field][key] = entry['row']
+
+    @staticmethod
+    def _check_existing(rows, report):
+        """Una consulta por lote para todos los usernames y emails ya registrados"""
+        pending = [(row, entry) for row, entry in zip(rows, report) if not entry['errors']]
+        usernames = [row['username'].lower() for row, _ in pending]
+        emails = [row['email'] for row, _ in pending]
+        taken_usernames, taken_emails = set(), set()
+        for start in range(0, max(len(usernames), 1), LOOKUP_CHUNK):
+            chunk_usernames = usernames[start:start + LOOKUP_CHUNK]
+            chunk_emails = emails[start:start + LOOKUP_CHUNK]
+            if not chunk_usernames:
+                break
+            existing = db.session.query(db.func.lower(User.username), db.func.lower(User.email)).filter(
+                db.or_(db.func.lower(User.username).in_(chunk_usernames),
+                       db.func.lower(User.email).in_(chunk_emails))
+            ).all()
+            for username, email in existing:
+                taken_usernames.add(username)
+                taken_emails.add(email)
+
+        for row, entry in pending:
+            if row['username'].lower() in taken_usernames:
+                entry['errors'].append('El nombre de usuario ya está en uso')
+            if row['email'] in taken_emails:
+                entry['errors'].append('El email ya está registrado')
+
+    @staticmethod
+    def _resolve_mentors(rows, report, default_mentor):
+        """
+        La columna mentor (o el mentor por defecto) acepta id, username o email de un mentor.
+        Se resuelven todos con una consulta. Devuelve {índice de fila: mentor_id}.
+        """
+        references = {}
+        for i, (row, entry) in enumerate(zip(rows, report)):
+            if entry['errors'] or row['role'] != 'user':
+                continue
+            reference = row.get('mentor') or (str(default_mentor) if default_mentor else None)
+            if reference:
+                references[i] = reference.strip().lower()
+        if not references:
+            return {}
+
+        ids = {int(ref) for ref in references.values() if ref.isdigit()}
+        names = {ref for ref in references.values() if not ref.isdigit()}
+        conditions = []
+        if ids:
+            conditions.append(User.id.in_(ids))
+        if names:
+            conditions.append(db.func.lower(User.username).in_(names))
+            conditions.append(db.func.lower(User.email).in_(names))
+        mentors = db.session.query(User.id, User.username, User.email).filter(
+            User.role == 'mentor', db.or_(*conditions)
+        ).all()
+        lookup = {}
+        for mentor_id, username, email in mentors:
+            lookup[str(mentor_id)] = mentor_id
+            lookup[username.lower()] = mentor_id
+            lookup[email.lower()] = mentor_id
+
+        resolved = {}
+        for i, reference in references.items():
+            mentor_id = lookup.get(reference)
+            if mentor_id is None:
+                report[i]['errors'].append(f'Mentor no encontrado: {reference}')
+            else:
+                resolved[i] = mentor_id
+        return resolved
+
+    @staticmethod
+    def _insert(rows, valid, mentor_ids, report, workers=None):
+        valid = [i for i in valid if not report[i]['errors']]
+        if not valid:
+            return 0
+        config = current_app.config
+        hashes = password_hasher.hash_many(
+            [rows[i]['password'] for i in valid],
+            rounds=config['BCRYPT_IMPORT_ROUNDS'] or config['BCRYPT_LOG_ROUNDS'],
+            workers=workers if workers is not None else config['HASH_IMPORT_WORKERS'],
+        )
+        now = datetime.utcnow()
+        values = [{
+            'username': rows[i]['username'],
+            'email': rows[i]['email'],
+            'password_hash': password_hash,
+            'role': rows[i]['role'],
+            'mentor_id': mentor_ids.get(i),
+            'business_name': rows[i].get('business_name') or None,
+            'business_category': rows[i].get('business_category') or None,
+            'business_description': rows[i].get('business_description') or None,
+            'created_at': now,
+        } for i, password_hash in zip(valid, hashes)]
+
+        # executemany con RETURNING: SQLAlchemy lo agrupa en INSERT ... VALUES (...), (...) por lotes.
+        # El orden de RETURNING no está garantizado; se emparejan por username (único en el lote)
+        table = User.__table__
+        result = db.session.execute(insert(table).returning(table.c.id, table.c.username), values)
+        ids = {username: user_id for user_id, username in result.all()}
+        for i in valid:
+            report[i]['id'] = ids[rows[i]['username']]
+            report[i]['status'] = 'created'
+            if mentor_ids.get(i):
+                report[i]['mentor_id'] = mentor_ids[i]
+        db.session.commit()
+        return len(values)
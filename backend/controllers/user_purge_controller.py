@@ -0,0 +1,263 @@
+"""
+Baja de usuarios con purga diferida.
+
+DELETE /api/admin/users/<id> ya no borra en la petición: soft_delete_user() marca la baja en
+una transacción corta (rol 'deleted', username/email liberados, usuarios asignados sin mentor) y
+crea una fila en user_purges. Después run_purge() borra las filas dependientes (ventas,
+parámetros, mensajes y sus adjuntos, conversaciones, invitaciones) de a PURGE_CHUNK_SIZE filas,
+con un commit por bloque: ningún lock dura más que un bloque y el progreso queda en user_purges.
+Al final, con la fila del usuario bloqueada, borra lo que se haya escrito mientras tanto y el
+usuario. token_required ya rechaza las escrituras de un usuario dado de baja.
+
+La purga corre en un hilo del worker (PURGE_WORKERS; 0 = en la petición). Si el proceso se
+reinicia a mitad, `flask users purge` retoma las purgas pendientes, fallidas o interrumpidas:
+cada bloque es idempotente.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from flask import current_app
+from models.user import User
+from models.user_purge import UserPurge
+from models.daily_sale import DailySale, MonthlyParameters
+from models.mentor_invitation import MentorInvitation
+from models.mentor_message import MentorMessage
+from models.mentor_conversation import MentorConversation
+from models.bi_rollup import remove_users
+from config.database import db
+from config.errors import internal_error
+from config.pagination import parse_limit
+from config.logging_config import get_logger
+from serializers import UserPurgeSerializer
+
+logger = get_logger('admin')
+purge_serializer = UserPurgeSerializer()
+
+PURGE_STATUSES = ('pending', 'running', 'done', 'failed')
+# Contraseña que ningún hash bcrypt acepta (config/password_hasher.py devuelve False)
+DISABLED_PASSWORD = '!'
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _dependents(user_id):
+    """(modelo, condición) de las filas que referencian al usuario, en orden de borrado"""
+    return (
+        (DailySale, DailySale.user_id == user_id),
+        (MonthlyParameters, MonthlyParameters.user_id == user_id),
+        (MentorMessage, db.or_(MentorMessage.user_id == user_id, MentorMessage.mentor_id == user_id)),
+        (MentorConversation, db.or_(MentorConversation.user_id == user_id, MentorConversation.mentor_id == user_id)),
+        (MentorInvitation, db.or_(MentorInvitation.user_id == user_id, MentorInvitation.mentor_id == user_id)),
+    )
+
+
+def _attachment_path(file_path):
+    """Ruta en disco de un adjunto, resuelta como en la descarga (routes/user_routes.py)"""
+    if file_path.startswith('uploads/'):
+        return Path(current_app.root_path).parent / file_path
+    return Path(current_app.config['UPLOAD_FOLDER']) / file_path.split('/')[-1].split('\\')[-1]
+
+
+def _remove_files(file_paths):
+    removed = 0
+    for file_path in file_paths:
+        try:
+            os.remove(_attachment_path(file_path))
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning(f"No se pudo borrar el adjunto {file_path}", exc_info=True)
+    return removed
+
+
+def _record_progress(purge_id, rows=0, files=0):
+    """Suma al progreso de la purga (en la transacción del bloque)"""
+    db.session.execute(
+        db.update(UserPurge).where(UserPurge.id == purge_id)
+        .values(deleted_rows=UserPurge.deleted_rows + rows, deleted_files=UserPurge.deleted_files + files),
+        execution_options={'synchronize_session': False},
+    )
+
+
+def _delete_in_chunks(purge_id, model, condition, chunk_size):
+    """Borra las filas de model que cumplen condition, de a chunk_size con un commit por bloque"""
+    options = {'synchronize_session': False}
+    if model is MentorConversation:
+        # Una fila por contraparte y sin id propio: un solo DELETE
+        deleted = db.session.execute(db.delete(model).where(condition), execution_options=options).rowcount
+        _record_progress(purge_id, rows=deleted)
+        db.session.commit()
+        return
+
+    with_files = model is MentorMessage
+    while True:
+        columns = (model.id, model.file_path) if with_files else (model.id,)
+        rows = db.session.execute(db.select(*columns).where(condition).order_by(model.id).limit(chunk_size)).all()
+        if not rows:
+            return
+        ids = [row[0] for row in rows]
+        deleted = db.session.execute(db.delete(model).where(model.id.in_(ids)), execution_options=options).rowcount
+        _record_progress(purge_id, rows=deleted)
+        db.session.commit()
+        if with_files:
+            # Después del commit: si el borrado de filas falla, los adjuntos siguen ahí
+            removed = _remove_files([row[1] for row in rows if row[1]])
+            if removed:
+                _record_progress(purge_id, files=removed)
+                db.session.commit()
+
+
+def _claim(purge_id, include_running=False):
+    """Pasa la purga a 'running'; False si otra ejecución la tiene o ya terminó"""
+    statuses = ('pending', 'failed', 'running') if include_running else ('pending', 'failed')
+    claimed = db.session.execute(
+        db.update(UserPurge).where(UserPurge.id == purge_id, UserPurge.status.in_(statuses))
+        .values(status='running', started_at=datetime.utcnow(), error=None),
+        execution_options={'synchronize_session': False},
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def run_purge(purge_id, include_running=False):
+    """
+    Borra los datos del usuario de la purga y después el usuario. Devuelve True si la completó.
+    include_running retoma también purgas que quedaron en 'running' (proceso reiniciado).
+    """
+    if not _claim(purge_id, include_running):
+        return False
+    purge = db.session.get(UserPurge, purge_id)
+    user_id = purge.user_id
+    chunk_size = current_app.config['PURGE_CHUNK_SIZE']
+    try:
+        dependents = _dependents(user_id)
+        total = sum(db.session.query(db.func.count()).select_from(model).filter(condition).scalar()
+                    for model, condition in dependents)
+        purge.total_rows = purge.deleted_rows + total
+        db.session.commit()
+
+        for model, condition in dependents:
+            _delete_in_chunks(purge_id, model, condition, chunk_size)
+
+        # Última transacción: la fila del usuario bloqueada impide nuevas filas que la referencien
+        # (un token todavía válido pudo escribir durante los bloques); se borran las que quedaron,
+        # los usuarios asignados después de la baja quedan sin mentor y se borra el usuario
+        options = {'synchronize_session': False}
+        db.session.execute(db.select(User.id).where(User.id == user_id).with_for_update())
+        late_files = db.session.execute(
+            db.select(MentorMessage.file_path).where(dict(dependents)[MentorMessage],
+                                                     MentorMessage.file_path.isnot(None))).scalars().all()
+        late_rows = sum(db.session.execute(db.delete(model).where(condition), execution_options=options).rowcount
+                        for model, condition in dependents)
+        if late_rows:
+            logger.warning(f"Purga {purge_id}: {late_rows} filas escritas durante la purga")
+            _record_progress(purge_id, rows=late_rows)
+        db.session.execute(db.update(User).where(User.mentor_id == user_id).values(mentor_id=None),
+                           execution_options=options)
+        remove_users([user_id])
+        db.session.execute(db.delete(User).where(User.id == user_id, User.deleted_at.isnot(None)),
+                           execution_options=options)
+        db.session.execute(db.update(UserPurge).where(UserPurge.id == purge_id)
+                           .values(status='done', finished_at=datetime.utcnow()),
+                           execution_options=options)
+        db.session.commit()
+        if late_files:
+            removed = _remove_files(late_files)
+            if removed:
+                _record_progress(purge_id, files=removed)
+                db.session.commit()
+        logger.info(f"Purga {purge_id} del usuario {user_id} terminada")
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Error en la purga {purge_id} del usuario {user_id}")
+        db.session.execute(db.update(UserPurge).where(UserPurge.id == purge_id)
+                           .values(status='failed', error=str(e)[:500], finished_at=datetime.utcnow()),
+                           execution_options={'synchronize_session': False})
+        db.session.commit()
+        return False
+
+
+def _run_in_app(app, purge_id):
+    with app.app_context():
+        try:
+            run_purge(purge_id)
+        except Exception:
+            logger.exception(f"No se pudo ejecutar la purga {purge_id}")
+
+
+def _get_executor(workers):
+    """Pool de hilos del proceso actual (se recrea después de un fork, como en password_hasher)"""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='user-purge')
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def schedule_purge(purge_id):
+    """Encola la purga en el pool del worker, o la ejecuta ya si PURGE_WORKERS es 0"""
+    workers = current_app.config['PURGE_WORKERS']
+    if workers <= 0:
+        run_purge(purge_id)
+        return
+    _get_executor(workers).submit(_run_in_app, current_app._get_current_object(), purge_id)
+
+
+def soft_delete_user(user, requested_by=None):
+    """
+    Da de baja al usuario y crea su purga (sin commit). El username y el email quedan libres para
+    una cuenta nueva; el login y la renovación del token dejan de funcionar.
+    """
+    now = datetime.utcnow()
+    purge = UserPurge(user_id=user.id, username=user.username, email=user.email, role=user.role,
+                      requested_by=requested_by, status='pending')
+    db.session.add(purge)
+    user.username = f'deleted-{user.id}'
+    user.email = f'deleted-{user.id}@deleted.invalid'
+    user.password_hash = DISABLED_PASSWORD
+    user.role = 'deleted'
+    user.mentor_id = None
+    user.deleted_at = now
+    # Sus usuarios asignados quedan sin mentor ya (un UPDATE por el índice de mentor_id)
+    db.session.execute(db.update(User).where(User.mentor_id == user.id).values(mentor_id=None),
+                       execution_options={'synchronize_session': False})
+    return purge
+
+
+class UserPurgeController:
+    """Estado de las purgas de usuarios dados de baja"""
+
+    @staticmethod
+    def list_purges(status=None, limit=None):
+        """Purgas más recientes primero; status filtra por estado"""
+        try:
+            if status and status not in PURGE_STATUSES:
+                return {'error': f"status inválido; opciones: {', '.join(PURGE_STATUSES)}"}, 400
+            limit = parse_limit(limit)
+            query = purge_serializer.select().order_by(UserPurge.id.desc()).limit(limit)
+            if status:
+                query = query.where(UserPurge.status == status)
+            purges = purge_serializer.all(query)
+            return {'purges': purge_serializer.dump_many(purges), 'count': len(purges)}, 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception:
+            return internal_error(logger, 'Error al obtener las purgas')
+
+    @staticmethod
+    def get_purge(purge_id):
+        try:
+            purge = purge_serializer.first(purge_serializer.select().where(UserPurge.id == purge_id))
+            if not purge:
+                return {'error': 'Purga no encontrada'}, 404
+            return {'purge': purge_serializer.dump(purge)}, 200
+        except Exception:
+            return internal_error(logger, 'Error al obtener la purga')
@@ -0,0 +1,65 @@
+"""
+Configuración de gunicorn leída desde variables de entorno.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+GUNICORN_WORKER_CLASS:
+    gthread (por defecto)  procesos con hilos; buen equilibrio para CRUD contra PostgreSQL
+    sync                   un request por proceso; el más simple y predecible en CPU
+    gevent                 corrutinas; para rutas de IA y archivos dominadas por espera de I/O.
+                           Requiere requirements-gevent.txt (gevent + psycogreen) y HASH_POOL_WORKERS=0
+                           (el pool de procesos de bcrypt no es cooperativo con gevent)
+
+Cada worker tiene su propio pool de SQLAlchemy: conexiones máximas = workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _env_int('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1)
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 200)  # solo gevent
+
+# preload_app comparte el código importado entre workers (copy-on-write). Con gevent se desactiva
+# por defecto porque el monkey patching debe ocurrir antes de importar la aplicación.
+preload_app = _env_bool('GUNICORN_PRELOAD', worker_class != 'gevent')
+
+# Reciclar workers periódicamente acota fugas de memoria; el jitter evita reinicios simultáneos
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 200)
+
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 60)  # las llamadas a la IA pueden tardar varios segundos
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # psycopg2 bloquea el hilo; psycogreen lo hace cooperativo con gevent
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    if preload_app:
+        # No compartir conexiones abiertas en el proceso maestro con los workers
+        from wsgi import app
+        from config.database import db
+        with app.app_context():
+            db.engine.dispose(close=False)
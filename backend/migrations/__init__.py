@@ -0,0 +1 @@
+# Paquete de migraciones versionadas (ver migrations/runner.py)
@@ -0,0 +1,277 @@
+"""
+Ejecutor de migraciones versionadas.
+
+Cada revisión es un módulo en migrations/versions/ con nombre NNNN_descripcion.py que define:
+    revision = '0001'
+    description = 'Texto corto'
+    transactional = True        # False para CREATE INDEX CONCURRENTLY o backfills por lotes
+    def upgrade(op): ...
+
+Las revisiones transaccionales se aplican en una sola transacción junto con su registro en
+schema_migrations: o se aplica todo o nada. Las no transaccionales se ejecutan en modo
+AUTOCOMMIT (cada sentencia confirma por separado), por lo que deben ser idempotentes.
+"""
+import importlib
+import logging
+import pkgutil
+import time
+from datetime import datetime
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Clave arbitraria para pg_advisory_lock: evita dos ejecutores en paralelo
+MIGRATIONS_LOCK_KEY = 815_224_001
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(32) PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        duration_ms INTEGER NOT NULL
+    )
+"""
+
+
+class Operations:
+    """Operaciones disponibles para las revisiones (con soporte de dry-run y tiempos por paso)"""
+
+    def __init__(self, connection, dry_run=False, transactional=True):
+        self.connection = connection
+        self.dry_run = dry_run
+        self.transactional = transactional
+        self.steps = []
+
+    # Consultas de solo lectura (se ejecutan también en dry-run)
+
+    def table_exists(self, table):
+        row = self.connection.execute(text("SELECT to_regclass(:t)"), {"t": table}).fetchone()
+        return bool(row and row[0] is not None)
+
+    def column_exists(self, table, column):
+        row = self.connection.execute(
+            text("SELECT 1 FROM information_schema.columns WHERE table_name=:t AND column_name=:c"),
+            {"t": table, "c": column}
+        ).fetchone()
+        return row is not None
+
+    def get_columns(self, table):
+        res = self.connection.execute(
+            text("SELECT column_name FROM information_schema.columns WHERE table_name=:t ORDER BY ordinal_position"),
+            {"t": table}
+        )
+        return [row[0] for row in res.fetchall()]
+
+    def is_nullable(self, table, column):
+        row = self.connection.execute(
+            text("SELECT is_nullable FROM information_schema.columns WHERE table_name=:t AND column_name=:c"),
+            {"t": table, "c": column}
+        ).fetchone()
+        return bool(row and row[0] == 'YES')
+
+    def fetch_all(self, sql, params=None):
+        """
+        Consulta de solo lectura para validaciones previas de una revisión. En dry-run devuelve []
+        sin consultar: las tablas que crean las revisiones anteriores pueden no existir todavía.
+        """
+        if self.dry_run:
+            logger.info(f"-- (dry-run, sin ejecutar) {' '.join(sql.split())};")
+            return []
+        return self.connection.execute(text(sql), params or {}).fetchall()
+
+    def _index_is_invalid(self, name):
+        row = self.connection.execute(
+            text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :n AND NOT i.indisvalid"
+            ),
+            {"n": name}
+        ).fetchone()
+        return row is not None
+
+    # Operaciones de escritura
+
+    def execute(self, sql, params=None, label=None):
+        """Ejecuta una sentencia (o la muestra si es dry-run) y registra su duración"""
+        sql = ' '.join(sql.split())
+        label = label or sql
+        if self.dry_run:
+            logger.info(f"-- {sql};")
+            self.steps.append((label, 0.0))
+            return None
+        start = time.perf_counter()
+        result = self.connection.execute(text(sql), params or {})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.steps.append((label, elapsed_ms))
+        logger.info(f"{label} ({elapsed_ms:.1f} ms)")
+        return result
+
+    def add_column(self, table, column, ddl):
+        """ALTER TABLE ... ADD COLUMN si la columna no existe"""
+        if self.column_exists(table, column):
+            logger.info(f"La columna {table}.{column} ya existe")
+            return
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+    def drop_column(self, table, column):
+        self.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS "{column}"')
+
+    def create_index(self, name, table, columns, unique=False, concurrently=False, using=None):
+        """
+        Crea un índice si no existe.
+        concurrently=True no bloquea escrituras, pero exige una revisión con transactional = False.
+        using: método del índice (p. ej. 'gin'); columns puede llevar expresiones y operator classes.
+        """
+        if concurrently and self.transactional:
+            raise RuntimeError(
+                f"CREATE INDEX CONCURRENTLY ({name}) requiere transactional = False en la revisión"
+            )
+        if concurrently and self._index_is_invalid(name):
+            # Un CREATE INDEX CONCURRENTLY interrumpido deja un índice inválido que IF NOT EXISTS no repara
+            self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        self.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {'CONCURRENTLY ' if concurrently else ''}"
+            f"IF NOT EXISTS {name} ON {table} {f'USING {using} ' if using else ''}({', '.join(columns)})"
+        )
+
+    def backfill(self, table, set_sql, where_sql, batch_size=5000, key='id'):
+        """
+        Actualiza las filas que cumplen where_sql recorriendo la clave primaria por rangos
+        ({key} > a AND {key} <= a + batch_size) desde MIN hasta MAX: cada lote lee su rango por el
+        índice de la clave, la tabla se recorre una sola vez aunque where_sql no tenga índice y
+        termina aunque set_sql deje filas que siguen cumpliendo where_sql. Las filas insertadas
+        después de leer MAX las escribe ya la aplicación.
+        En revisiones no transaccionales cada lote confirma por separado, así los bloqueos
+        duran solo lo que tarda un lote y no toda la tabla.
+        """
+        batch_size = int(batch_size)
+        sql = f"UPDATE {table} SET {set_sql} WHERE {key} > :low AND {key} <= :high AND ({where_sql})"
+        if self.dry_run:
+            logger.info(f"-- (por rangos de {batch_size} valores de {key}, de MIN a MAX) {sql};")
+            self.steps.append((f"backfill {table}", 0.0))
+            return 0
+
+        total = 0
+        batches = 0
+        start = time.perf_counter()
+        first, last = self.connection.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {table}")).one()
+        if first is not None:
+            low = first - 1
+            while low < last:
+                total += self.connection.execute(text(sql), {"low": low, "high": low + batch_size}).rowcount
+                batches += 1
+                low += batch_size
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        label = f"backfill {table} ({total} filas en {batches} lotes)"
+        self.steps.append((label, elapsed_ms))
+        logger.info(f"{label} ({elapsed_ms:.1f} ms)")
+        return total
+
+
+def load_revisions():
+    """Devuelve las revisiones ordenadas por número de versión"""
+    from migrations import versions
+
+    revisions = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name[:1].isdigit():
+            continue
+        module = importlib.import_module(f"migrations.versions.{module_info.name}")
+        revisions.append(module)
+
+    revisions.sort(key=lambda m: m.revision)
+    seen = set()
+    for module in revisions:
+        if module.revision in seen:
+            raise RuntimeError(f"Revisión duplicada: {module.revision}")
+        seen.add(module.revision)
+    return revisions
+
+
+class MigrationRunner:
+    """Aplica las revisiones pendientes y las registra en schema_migrations"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def ensure_table(self):
+        with self.engine.begin() as conn:
+            conn.execute(text(SCHEMA_MIGRATIONS_DDL))
+
+    def applied_versions(self):
+        with self.engine.connect() as conn:
+            exists = conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar()
+            if not exists:
+                return {}
+            rows = conn.execute(text("SELECT version, applied_at, duration_ms FROM schema_migrations")).fetchall()
+        return {row[0]: row for row in rows}
+
+    def status(self):
+        """Lista (revisión, registro aplicado o None) en orden"""
+        applied = self.applied_versions()
+        return [(module, applied.get(module.revision)) for module in load_revisions()]
+
+    def pending(self, target=None):
+        applied = self.applied_versions()
+        return [
+            module for module in load_revisions()
+            if module.revision not in applied and (target is None or module.revision <= target)
+        ]
+
+    def upgrade(self, target=None, dry_run=False):
+        """Aplica las revisiones pendientes hasta target (incluida). Devuelve las aplicadas"""
+        if not dry_run:
+            self.ensure_table()
+
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": MIGRATIONS_LOCK_KEY})
+            try:
+                pending = self.pending(target)
+                if not pending:
+                    logger.info("No hay migraciones pendientes")
+                    return []
+                for module in pending:
+                    self._apply(module, dry_run)
+                return pending
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": MIGRATIONS_LOCK_KEY})
+
+    def _apply(self, module, dry_run):
+        transactional = getattr(module, 'transactional', True)
+        mode = 'transaccional' if transactional else 'sin transacción'
+        logger.info(f"{'(dry-run) ' if dry_run else ''}{module.revision} {module.description} [{mode}]")
+
+        start = time.perf_counter()
+        if transactional:
+            with self.engine.connect() as conn:
+                trans = conn.begin()
+                try:
+                    module.upgrade(Operations(conn, dry_run, transactional=True))
+                    duration_ms = int((time.perf_counter() - start) * 1000)
+                    if dry_run:
+                        trans.rollback()
+                    else:
+                        self._record(conn, module, duration_ms)
+                        trans.commit()
+                except Exception:
+                    trans.rollback()
+                    raise
+        else:
+            with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                module.upgrade(Operations(conn, dry_run, transactional=False))
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                if not dry_run:
+                    self._record(conn, module, duration_ms)
+
+        if not dry_run:
+            logger.info(f"{module.revision} aplicada en {duration_ms} ms")
+
+    @staticmethod
+    def _record(conn, module, duration_ms):
+        conn.execute(
+            text(
+                "INSERT INTO schema_migrations (version, description, applied_at, duration_ms) "
+                "VALUES (:v, :d, :a, :ms)"
+            ),
+            {"v": module.revision, "d": module.description, "a": datetime.utcnow(), "ms": duration_ms}
+        )
@@ -0,0 +1,17 @@
+"""Tabla base de usuarios (estado inicial del proyecto)"""
+
+revision = '0001'
+description = 'Crear tabla users'
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            username VARCHAR(80) NOT NULL UNIQUE,
+            email VARCHAR(120) NOT NULL UNIQUE,
+            password_hash VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
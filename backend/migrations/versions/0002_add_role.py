@@ -0,0 +1,11 @@
+"""Antes scripts/migrate_add_role.py"""
+
+revision = '0002'
+description = "Agregar columna users.role"
+transactional = True
+
+
+def upgrade(op):
+    op.add_column('users', 'role', "VARCHAR(20) DEFAULT 'user' NOT NULL")
+    # Usuarios existentes sin rol (bases creadas antes de la restricción NOT NULL)
+    op.backfill('users', "role = 'user'", "role IS NULL")
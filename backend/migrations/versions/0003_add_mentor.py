@@ -0,0 +1,9 @@
+"""Antes scripts/migrate_add_mentor.py"""
+
+revision = '0003'
+description = "Agregar columna users.mentor_id"
+transactional = True
+
+
+def upgrade(op):
+    op.add_column('users', 'mentor_id', "INTEGER REFERENCES users(id)")
@@ -0,0 +1,11 @@
+"""Antes scripts/migrate_add_business.py"""
+
+revision = '0004'
+description = "Agregar campos de emprendimiento a users"
+transactional = True
+
+
+def upgrade(op):
+    op.add_column('users', 'business_name', "VARCHAR(150)")
+    op.add_column('users', 'business_category', "VARCHAR(80)")
+    op.add_column('users', 'business_description', "TEXT")
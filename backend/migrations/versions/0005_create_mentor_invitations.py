@@ -0,0 +1,19 @@
+"""Antes scripts/migrate_add_mentor_invitations.py"""
+
+revision = '0005'
+description = "Crear tabla mentor_invitations"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS mentor_invitations (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            mentor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            message VARCHAR(255),
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+            responded_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
@@ -0,0 +1,18 @@
+"""Antes scripts/migrate_create_mentor_messages.py"""
+
+revision = '0006'
+description = "Crear tabla mentor_messages"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS mentor_messages (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            mentor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            sender_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+        )
+    """)
@@ -0,0 +1,16 @@
+"""Antes scripts/migrate_add_file_fields_to_messages.py"""
+
+revision = '0007'
+description = "Agregar adjuntos a mentor_messages"
+transactional = True
+
+
+def upgrade(op):
+    op.add_column('mentor_messages', 'file_name', "VARCHAR(255)")
+    op.add_column('mentor_messages', 'file_path', "VARCHAR(500)")
+    op.add_column('mentor_messages', 'file_type', "VARCHAR(50)")
+    op.add_column('mentor_messages', 'file_size', "INTEGER")
+
+    # content puede ser NULL cuando el mensaje solo trae archivo
+    if not op.is_nullable('mentor_messages', 'content'):
+        op.execute("ALTER TABLE mentor_messages ALTER COLUMN content DROP NOT NULL")
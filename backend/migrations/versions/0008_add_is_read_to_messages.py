@@ -0,0 +1,10 @@
+"""Antes scripts/migrate_add_is_read_to_messages.py"""
+
+revision = '0008'
+description = "Agregar mentor_messages.is_read"
+transactional = True
+
+
+def upgrade(op):
+    # En PostgreSQL 11+ un DEFAULT constante no reescribe la tabla
+    op.add_column('mentor_messages', 'is_read', "BOOLEAN DEFAULT FALSE NOT NULL")
@@ -0,0 +1,38 @@
+"""Antes scripts/migrate_create_daily_sales.py (db.create_all)"""
+
+revision = '0009'
+description = "Crear tablas daily_sales y monthly_parameters"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS daily_sales (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            sale_date DATE NOT NULL,
+            product_name VARCHAR(150),
+            units_sold INTEGER NOT NULL DEFAULT 0,
+            price_per_unit NUMERIC(10, 2) NOT NULL,
+            variable_cost_per_unit NUMERIC(10, 2) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.create_index('idx_user_date', 'daily_sales', ['user_id', 'sale_date'])
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS monthly_parameters (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL UNIQUE REFERENCES users(id),
+            target_monthly_sales INTEGER NOT NULL DEFAULT 0,
+            fixed_costs_monthly NUMERIC(10, 2) NOT NULL DEFAULT 0,
+            loan_monthly_payment NUMERIC(10, 2) DEFAULT 0,
+            working_days_per_month INTEGER NOT NULL DEFAULT 30,
+            default_price_per_unit NUMERIC(10, 2),
+            default_variable_cost_per_unit NUMERIC(10, 2),
+            month_year VARCHAR(7) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
@@ -0,0 +1,17 @@
+"""Antes scripts/migrate_fix_daily_sales_columns.py y migrate_fix_daily_sales_all_columns.py"""
+
+revision = '0010'
+description = "Eliminar columnas calculadas sobrantes de daily_sales"
+transactional = True
+
+# Columnas que DEBEN estar según el modelo DailySale
+REQUIRED_COLUMNS = {
+    'id', 'user_id', 'sale_date', 'product_name', 'units_sold',
+    'price_per_unit', 'variable_cost_per_unit', 'created_at', 'updated_at'
+}
+
+
+def upgrade(op):
+    for column_name in op.get_columns('daily_sales'):
+        if column_name not in REQUIRED_COLUMNS:
+            op.drop_column('daily_sales', column_name)
@@ -0,0 +1,23 @@
+"""
+Índices para las consultas de conversaciones e invitaciones.
+Se crean con CONCURRENTLY para no bloquear escrituras en tablas grandes.
+"""
+
+revision = '0011'
+description = "Índices concurrentes para mentor_messages y mentor_invitations"
+transactional = False
+
+
+def upgrade(op):
+    op.create_index(
+        'idx_mentor_messages_conversation', 'mentor_messages',
+        ['user_id', 'mentor_id', 'created_at'], concurrently=True
+    )
+    op.create_index(
+        'idx_mentor_invitations_mentor_status', 'mentor_invitations',
+        ['mentor_id', 'status'], concurrently=True
+    )
+    op.create_index(
+        'idx_mentor_invitations_user', 'mentor_invitations',
+        ['user_id'], concurrently=True
+    )
@@ -0,0 +1,28 @@
+"""
+Índices únicos sobre lower(username) y lower(email).
+
+El login y las verificaciones de unicidad comparan sin distinguir mayúsculas usando estas
+expresiones, así cada búsqueda es un index scan sin importar el tamaño de la tabla.
+Falla antes de crear nada si ya existen cuentas que solo difieren en mayúsculas.
+"""
+
+revision = '0012'
+description = "Índices únicos lower(username) y lower(email) en users"
+transactional = False
+
+
+def upgrade(op):
+    for column in ('username', 'email'):
+        duplicates = op.fetch_all(
+            f"SELECT lower({column}), array_agg(id ORDER BY id) FROM users "
+            f"GROUP BY lower({column}) HAVING COUNT(*) > 1 LIMIT 20"
+        )
+        if duplicates:
+            detail = ', '.join(f"{value} (ids {ids})" for value, ids in duplicates)
+            raise RuntimeError(
+                f"Hay valores de users.{column} que solo difieren en mayúsculas: {detail}. "
+                f"Unificarlos antes de aplicar la migración {revision}"
+            )
+
+    op.create_index('uq_users_username_lower', 'users', ['lower(username)'], unique=True, concurrently=True)
+    op.create_index('uq_users_email_lower', 'users', ['lower(email)'], unique=True, concurrently=True)
@@ -0,0 +1,19 @@
+"""
+Índices para el listado paginado de usuarios (GET /api/admin/users).
+
+El cursor continúa desde (created_at, id) de la última fila; con estos índices cada página es
+un index scan acotado, también al filtrar por rol o por mentor. El índice por mentor_id además
+sirve al conteo de usuarios asignados de cada mentor.
+Las filas antiguas sin created_at se completan antes, para que el orden por fecha sea total.
+"""
+
+revision = '0013'
+description = "Índices (created_at, id) por rol y mentor en users para paginación por cursor"
+transactional = False
+
+
+def upgrade(op):
+    op.backfill('users', 'created_at = now()', 'created_at IS NULL')
+    op.create_index('idx_users_created_at_id', 'users', ['created_at', 'id'], concurrently=True)
+    op.create_index('idx_users_role_created_at_id', 'users', ['role', 'created_at', 'id'], concurrently=True)
+    op.create_index('idx_users_mentor_created_at_id', 'users', ['mentor_id', 'created_at', 'id'], concurrently=True)
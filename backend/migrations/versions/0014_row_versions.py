@@ -0,0 +1,41 @@
+"""
+Versiones de fila para ETag y GET condicionales.
+
+- users.updated_at y mentor_invitations.updated_at: cambian con cada edición (onupdate en el
+  modelo); las filas existentes toman la última fecha conocida.
+- mentor_conversations: una fila por conversación usuario-mentora con un contador que se
+  incrementa al enviar mensajes o marcarlos como leídos. Se siembra con la cantidad de
+  mensajes de cada conversación existente.
+"""
+
+revision = '0014'
+description = "updated_at en users y mentor_invitations, tabla mentor_conversations"
+transactional = False
+
+
+def upgrade(op):
+    op.add_column('users', 'updated_at', "TIMESTAMP WITHOUT TIME ZONE")
+    op.backfill('users', 'updated_at = created_at', 'updated_at IS NULL')
+
+    op.add_column('mentor_invitations', 'updated_at', "TIMESTAMP WITHOUT TIME ZONE")
+    op.backfill('mentor_invitations', 'updated_at = COALESCE(responded_at, created_at)', 'updated_at IS NULL')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS mentor_conversations (
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            mentor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            version INTEGER NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (user_id, mentor_id)
+        )
+    """)
+    op.execute("""
+        INSERT INTO mentor_conversations (user_id, mentor_id, version, updated_at)
+        SELECT user_id, mentor_id, COUNT(*), MAX(created_at)
+        FROM mentor_messages
+        GROUP BY user_id, mentor_id
+        ON CONFLICT (user_id, mentor_id) DO NOTHING
+    """, label="sembrar mentor_conversations")
+
+    op.create_index('idx_users_updated_at', 'users', ['updated_at'], concurrently=True)
+    op.create_index('idx_mentor_conversations_mentor', 'mentor_conversations', ['mentor_id'], concurrently=True)
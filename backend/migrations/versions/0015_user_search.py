@@ -0,0 +1,32 @@
+"""
+Índices de búsqueda de usuarios (GET /api/admin/users/search y /api/user/mentors/search).
+
+- idx_users_search_document: GIN sobre un tsvector ponderado de nombre, email y emprendimiento
+  (nombre y email sin stemming, el emprendimiento con el diccionario 'spanish').
+- idx_users_search_trgm: GIN con pg_trgm sobre nombre, email y nombre del emprendimiento, para
+  búsquedas aproximadas (errores de tipeo, fragmentos).
+Las expresiones son las mismas que arma models/user.py (User.search); si cambian allí hay que
+crear índices nuevos en otra revisión.
+CREATE EXTENSION necesita permisos de owner de la base (o que la extensión ya exista).
+"""
+
+revision = '0015'
+description = "Índices GIN de texto completo y trigramas para buscar usuarios"
+transactional = False
+
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(username, '')), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, coalesce(email, '')), 'A')"
+    " || setweight(to_tsvector('spanish'::regconfig, coalesce(business_name, '')), 'B')"
+    " || setweight(to_tsvector('spanish'::regconfig, coalesce(business_category, '')), 'C')"
+    " || setweight(to_tsvector('spanish'::regconfig, coalesce(business_description, '')), 'D'))"
+)
+SEARCH_TEXT = (
+    "lower(coalesce(username, '') || ' ' || coalesce(email, '') || ' ' || coalesce(business_name, ''))"
+)
+
+
+def upgrade(op):
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('idx_users_search_document', 'users', [SEARCH_DOCUMENT], using='gin', concurrently=True)
+    op.create_index('idx_users_search_trgm', 'users', [f"{SEARCH_TEXT} gin_trgm_ops"], using='gin', concurrently=True)
@@ -0,0 +1,39 @@
+"""
+Baja inmediata y purga diferida de usuarios (DELETE /api/admin/users/<id>).
+
+- users.deleted_at: marca la baja; el usuario queda con rol 'deleted' hasta que se purga.
+- user_purges: una fila por baja con el estado y el progreso del borrado por bloques.
+- idx_mentor_messages_mentor: la purga de un mentor borra sus mensajes por mentor_id, que no
+  es la primera columna de idx_mentor_messages_conversation.
+"""
+
+revision = '0016'
+description = "users.deleted_at y tabla user_purges para el borrado diferido"
+transactional = False
+
+
+def upgrade(op):
+    op.add_column('users', 'deleted_at', "TIMESTAMP WITHOUT TIME ZONE")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_purges (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            username VARCHAR(80) NOT NULL,
+            email VARCHAR(120) NOT NULL,
+            role VARCHAR(20) NOT NULL,
+            requested_by INTEGER,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            total_rows INTEGER,
+            deleted_rows INTEGER NOT NULL DEFAULT 0,
+            deleted_files INTEGER NOT NULL DEFAULT 0,
+            error VARCHAR(500),
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            started_at TIMESTAMP WITHOUT TIME ZONE,
+            finished_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.create_index('idx_user_purges_status', 'user_purges', ['status', 'id'])
+    op.create_index('idx_user_purges_user', 'user_purges', ['user_id'])
+    op.create_index('idx_mentor_messages_mentor', 'mentor_messages', ['mentor_id'], concurrently=True)
@@ -0,0 +1,19 @@
+"""
+Snapshots de los reportes de BI (models/bi_snapshot.py): el último resultado de cada reporte,
+compartido por todos los workers, para no recalcularlo en cada visita al dashboard.
+"""
+
+revision = '0017'
+description = "Tabla bi_snapshots"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_snapshots (
+            key VARCHAR(100) PRIMARY KEY,
+            payload JSON NOT NULL,
+            computed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            duration_ms INTEGER
+        )
+    """)
@@ -0,0 +1,48 @@
+"""
+Tablas resumen de BI (models/bi_rollup.py): altas por día, usuarios por rol y categoría,
+usuarios por mentor, la versión de cada usuario ya sumada y la marca de agua de la última
+actualización. Se llenan con `flask --app app bi refresh --full` (o en la primera consulta de BI).
+"""
+
+revision = '0018'
+description = "Tablas resumen de BI con actualización incremental"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_user_facts (
+            user_id INTEGER PRIMARY KEY,
+            role VARCHAR(20) NOT NULL,
+            mentor_id INTEGER,
+            category VARCHAR(80) NOT NULL DEFAULT '',
+            signup_date DATE
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_signups_daily (
+            day DATE PRIMARY KEY,
+            users INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_role_category (
+            role VARCHAR(20) NOT NULL,
+            category VARCHAR(80) NOT NULL,
+            users INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (role, category)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_mentor_load (
+            mentor_id INTEGER PRIMARY KEY,
+            mentees INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS bi_rollup_state (
+            name VARCHAR(50) PRIMARY KEY,
+            watermark TIMESTAMP WITHOUT TIME ZONE,
+            refreshed_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
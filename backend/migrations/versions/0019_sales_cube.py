@@ -0,0 +1,36 @@
+"""
+Cubo de ventas (models/sales_cube.py): totales de daily_sales por usuaria y mes, y por mes,
+business_category y mentor. Se mantiene con cada venta; `flask --app app bi refresh --full` lo
+llena con las ventas existentes.
+"""
+
+revision = '0019'
+description = "Cubo de ventas por mes, categoría y mentor"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sales_user_month (
+            user_id INTEGER NOT NULL,
+            month DATE NOT NULL,
+            units BIGINT NOT NULL DEFAULT 0,
+            revenue NUMERIC(16, 2) NOT NULL DEFAULT 0,
+            variable_costs NUMERIC(16, 2) NOT NULL DEFAULT 0,
+            sales_days INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, month)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sales_cube (
+            month DATE NOT NULL,
+            category VARCHAR(80) NOT NULL,
+            mentor_id INTEGER NOT NULL,
+            units BIGINT NOT NULL DEFAULT 0,
+            revenue NUMERIC(16, 2) NOT NULL DEFAULT 0,
+            variable_costs NUMERIC(16, 2) NOT NULL DEFAULT 0,
+            sales_days INTEGER NOT NULL DEFAULT 0,
+            sellers INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, category, mentor_id)
+        )
+    """)
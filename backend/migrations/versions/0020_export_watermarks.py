@@ -0,0 +1,35 @@
+"""
+Exportación incremental a Parquet (controllers/export_controller.py).
+
+- mentor_messages.updated_at: cambia al marcar un mensaje como leído; las filas existentes toman
+  created_at.
+- Índices por updated_at en daily_sales, monthly_parameters y mentor_messages: cada exportación
+  incremental lee solo las filas cambiadas desde la marca de agua (users ya lo tiene, 0014).
+- export_watermarks: la marca de agua de cada tabla exportada.
+"""
+
+revision = '0020'
+description = "Marcas de agua e índices por updated_at para la exportación a Parquet"
+transactional = False
+
+
+def upgrade(op):
+    op.add_column('mentor_messages', 'updated_at', "TIMESTAMP WITHOUT TIME ZONE")
+    op.backfill('mentor_messages', 'updated_at = created_at', 'updated_at IS NULL')
+    op.backfill('daily_sales', 'updated_at = COALESCE(created_at, now())', 'updated_at IS NULL')
+    op.backfill('monthly_parameters', 'updated_at = COALESCE(created_at, now())', 'updated_at IS NULL')
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            table_name VARCHAR(50) PRIMARY KEY,
+            watermark TIMESTAMP WITHOUT TIME ZONE,
+            exported_at TIMESTAMP WITHOUT TIME ZONE,
+            mode VARCHAR(20),
+            rows INTEGER NOT NULL DEFAULT 0,
+            files INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    op.create_index('idx_daily_sales_updated_at', 'daily_sales', ['updated_at'], concurrently=True)
+    op.create_index('idx_monthly_parameters_updated_at', 'monthly_parameters', ['updated_at'], concurrently=True)
+    op.create_index('idx_mentor_messages_updated_at', 'mentor_messages', ['updated_at'], concurrently=True)
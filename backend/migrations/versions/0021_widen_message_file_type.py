@@ -0,0 +1,15 @@
+"""
+mentor_messages.file_type pasa de VARCHAR(50) a VARCHAR(255).
+
+El tipo MIME de un .docx (application/vnd.openxmlformats-officedocument.wordprocessingml.document)
+tiene 71 caracteres: los adjuntos Word fallaban al guardarse. Agrandar un VARCHAR en Postgres solo
+cambia el catálogo, no reescribe la tabla.
+"""
+
+revision = '0021'
+description = "Ampliar mentor_messages.file_type a VARCHAR(255)"
+transactional = True
+
+
+def upgrade(op):
+    op.execute("ALTER TABLE mentor_messages ALTER COLUMN file_type TYPE VARCHAR(255)")
@@ -0,0 +1 @@
+# Revisiones de esquema: NNNN_descripcion.py, aplicadas en orden por migrations.runner
@@ -0,0 +1,290 @@
+"""
+Tablas resumen (rollups) de BI, migración 0018.
+
+Los endpoints de BI leen estas tablas en lugar de recorrer users: su tamaño depende de los días,
+roles, categorías y mentores, no de la cantidad de usuarios.
+- bi_signups_daily: altas por día (usuarios activos, por fecha de created_at).
+- bi_role_category: usuarios activos por rol y business_category ('' = sin categoría).
+- bi_mentor_load: usuarios (rol 'user') asignados a cada mentor.
+- bi_user_facts: la última versión de cada usuario activo que se sumó a los rollups; permite
+  restar su aporte anterior cuando cambia.
+
+refresh_rollups() es incremental: lee solo los usuarios con updated_at posterior a la marca de
+agua (índice idx_users_updated_at), compara cada uno con su fila en bi_user_facts y aplica la
+diferencia. La marca se relee con WATERMARK_OVERLAP de margen (transacciones que confirmaron
+tarde con un updated_at anterior); reprocesar un usuario sin cambios no suma nada. Los borrados
+físicos no dejan rastro en users, así que quien borra llama a remove_users() en la misma
+transacción. refresh_rollups(full=True) reconstruye todo desde users.
+
+El cubo de ventas (models/sales_cube.py) agrupa por la categoría y el mentor de bi_user_facts:
+cada cambio de fila aquí mueve los meses de la usuaria a su nueva celda del cubo.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from config.database import db
+from models.user import User
+
+STATE_NAME = 'users'
+WATERMARK_OVERLAP = timedelta(minutes=5)
+REFRESH_BATCH_SIZE = 5000
+
+
+class BIUserFact(db.Model):
+    __tablename__ = 'bi_user_facts'
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    role = db.Column(db.String(20), nullable=False)
+    mentor_id = db.Column(db.Integer, nullable=True)
+    category = db.Column(db.String(80), nullable=False, default='')
+    signup_date = db.Column(db.Date, nullable=True)
+
+
+class BISignupsDaily(db.Model):
+    __tablename__ = 'bi_signups_daily'
+
+    day = db.Column(db.Date, primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+
+
+class BIRoleCategory(db.Model):
+    __tablename__ = 'bi_role_category'
+
+    role = db.Column(db.String(20), primary_key=True)
+    category = db.Column(db.String(80), primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+
+
+class BIMentorLoad(db.Model):
+    __tablename__ = 'bi_mentor_load'
+
+    mentor_id = db.Column(db.Integer, primary_key=True)
+    mentees = db.Column(db.Integer, nullable=False, default=0)
+
+
+class BIRollupState(db.Model):
+    """Marca de agua de la última actualización de los rollups"""
+    __tablename__ = 'bi_rollup_state'
+
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=True)
+    refreshed_at = db.Column(db.DateTime, nullable=True)
+
+
+# (modelo, columnas de la clave, columna del conteo)
+ROLLUPS = (
+    (BISignupsDaily, ('day',), 'users'),
+    (BIRoleCategory, ('role', 'category'), 'users'),
+    (BIMentorLoad, ('mentor_id',), 'mentees'),
+)
+
+
+def _insert():
+    return pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+
+
+def _fact(row):
+    """(rol, mentor_id, categoría, fecha de alta) que aporta el usuario, o None si no está activo"""
+    if row.deleted_at is not None or row.role == 'deleted':
+        return None
+    category = (row.business_category or '').strip()[:80]
+    return row.role, row.mentor_id, category, row.created_at.date() if row.created_at else None
+
+
+def _contributions(fact):
+    """Claves de cada rollup a las que suma 1 el usuario"""
+    role, mentor_id, category, signup_date = fact
+    keys = {BIRoleCategory: (role, category)}
+    if signup_date is not None:
+        keys[BISignupsDaily] = (signup_date,)
+    if role == 'user' and mentor_id is not None:
+        keys[BIMentorLoad] = (mentor_id,)
+    return keys
+
+
+def _apply_deltas(deltas):
+    """Suma deltas {modelo: {clave: n}} con upserts y borra las filas que quedan en 0"""
+    insert = _insert()
+    for model, key_columns, count_column in ROLLUPS:
+        changes = {key: n for key, n in deltas.get(model, {}).items() if n}
+        if not changes:
+            continue
+        table = model.__table__
+        statement = insert(table).values([
+            {**dict(zip(key_columns, key)), count_column: n} for key, n in changes.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns],
+            set_={count_column: table.c[count_column] + statement.excluded[count_column]},
+        )
+        db.session.execute(statement)
+        db.session.execute(db.delete(model).where(table.c[count_column] <= 0))
+
+
+def _add(deltas, fact, sign):
+    for model, key in _contributions(fact).items():
+        bucket = deltas.setdefault(model, {})
+        bucket[key] = bucket.get(key, 0) + sign
+
+
+def _cube_cell(fact):
+    """Celda del cubo de ventas de un fact (rol, mentor_id, categoría, alta), o None"""
+    from models.sales_cube import cell_of  # sales_cube importa BIUserFact de este módulo
+    return None if fact is None else cell_of(fact[2], fact[1])
+
+
+def _lock_state():
+    """Fila de estado bloqueada hasta el commit (serializa las actualizaciones entre workers)"""
+    return db.session.query(BIRollupState).filter_by(name=STATE_NAME).with_for_update().first()
+
+
+def _rebuild(now):
+    """Reconstruye facts y rollups desde users (un INSERT ... SELECT por tabla)"""
+    for model in (BIUserFact, BISignupsDaily, BIRoleCategory, BIMentorLoad):
+        db.session.execute(db.delete(model))
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        signup_date = db.cast(User.created_at, db.Date)
+    else:
+        signup_date = db.func.date(User.created_at)
+    category = db.func.substr(db.func.trim(db.func.coalesce(User.business_category, '')), 1, 80)
+    active = db.select(User.id, User.role, User.mentor_id, category, signup_date).where(
+        User.deleted_at.is_(None), User.role != 'deleted')
+    db.session.execute(db.insert(BIUserFact).from_select(
+        ['user_id', 'role', 'mentor_id', 'category', 'signup_date'], active))
+
+    facts = BIUserFact
+    db.session.execute(db.insert(BISignupsDaily).from_select(
+        ['day', 'users'],
+        db.select(facts.signup_date, db.func.count()).where(facts.signup_date.isnot(None))
+        .group_by(facts.signup_date)))
+    db.session.execute(db.insert(BIRoleCategory).from_select(
+        ['role', 'category', 'users'],
+        db.select(facts.role, facts.category, db.func.count()).group_by(facts.role, facts.category)))
+    db.session.execute(db.insert(BIMentorLoad).from_select(
+        ['mentor_id', 'mentees'],
+        db.select(facts.mentor_id, db.func.count()).where(facts.role == 'user', facts.mentor_id.isnot(None))
+        .group_by(facts.mentor_id)))
+
+    from models.sales_cube import rebuild
+    rebuild()
+    return db.session.query(db.func.max(User.updated_at)).scalar() or now
+
+
+def _refresh_changed(since):
+    """
+    Aplica a los rollups los usuarios con updated_at >= since. Devuelve (procesados, marca nueva).
+    Recorre por (updated_at, id) en bloques de REFRESH_BATCH_SIZE: un UPDATE masivo deja muchas
+    filas con el mismo updated_at.
+    """
+    from models.sales_cube import move_users
+    insert = _insert()
+    processed = 0
+    watermark = since
+    last = None
+    columns = (User.id, User.role, User.mentor_id, User.business_category, User.created_at,
+               User.deleted_at, User.updated_at)
+    while True:
+        query = db.select(*columns).order_by(User.updated_at, User.id).limit(REFRESH_BATCH_SIZE)
+        if since is not None:
+            query = query.where(User.updated_at >= since)
+        if last is not None:
+            query = query.where(db.tuple_(User.updated_at, User.id) > db.tuple_(*last))
+        rows = db.session.execute(query).all()
+        if not rows:
+            return processed, watermark
+
+        ids = [row.id for row in rows]
+        # Bloqueadas como en sales_cube.apply_sale_change(): una venta concurrente espera al commit
+        previous = {
+            fact.user_id: (fact.role, fact.mentor_id, fact.category, fact.signup_date)
+            for fact in db.session.query(BIUserFact).filter(BIUserFact.user_id.in_(ids)).with_for_update()
+        }
+        deltas, upserts, removed, moved = {}, [], [], {}
+        for row in rows:
+            old, new = previous.get(row.id), _fact(row)
+            if old == new:
+                continue
+            moved[row.id] = (_cube_cell(old), _cube_cell(new))
+            if old is not None:
+                _add(deltas, old, -1)
+            if new is None:
+                removed.append(row.id)
+            else:
+                _add(deltas, new, 1)
+                role, mentor_id, category, signup_date = new
+                upserts.append({'user_id': row.id, 'role': role, 'mentor_id': mentor_id,
+                                'category': category, 'signup_date': signup_date})
+
+        _apply_deltas(deltas)
+        move_users(moved)
+        if removed:
+            db.session.execute(db.delete(BIUserFact).where(BIUserFact.user_id.in_(removed)))
+        if upserts:
+            statement = insert(BIUserFact.__table__).values(upserts)
+            statement = statement.on_conflict_do_update(
+                index_elements=[BIUserFact.__table__.c.user_id],
+                set_={column: statement.excluded[column] for column in ('role', 'mentor_id', 'category', 'signup_date')},
+            )
+            db.session.execute(statement)
+
+        processed += len(rows)
+        last = (rows[-1].updated_at, rows[-1].id)
+        if rows[-1].updated_at is not None and (watermark is None or rows[-1].updated_at > watermark):
+            watermark = rows[-1].updated_at
+
+
+def refresh_rollups(full=False):
+    """
+    Actualiza los rollups (incremental salvo full o que nunca se hayan calculado) y hace commit.
+    Devuelve {'mode', 'processed', 'watermark'}.
+    """
+    now = datetime.utcnow()
+    try:
+        state = _lock_state()
+        if state is None:
+            state = BIRollupState(name=STATE_NAME)
+            db.session.add(state)
+            full = True
+        if full or state.watermark is None:
+            state.watermark = _rebuild(now)
+            result = {'mode': 'full', 'processed': None}
+        else:
+            processed, watermark = _refresh_changed(state.watermark - WATERMARK_OVERLAP)
+            state.watermark = max(state.watermark, watermark)
+            result = {'mode': 'incremental', 'processed': processed}
+        state.refreshed_at = now
+        db.session.commit()
+        return {**result, 'watermark': state.watermark}
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def ensure_fresh(max_age):
+    """Actualiza los rollups si la última actualización tiene más de max_age segundos"""
+    refreshed_at = db.session.query(BIRollupState.refreshed_at).filter_by(name=STATE_NAME).scalar()
+    if refreshed_at is None or refreshed_at < datetime.utcnow() - timedelta(seconds=max_age):
+        refresh_rollups()
+
+
+def remove_users(user_ids):
+    """
+    Resta de los rollups y del cubo de ventas a los usuarios que se van a borrar físicamente (sin
+    commit; llamar en la transacción del DELETE). Los que ya estaban dados de baja no aportan nada.
+    """
+    from models.sales_cube import forget_users, move_users
+    if not user_ids:
+        return
+    _lock_state()
+    deltas, moved = {}, {}
+    facts = db.session.query(BIUserFact).filter(BIUserFact.user_id.in_(user_ids)).with_for_update().all()
+    for row in facts:
+        fact = (row.role, row.mentor_id, row.category, row.signup_date)
+        _add(deltas, fact, -1)
+        moved[row.user_id] = (_cube_cell(fact), None)
+    _apply_deltas(deltas)
+    move_users(moved)
+    forget_users(user_ids)
+    db.session.execute(db.delete(BIUserFact).where(BIUserFact.user_id.in_(user_ids)),
+                       execution_options={'synchronize_session': False})
@@ -0,0 +1,63 @@
+import logging
+import time
+from config.database import db
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+logger = logging.getLogger(__name__)
+
+
+class BISnapshot(db.Model):
+    """
+    Resultado ya calculado de un reporte de BI (migración 0017), compartido por todos los workers.
+    Los endpoints de BI lo leen mientras no supere su antigüedad máxima y lo recalculan después.
+    """
+    __tablename__ = 'bi_snapshots'
+
+    key = db.Column(db.String(100), primary_key=True)
+    payload = db.Column(db.JSON, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False)
+    duration_ms = db.Column(db.Integer, nullable=True)
+
+    @classmethod
+    def fresh(cls, key, max_age):
+        """Snapshot de key calculado hace menos de max_age segundos, o None"""
+        since = datetime.utcnow() - timedelta(seconds=max_age)
+        return cls.query.filter(cls.key == key, cls.computed_at >= since).first()
+
+    @classmethod
+    def store(cls, key, payload, duration_ms=None):
+        """Guarda (upsert) el snapshot de key con la hora actual; el commit queda a cargo de quien llama"""
+        insert = pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        now = datetime.utcnow()
+        table = cls.__table__
+        values = {'payload': payload, 'computed_at': now, 'duration_ms': duration_ms}
+        statement = insert(table).values(key=key, **values).on_conflict_do_update(
+            index_elements=[table.c.key], set_=values,
+        )
+        db.session.execute(statement)
+        return now
+
+    @classmethod
+    def get_or_compute(cls, key, max_age, compute, refresh=False):
+        """
+        (payload, computed_at) del snapshot vigente de key; si no hay, o refresh, lo recalcula con
+        compute() y lo guarda. Si el guardado falla se devuelve igual el resultado recién calculado.
+        """
+        if not refresh:
+            snapshot = cls.fresh(key, max_age)
+            if snapshot is not None:
+                return snapshot.payload, snapshot.computed_at
+
+        started = time.perf_counter()
+        payload = compute()
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        try:
+            computed_at = cls.store(key, payload, duration_ms)
+            db.session.commit()
+        except Exception:
+            logger.warning(f"No se pudo guardar el snapshot {key}", exc_info=True)
+            db.session.rollback()
+            computed_at = datetime.utcnow()
+        return payload, computed_at
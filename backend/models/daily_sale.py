@@ -1,5 +1,24 @@
 from config.database import db
-from datetime import datetime
+from datetime import date, datetime
+
+def month_range(month_from, month_to=None):
+    """
+    Fechas [inicio, fin) de los meses 'YYYY-MM' month_from..month_to (inclusive; solo month_from
+    si no hay month_to). ValueError si un mes es inválido o el rango está invertido.
+    """
+    def first_day(month_year):
+        try:
+            year, month = map(int, month_year.split('-'))
+            return date(year, month, 1)
+        except (ValueError, AttributeError):
+            raise ValueError(f"Mes inválido: {month_year!r}; usa YYYY-MM")
+
+    start = first_day(month_from)
+    last = first_day(month_to) if month_to else start
+    if last < start:
+        raise ValueError('month_to no puede ser anterior a month_year')
+    end = date(last.year + 1, 1, 1) if last.month == 12 else date(last.year, last.month + 1, 1)
+    return start, end
 
 class DailySale(db.Model):
     """Modelo de Venta Diaria"""
@@ -18,24 +37,18 @@ class DailySale(db.Model):
     # Índices para mejorar consultas
     __table_args__ = (
         db.Index('idx_user_date', 'user_id', 'sale_date'),
+        # Exportación incremental (migración 0020)
+        db.Index('idx_daily_sales_updated_at', 'updated_at'),
     )
-    
-    def to_dict(self):
-        """Convierte la venta diaria a diccionario"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'sale_date': self.sale_date.isoformat() if self.sale_date else None,
-            'product_name': self.product_name,
-            'units_sold': int(self.units_sold) if self.units_sold else 0,
-            'price_per_unit': float(self.price_per_unit) if self.price_per_unit else 0.0,
-            'variable_cost_per_unit': float(self.variable_cost_per_unit) if self.variable_cost_per_unit else 0.0,
-            'revenue': float(self.units_sold * self.price_per_unit) if self.units_sold and self.price_per_unit else 0.0,
-            'total_variable_costs': float(self.units_sold * self.variable_cost_per_unit) if self.units_sold and self.variable_cost_per_unit else 0.0,
-            'gross_profit': float((self.units_sold * self.price_per_unit) - (self.units_sold * self.variable_cost_per_unit)) if self.units_sold and self.price_per_unit and self.variable_cost_per_unit else 0.0,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+
+    @classmethod
+    def range_version(cls, user_id, start, end):
+        """(ventas, último updated_at) en [start, end): cambia con altas, bajas y ediciones (ETag del listado)"""
+        return tuple(
+            db.session.query(db.func.count(cls.id), db.func.max(cls.updated_at))
+            .filter(cls.user_id == user_id, cls.sale_date >= start, cls.sale_date < end)
+            .one()
+        )
 
 class MonthlyParameters(db.Model):
     """Modelo de Parámetros Mensuales del Usuario"""
@@ -52,22 +65,15 @@ class MonthlyParameters(db.Model):
     month_year = db.Column(db.String(7), nullable=False)  # Formato: YYYY-MM para identificar el mes
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    def to_dict(self):
-        """Convierte los parámetros mensuales a diccionario"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'target_monthly_sales': int(self.target_monthly_sales) if self.target_monthly_sales else 0,
-            'fixed_costs_monthly': float(self.fixed_costs_monthly) if self.fixed_costs_monthly else 0.0,
-            'loan_monthly_payment': float(self.loan_monthly_payment) if self.loan_monthly_payment else 0.0,
-            'working_days_per_month': int(self.working_days_per_month) if self.working_days_per_month else 30,
-            'default_price_per_unit': float(self.default_price_per_unit) if self.default_price_per_unit else None,
-            'default_variable_cost_per_unit': float(self.default_variable_cost_per_unit) if self.default_variable_cost_per_unit else None,
-            'month_year': self.month_year,
-            'daily_target_units': int(self.target_monthly_sales / self.working_days_per_month) if self.working_days_per_month > 0 else 0,
-            'daily_fixed_costs': float(self.fixed_costs_monthly / self.working_days_per_month) if self.working_days_per_month > 0 else 0.0,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
 
+    # Exportación incremental (migración 0020)
+    __table_args__ = (
+        db.Index('idx_monthly_parameters_updated_at', 'updated_at'),
+    )
+
+    @classmethod
+    def version_of(cls, user_id, month_year):
+        """updated_at de los parámetros del mes o None si todavía no existen"""
+        return (db.session.query(cls.updated_at)
+                .filter(cls.user_id == user_id, cls.month_year == month_year)
+                .scalar())
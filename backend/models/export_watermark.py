@@ -0,0 +1,16 @@
+from config.database import db
+
+
+class ExportWatermark(db.Model):
+    """
+    Marca de agua de la exportación a Parquet de una tabla (migración 0020). La siguiente
+    ejecución incremental exporta las filas con updated_at posterior (controllers/export_controller.py).
+    """
+    __tablename__ = 'export_watermarks'
+
+    table_name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=True)
+    exported_at = db.Column(db.DateTime, nullable=True)
+    mode = db.Column(db.String(20), nullable=True)  # full, incremental
+    rows = db.Column(db.Integer, default=0, nullable=False)  # Filas de la última ejecución
+    files = db.Column(db.Integer, default=0, nullable=False)
@@ -0,0 +1,49 @@
+from config.database import db
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+class MentorConversation(db.Model):
+    """
+    Versión de cada conversación usuario-mentora (migración 0014).
+    Se incrementa al enviar mensajes o marcarlos como leídos; los GET de mensajes y de no
+    leídos la usan como ETag sin recorrer los mensajes.
+    """
+    __tablename__ = 'mentor_conversations'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    mentor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_mentor_conversations_mentor', 'mentor_id'),
+    )
+
+    @classmethod
+    def touch(cls, user_id, mentor_id):
+        """Incrementa la versión (upsert). Llamar antes del commit del cambio que la provoca"""
+        insert = pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        now = datetime.utcnow()
+        table = cls.__table__
+        statement = insert(table).values(user_id=user_id, mentor_id=mentor_id, version=1, updated_at=now)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.mentor_id],
+            set_={'version': table.c.version + 1, 'updated_at': now},
+        )
+        db.session.execute(statement)
+
+    @classmethod
+    def version_of(cls, user_id, mentor_id):
+        """Versión actual (0 si todavía no hay mensajes)"""
+        version = (db.session.query(cls.version)
+                   .filter(cls.user_id == user_id, cls.mentor_id == mentor_id)
+                   .scalar())
+        return version or 0
+
+    @classmethod
+    def mentor_version(cls, mentor_id):
+        """(conversaciones, suma de versiones) de una mentora: cambia con cualquier mensaje suyo"""
+        return tuple(db.session.query(db.func.count(cls.user_id), db.func.coalesce(db.func.sum(cls.version), 0))
+                     .filter(cls.mentor_id == mentor_id)
+                     .one())
@@ -1,5 +1,6 @@
 from config.database import db
 from datetime import datetime
+from models.user import User
 
 class MentorInvitation(db.Model):
     """Invitaciones de usuario a mentor (un mentor puede aceptar/rechazar)"""
@@ -12,34 +13,32 @@ class MentorInvitation(db.Model):
     message = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     responded_at = db.Column(db.DateTime, nullable=True)
+    # Versión para ETag (migración 0014)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Índices (migración 0011)
+    __table_args__ = (
+        db.Index('idx_mentor_invitations_mentor_status', 'mentor_id', 'status'),
+        db.Index('idx_mentor_invitations_user', 'user_id'),
+    )
 
     # Relaciones
     user = db.relationship('User', foreign_keys=[user_id])
     mentor = db.relationship('User', foreign_keys=[mentor_id])
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'user': {
-                'id': self.user.id,
-                'username': self.user.username,
-                'email': self.user.email,
-                # incluir info de emprendimiento para que el mentor decida
-                'business': {
-                    'name': getattr(self.user, 'business_name', None),
-                    'category': getattr(self.user, 'business_category', None),
-                    'description': getattr(self.user, 'business_description', None),
-                }
-            } if self.user else None,
-            'mentor': {
-                'id': self.mentor.id,
-                'username': self.mentor.username,
-                'email': self.mentor.email
-            } if self.mentor else None,
-            'status': self.status,
-            'message': self.message,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'responded_at': self.responded_at.isoformat() if self.responded_at else None,
-        }
-
-
+    @classmethod
+    def list_version(cls, *criteria):
+        """
+        Versión de un listado de invitaciones: cantidad, último updated_at de las invitaciones y
+        último updated_at de los usuarios y mentores que aparecen en ellas.
+        """
+        invited = db.aliased(User)
+        mentor = db.aliased(User)
+        return tuple(
+            db.session.query(db.func.count(cls.id), db.func.max(cls.updated_at),
+                             db.func.max(invited.updated_at), db.func.max(mentor.updated_at))
+            .join(invited, cls.user_id == invited.id)
+            .join(mentor, cls.mentor_id == mentor.id)
+            .filter(*criteria)
+            .one()
+        )
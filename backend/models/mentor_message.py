@@ -12,24 +12,17 @@ class MentorMessage(db.Model):
     content = db.Column(db.Text, nullable=True)  # Ahora puede ser null si hay archivo
     file_name = db.Column(db.String(255), nullable=True)  # Nombre original del archivo
     file_path = db.Column(db.String(500), nullable=True)  # Ruta donde se guardó el archivo
-    file_type = db.Column(db.String(50), nullable=True)  # Tipo MIME: application/pdf, application/vnd.openxmlformats-officedocument.wordprocessingml.document, text/plain
+    file_type = db.Column(db.String(255), nullable=True)  # Tipo MIME: application/pdf, application/vnd.openxmlformats-officedocument.wordprocessingml.document, text/plain
     file_size = db.Column(db.Integer, nullable=True)  # Tamaño en bytes
     is_read = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Cambia al marcar como leído; marca de agua de la exportación (migración 0020)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'mentor_id': self.mentor_id,
-            'sender_id': self.sender_id,
-            'content': self.content,
-            'file_name': self.file_name,
-            'file_path': self.file_path,
-            'file_type': self.file_type,
-            'file_size': self.file_size,
-            'is_read': self.is_read,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
-
+    # Índices para las consultas de conversación (migración 0011)
+    __table_args__ = (
+        db.Index('idx_mentor_messages_conversation', 'user_id', 'mentor_id', 'created_at'),
+        # Purga de los mensajes de un mentor (migración 0016)
+        db.Index('idx_mentor_messages_mentor', 'mentor_id'),
+        db.Index('idx_mentor_messages_updated_at', 'updated_at'),
+    )
@@ -0,0 +1,200 @@
+"""
+Cubo de ventas de la plataforma, migración 0019.
+
+- sales_user_month: totales de daily_sales por usuaria y mes (unidades, ingresos, costos
+  variables, días con venta). Se actualiza en la misma transacción que cada alta, edición o baja
+  de una venta (apply_sale_change).
+- sales_cube: los mismos totales por mes, business_category y mentor, más cuántas usuarias
+  vendieron en el mes. La celda de cada usuaria es la de su fila en bi_user_facts
+  (models/bi_rollup.py): cuando refresh_rollups() ve que cambió su categoría o su mentor, o que
+  se dio de baja, move_users() pasa sus meses de una celda a otra. Así el cubo es siempre la suma
+  de sales_user_month de las usuarias activas, agrupada por su categoría y mentor actuales.
+
+Consultar el cubo cuesta meses × categorías × mentores filas, no ventas. rebuild() lo arma de
+nuevo desde daily_sales (`flask --app app bi refresh --full`).
+"""
+from collections import defaultdict
+from decimal import Decimal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from config.database import db
+from models.daily_sale import DailySale
+from models.bi_rollup import BIUserFact
+
+# mentor_id de la celda de las usuarias sin mentor (la clave primaria no admite NULL)
+NO_MENTOR = 0
+MEASURES = ('units', 'revenue', 'variable_costs', 'sales_days')
+
+
+class SalesUserMonth(db.Model):
+    __tablename__ = 'sales_user_month'
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # Primer día del mes
+    units = db.Column(db.BigInteger, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(16, 2), nullable=False, default=0)
+    variable_costs = db.Column(db.Numeric(16, 2), nullable=False, default=0)
+    sales_days = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SalesCube(db.Model):
+    __tablename__ = 'sales_cube'
+
+    month = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(80), primary_key=True)  # '' = sin categoría
+    mentor_id = db.Column(db.Integer, primary_key=True)  # NO_MENTOR = sin mentor
+    units = db.Column(db.BigInteger, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(16, 2), nullable=False, default=0)
+    variable_costs = db.Column(db.Numeric(16, 2), nullable=False, default=0)
+    sales_days = db.Column(db.Integer, nullable=False, default=0)
+    sellers = db.Column(db.Integer, nullable=False, default=0)  # Usuarias con ventas en el mes
+
+
+def _insert():
+    return pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+
+
+def cell_of(category, mentor_id):
+    """(categoría, mentor) de la celda del cubo de una fila de bi_user_facts"""
+    return category or '', mentor_id if mentor_id is not None else NO_MENTOR
+
+
+def _sale_measures(units, price, variable_cost, sign):
+    units = int(units or 0)
+    return {
+        'units': sign * units,
+        'revenue': sign * units * Decimal(str(price or 0)),
+        'variable_costs': sign * units * Decimal(str(variable_cost or 0)),
+        'sales_days': sign,
+    }
+
+
+def _upsert(model, rows, key_columns):
+    """Suma las medidas de rows a model (upsert) y borra las filas tocadas que quedaron sin ventas"""
+    if not rows:
+        return
+    table = model.__table__
+    measures = [column for column in rows[0] if column not in key_columns]
+    statement = _insert()(table).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c[column] for column in key_columns],
+        set_={column: table.c[column] + statement.excluded[column] for column in measures},
+    )
+    db.session.execute(statement)
+    keys = db.tuple_(*(table.c[column] for column in key_columns))
+    touched = [tuple(row[column] for column in key_columns) for row in rows]
+    db.session.execute(db.delete(model).where(table.c.sales_days <= 0, keys.in_(touched)))
+
+
+def _add_to_cube(cube, month, cell, measures, sellers):
+    bucket = cube[(month, *cell)]
+    for column in MEASURES:
+        bucket[column] += measures[column]
+    bucket['sellers'] += sellers
+
+
+def _apply_cube(cube):
+    rows = [
+        {'month': month, 'category': category, 'mentor_id': mentor_id, **measures}
+        for (month, category, mentor_id), measures in cube.items()
+        if any(measures.values())
+    ]
+    _upsert(SalesCube, rows, ('month', 'category', 'mentor_id'))
+
+
+def _new_cube():
+    return defaultdict(lambda: {column: 0 for column in (*MEASURES, 'sellers')})
+
+
+def apply_sale_change(user_id, sale_date, old=None, new=None):
+    """
+    Aplica al cubo el cambio de una venta (sin commit; llamar en la transacción de la venta).
+    old y new son (unidades, precio, costo variable) antes y después; None en un alta o una baja.
+    """
+    if old == new:
+        return
+    month = sale_date.replace(day=1)
+    measures = {column: 0 for column in MEASURES}
+    for values, sign in ((old, -1), (new, 1)):
+        if values is not None:
+            for column, value in _sale_measures(*values, sign).items():
+                measures[column] += value
+
+    # La fila de bi_user_facts queda bloqueada hasta el commit: move_users() la bloquea también
+    # antes de leer sales_user_month, así una venta y un cambio de mentor no se cruzan
+    fact = (db.session.query(BIUserFact.category, BIUserFact.mentor_id)
+            .filter(BIUserFact.user_id == user_id).with_for_update().first())
+
+    table = SalesUserMonth.__table__
+    statement = _insert()(table).values(user_id=user_id, month=month, **measures)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.month],
+        set_={column: table.c[column] + statement.excluded[column] for column in MEASURES},
+    ).returning(table.c.sales_days)
+    sales_days = db.session.execute(statement).scalar_one()
+    if sales_days <= 0:
+        db.session.execute(db.delete(SalesUserMonth).where(
+            SalesUserMonth.user_id == user_id, SalesUserMonth.month == month))
+
+    if fact is None:
+        # Usuaria todavía no sumada a bi_user_facts (o dada de baja): entra con refresh_rollups()
+        return
+    before = sales_days - measures['sales_days']
+    sellers = (sales_days > 0) - (before > 0)
+    cube = _new_cube()
+    _add_to_cube(cube, month, cell_of(*fact), measures, sellers)
+    _apply_cube(cube)
+
+
+def move_users(changes):
+    """
+    Pasa los meses de cada usuaria de su celda anterior a la nueva (sin commit).
+    changes: {user_id: (celda anterior o None, celda nueva o None)}; None = no suma al cubo.
+    """
+    changes = {user_id: cells for user_id, cells in changes.items() if cells[0] != cells[1]}
+    if not changes:
+        return
+    cube = _new_cube()
+    rows = db.session.query(SalesUserMonth).filter(SalesUserMonth.user_id.in_(list(changes))).all()
+    for row in rows:
+        old, new = changes[row.user_id]
+        measures = {column: getattr(row, column) for column in MEASURES}
+        for cell, sign in ((old, -1), (new, 1)):
+            if cell is not None:
+                _add_to_cube(cube, row.month, cell, {c: sign * v for c, v in measures.items()}, sign)
+    _apply_cube(cube)
+
+
+def forget_users(user_ids):
+    """Borra sales_user_month de usuarios que se borran físicamente (ya restados del cubo)"""
+    db.session.execute(db.delete(SalesUserMonth).where(SalesUserMonth.user_id.in_(user_ids)),
+                       execution_options={'synchronize_session': False})
+
+
+def rebuild():
+    """Reconstruye sales_user_month desde daily_sales y sales_cube desde bi_user_facts (sin commit)"""
+    db.session.execute(db.delete(SalesCube))
+    db.session.execute(db.delete(SalesUserMonth))
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        month = db.cast(db.func.date_trunc('month', DailySale.sale_date), db.Date)
+    else:
+        month = db.func.date(DailySale.sale_date, 'start of month')
+    units = db.func.coalesce(DailySale.units_sold, 0)
+    db.session.execute(db.insert(SalesUserMonth).from_select(
+        ['user_id', 'month', 'units', 'revenue', 'variable_costs', 'sales_days'],
+        db.select(DailySale.user_id, month, db.func.sum(units),
+                  db.func.sum(units * DailySale.price_per_unit),
+                  db.func.sum(units * DailySale.variable_cost_per_unit),
+                  db.func.count())
+        .group_by(DailySale.user_id, month)))
+
+    facts, totals = BIUserFact, SalesUserMonth
+    mentor_id = db.func.coalesce(facts.mentor_id, NO_MENTOR)
+    db.session.execute(db.insert(SalesCube).from_select(
+        ['month', 'category', 'mentor_id', 'units', 'revenue', 'variable_costs', 'sales_days', 'sellers'],
+        db.select(totals.month, facts.category, mentor_id, db.func.sum(totals.units),
+                  db.func.sum(totals.revenue), db.func.sum(totals.variable_costs),
+                  db.func.sum(totals.sales_days), db.func.count())
+        .join(facts, facts.user_id == totals.user_id)
+        .group_by(totals.month, facts.category, mentor_id)))
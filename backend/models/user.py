@@ -1,6 +1,45 @@
-from config.database import db, bcrypt
+from config.database import db
+from config.password_hasher import password_hasher
 from datetime import datetime
 
+# Mensajes de error de find_conflict()
+CONFLICT_ERRORS = {
+    'username': 'El nombre de usuario ya está en uso',
+    'email': 'El email ya está registrado',
+}
+
+# Búsqueda (migración 0015). Las expresiones deben coincidir con las de los índices para que
+# Postgres los use: regconfig y '' van como literales, no como parámetros.
+SEARCH_DICTIONARY = 'spanish'
+
+
+def _regconfig(name):
+    return db.literal_column(f"'{name}'::regconfig")
+
+
+def _search_document(username, email, business_name, business_category, business_description):
+    """tsvector ponderado: nombre y email (A, sin stemming), emprendimiento (B), categoría (C), descripción (D)"""
+    def weighted(column, config, weight):
+        vector = db.func.to_tsvector(_regconfig(config), db.func.coalesce(column, db.literal_column("''")))
+        return db.func.setweight(vector, db.literal_column(f"'{weight}'"))
+    return (weighted(username, 'simple', 'A')
+            .op('||')(weighted(email, 'simple', 'A'))
+            .op('||')(weighted(business_name, SEARCH_DICTIONARY, 'B'))
+            .op('||')(weighted(business_category, SEARCH_DICTIONARY, 'C'))
+            .op('||')(weighted(business_description, SEARCH_DICTIONARY, 'D')))
+
+
+def _search_text(username, email, business_name):
+    """Texto para la búsqueda aproximada por trigramas (errores de tipeo, fragmentos de nombre o email)"""
+    space = db.literal_column("' '")
+    empty = db.literal_column("''")
+    return db.func.lower(
+        db.func.coalesce(username, empty).op('||')(space)
+        .op('||')(db.func.coalesce(email, empty)).op('||')(space)
+        .op('||')(db.func.coalesce(business_name, empty))
+    )
+
+
 class User(db.Model):
     """Modelo de Usuario"""
     __tablename__ = 'users'
@@ -9,20 +48,43 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    role = db.Column(db.String(20), default='user', nullable=False)  # 'admin', 'mentor' o 'user'
+    role = db.Column(db.String(20), default='user', nullable=False)  # 'admin', 'mentor', 'user' o 'deleted'
     mentor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # Mentor asignado
     # Emprendimiento (un usuario puede tener un solo emprendimiento)
     business_name = db.Column(db.String(150), nullable=True)
     business_category = db.Column(db.String(80), nullable=True)
     business_description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Cambia con cada edición; versión para ETag (migración 0014)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Baja pendiente de purga (migración 0016); el usuario queda con rol 'deleted' hasta que se borra
+    deleted_at = db.Column(db.DateTime, nullable=True)
     
     # Relaciones
     mentor = db.relationship('User', remote_side=[id], backref='assigned_users', foreign_keys=[mentor_id])
+    # Usuarios asignados (mentores); se calcula en la consulta con serializers.UserSerializer
+    assigned_users_count = db.query_expression()
+
+    # Búsquedas sin distinguir mayúsculas (login y unicidad), migración 0012
+    __table_args__ = (
+        db.Index('uq_users_username_lower', db.func.lower(username), unique=True),
+        db.Index('uq_users_email_lower', db.func.lower(email), unique=True),
+        # Paginación por cursor del listado de admin y conteo de asignados por mentor, migración 0013
+        db.Index('idx_users_created_at_id', created_at, id),
+        db.Index('idx_users_role_created_at_id', role, created_at, id),
+        db.Index('idx_users_mentor_created_at_id', mentor_id, created_at, id),
+        db.Index('idx_users_updated_at', updated_at),
+        # Búsqueda de texto completo y aproximada (solo Postgres), migración 0015
+        db.Index('idx_users_search_document',
+                 _search_document(username, email, business_name, business_category, business_description),
+                 postgresql_using='gin').ddl_if(dialect='postgresql'),
+        db.Index('idx_users_search_trgm', _search_text(username, email, business_name).label('search_text'),
+                 postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
     
     def set_password(self, password):
-        """Establece la contraseña hasheada"""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """Establece la contraseña hasheada (bcrypt en el pool de procesos, ver config/password_hasher.py)"""
+        self.password_hash = password_hasher.hash(password)
     
     def __init__(self, username, email, password, role='user', mentor_id=None):
         self.username = username
@@ -33,38 +95,99 @@ class User(db.Model):
     
     def check_password(self, password):
         """Verifica si la contraseña es correcta"""
-        return bcrypt.check_password_hash(self.password_hash, password)
-    
-    def to_dict(self, include_mentor=True):
-        """Convierte el usuario a diccionario"""
-        mentor_dict = None
-        if include_mentor and self.mentor:
-            try:
-                mentor_dict = {
-                    'id': self.mentor.id,
-                    'username': self.mentor.username,
-                    'email': self.mentor.email,
-                    'role': self.mentor.role
-                }
-            except:
-                mentor_dict = None
-        
-        return {
-            'id': self.id,
-            'username': self.username,
-            'email': self.email,
-            'role': self.role,
-            'mentor_id': self.mentor_id,
-            'mentor': mentor_dict,
-            'business': {
-                'name': self.business_name,
-                'category': self.business_category,
-                'description': self.business_description
-            },
-            'assigned_users_count': len(self.assigned_users) if self.is_mentor() else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return password_hasher.check(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """True si el hash se generó con un costo distinto de BCRYPT_LOG_ROUNDS"""
+        return password_hasher.needs_rehash(self.password_hash)
     
+    @classmethod
+    def find_for_login(cls, identifier):
+        """
+        Busca por email si el texto contiene '@' y por username si no (los usernames no pueden
+        tener '@'). Cada rama usa un solo índice lower(...), sin OR entre columnas.
+        """
+        identifier = (identifier or '').strip().lower()
+        column = cls.email if '@' in identifier else cls.username
+        return cls.query.filter(db.func.lower(column) == identifier).first()
+
+    @classmethod
+    def find_conflict(cls, username=None, email=None, exclude_id=None):
+        """
+        Verifica username y email en una sola consulta.
+        Devuelve 'username', 'email' o None según cuál ya esté en uso por otra cuenta.
+        """
+        username = username.strip().lower() if username else None
+        email = email.strip().lower() if email else None
+        conditions = []
+        if username:
+            conditions.append(db.func.lower(cls.username) == username)
+        if email:
+            conditions.append(db.func.lower(cls.email) == email)
+        if not conditions:
+            return None
+
+        query = db.session.query(cls.username, cls.email).filter(db.or_(*conditions))
+        if exclude_id is not None:
+            query = query.filter(cls.id != exclude_id)
+        rows = query.limit(2).all()
+        if username and any(row.username.lower() == username for row in rows):
+            return 'username'
+        if rows:
+            return 'email'
+        return None
+
+    @classmethod
+    def search(cls, text):
+        """
+        (condición, relevancia) para buscar text en nombre, email y emprendimiento.
+        En Postgres: coincidencia de palabras (tsvector, con stemming en español en el emprendimiento)
+        o similitud de trigramas (pg_trgm, umbral pg_trgm.word_similarity_threshold); ambas usan
+        índices GIN. En otras bases (desarrollo) se usa LIKE sin relevancia.
+        """
+        text = text.strip().lower()
+        if db.session.get_bind().dialect.name != 'postgresql':
+            pattern = f"%{text}%"
+            columns = (cls.username, cls.email, cls.business_name, cls.business_category, cls.business_description)
+            condition = db.or_(*(db.func.lower(column).like(pattern) for column in columns))
+            return condition, db.literal_column('0.0')
+
+        document = _search_document(cls.username, cls.email, cls.business_name,
+                                    cls.business_category, cls.business_description)
+        search_text = _search_text(cls.username, cls.email, cls.business_name)
+        query = (db.func.websearch_to_tsquery(_regconfig('simple'), text)
+                 .op('||')(db.func.websearch_to_tsquery(_regconfig(SEARCH_DICTIONARY), text)))
+        condition = db.or_(document.op('@@')(query), search_text.op('%>')(text))
+        relevance = db.func.ts_rank_cd(document, query) + db.func.word_similarity(text, search_text)
+        return condition, db.cast(relevance, db.Float)
+
+    @classmethod
+    def list_version(cls, *criteria):
+        """
+        (filas, último updated_at) de los usuarios que cumplen criteria.
+        Cambia con altas, bajas y ediciones; sirve de versión para el ETag de los listados.
+        """
+        return tuple(db.session.query(db.func.count(cls.id), db.func.max(cls.updated_at)).filter(*criteria).one())
+
+    @classmethod
+    def profile_version(cls, user_id):
+        """
+        Versión del perfil: updated_at del usuario y de su mentor y, si es mentor, cuántos usuarios
+        tiene asignados. None si el usuario no existe.
+        """
+        mentor = db.aliased(cls)
+        assigned = db.aliased(cls)
+        assigned_count = (db.select(db.func.count(assigned.id))
+                          .where(assigned.mentor_id == cls.id)
+                          .correlate(cls)
+                          .scalar_subquery())
+        row = (db.session.query(cls.updated_at, mentor.updated_at,
+                                db.case((cls.role == 'mentor', assigned_count), else_=None))
+               .outerjoin(mentor, cls.mentor_id == mentor.id)
+               .filter(cls.id == user_id)
+               .first())
+        return tuple(row) if row else None
+
     def is_admin(self):
         """Verifica si el usuario es administrador"""
         return self.role == 'admin'
@@ -0,0 +1,34 @@
+from config.database import db
+from datetime import datetime
+
+
+class UserPurge(db.Model):
+    """
+    Borrado diferido de un usuario (migración 0016). AdminController.delete_user da de baja al
+    usuario al instante y crea esta fila; controllers/user_purge_controller.py borra después sus
+    datos por bloques y registra aquí el progreso.
+    """
+    __tablename__ = 'user_purges'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Sin clave foránea: la fila del usuario se borra al final de la purga
+    user_id = db.Column(db.Integer, nullable=False)
+    # Datos originales (el usuario dado de baja queda con username/email reemplazados)
+    username = db.Column(db.String(80), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    requested_by = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, running, done, failed
+    total_rows = db.Column(db.Integer, nullable=True)  # filas dependientes al empezar
+    deleted_rows = db.Column(db.Integer, default=0, nullable=False)
+    deleted_files = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_user_purges_status', 'status', 'id'),
+        db.Index('idx_user_purges_user', 'user_id'),
+    )
@@ -2,61 +2,108 @@
 Rutas para administradores
 Requiere autenticación y rol de administrador
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from models.user import User
 from config.database import db
-from controllers.auth_controller import token_required
+from controllers.auth_controller import admin_required
 from controllers.admin_controller import AdminController
 from controllers.bi_controller import BIController
-from functools import wraps
+from controllers.sales_analytics_controller import SalesAnalyticsController
+from controllers.user_import_controller import UserImportController, parse_rows
+from controllers.search_controller import SearchController
+from controllers.user_bulk_controller import UserBulkController, parse_user_ids
+from controllers.mentor_matching_controller import MentorMatchingController
+from controllers.user_purge_controller import UserPurgeController
+from config.errors import internal_error
+from config.etag import conditional
+from config.streaming import stream_requested
+from config.logging_config import get_logger
 
 admin_bp = Blueprint('admin', __name__)
+logger = get_logger('admin')
 
-def admin_required(f):
-    """Decorador para requerir rol de administrador"""
-    @token_required
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        # En una implementación completa, aquí verificarías el token JWT
-        # y obtendrías el usuario actual para verificar su rol
-        # Por ahora, esto es una estructura básica
-        token = request.headers.get('Authorization')
-        
-        if not token:
-            return jsonify({'error': 'Token de acceso requerido'}), 401
-        
-        # TODO: Implementar verificación de token JWT y rol
-        # user = get_current_user_from_token(token)
-        # if not user or not user.is_admin():
-        #     return jsonify({'error': 'Acceso denegado. Se requiere rol de administrador'}), 403
-        
-        return f(*args, **kwargs)
-    return decorated
+def users_version(*args, **kwargs):
+    """
+    Versión de las vistas de usuarios de admin: cada fila incluye su mentor y el conteo de
+    asignados, así que cualquier alta, baja o edición en users las cambia
+    """
+    return User.list_version()
 
 # Endpoints de gestión de usuarios
 
 @admin_bp.route('/users', methods=['GET'])
-# @admin_required  # Temporalmente deshabilitado para pruebas
+@admin_required
+@conditional(users_version)
 def get_all_users():
-    """Obtiene todos los usuarios (solo para admins)"""
+    """
+    Lista usuarios por páginas (solo para admins).
+    Parámetros: role (lista separada por comas), mentor_id (id o 'none'), created_from, created_to,
+    sort (created_at, username, email, id; prefijo - para descendente), fields, limit y cursor
+    (next_cursor de la página anterior). Con stream=1 devuelve todos los que cumplen los filtros,
+    sin paginar, escritos a medida que se leen.
+    """
+    args = request.args
     try:
-        result, status_code = AdminController.get_all_users()
+        if stream_requested():
+            return AdminController.stream_users(
+                role=args.get('role'),
+                mentor_id=args.get('mentor_id'),
+                created_from=args.get('created_from'),
+                created_to=args.get('created_to'),
+                sort=args.get('sort'),
+                fields=args.get('fields'),
+            )
+        result, status_code = AdminController.get_all_users(
+            role=args.get('role'),
+            mentor_id=args.get('mentor_id'),
+            created_from=args.get('created_from'),
+            created_to=args.get('created_to'),
+            sort=args.get('sort'),
+            fields=args.get('fields'),
+            limit=args.get('limit'),
+            cursor=args.get('cursor'),
+        )
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/users/search', methods=['GET'])
+@admin_required
+@conditional(users_version)
+def search_users():
+    """
+    Busca usuarios por nombre, email y emprendimiento (q), ordenados por relevancia.
+    Acepta los mismos filtros, fields, limit y cursor que GET /users.
+    """
+    args = request.args
+    try:
+        result, status_code = SearchController.search_users(
+            q=args.get('q'),
+            role=args.get('role'),
+            mentor_id=args.get('mentor_id'),
+            created_from=args.get('created_from'),
+            created_to=args.get('created_to'),
+            fields=args.get('fields'),
+            limit=args.get('limit'),
+            cursor=args.get('cursor'),
+        )
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/users/<int:user_id>', methods=['GET'])
-# @admin_required
+@admin_required
+@conditional(users_version)
 def get_user(user_id):
     """Obtiene un usuario por ID (solo para admins)"""
     try:
         result, status_code = AdminController.get_user_by_id(user_id)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/users', methods=['POST'])
-# @admin_required
+@admin_required
 def create_user():
     """Crea un nuevo usuario (solo para admins)"""
     data = request.get_json()
@@ -72,11 +119,112 @@ def create_user():
     try:
         result, status_code = AdminController.create_user(username, email, password, role)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/users/import', methods=['POST'])
+@admin_required
+def import_users():
+    """
+    Importa usuarios en bloque (solo para admins).
+    Acepta un archivo 'file' (.csv o .json), un cuerpo JSON (lista o {'users': [...]}) o un cuerpo text/csv.
+    Parámetros opcionales: mentor_id (mentor por defecto) y dry_run=1 (solo validar).
+    """
+    file = request.files.get('file')
+    try:
+        if file is not None:
+            fmt = 'json' if file.filename.lower().endswith('.json') else 'csv'
+            rows = parse_rows(file.read(), fmt)
+        elif request.is_json:
+            rows = parse_rows(request.get_json(silent=True), 'json')
+        elif request.mimetype in ('text/csv', 'text/plain'):
+            rows = parse_rows(request.get_data(), 'csv')
+        else:
+            return jsonify({'error': 'Envía un archivo CSV/JSON o un cuerpo JSON'}), 400
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({'error': f'No se pudo leer el archivo: {e}'}), 400
+
+    params = request.form if file is not None else request.args
+    default_mentor = params.get('mentor_id') or None
+    dry_run = (params.get('dry_run') or '').lower() in ('1', 'true', 'yes')
+
+    try:
+        result, status_code = UserImportController.import_users(rows, default_mentor, dry_run)
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger, 'Error al importar usuarios')
+
+def _optional_id(value, name):
+    """Id opcional de un cuerpo JSON (None o '' = sin valor); ValueError si no es un entero"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool) or not str(value).isdigit():
+        raise ValueError(f'{name} inválido')
+    return int(value)
+
+@admin_bp.route('/users/bulk/reassign', methods=['POST'])
+@admin_required
+def bulk_reassign():
+    """
+    Reasigna mentor a muchos usuarios en una transacción (solo para admins).
+    Cuerpo: mentor_id (null para quitar el mentor) y user_ids o from_mentor_id (todos los usuarios
+    de ese mentor); dry_run opcional.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        mentor_id = _optional_id(data.get('mentor_id'), 'mentor_id')
+        from_mentor_id = _optional_id(data.get('from_mentor_id'), 'from_mentor_id')
+        if from_mentor_id is None:
+            user_ids = parse_user_ids(data.get('user_ids'))
+        elif data.get('user_ids'):
+            return jsonify({'error': 'Envía user_ids o from_mentor_id, no ambos'}), 400
+        else:
+            user_ids = None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        result, status_code = UserBulkController.reassign(user_ids, from_mentor_id, mentor_id,
+                                                          dry_run=bool(data.get('dry_run')))
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/users/bulk/role', methods=['POST'])
+@admin_required
+def bulk_change_role():
+    """Cambia el rol de muchos usuarios en una transacción (solo para admins). Cuerpo: user_ids, role, dry_run"""
+    data = request.get_json(silent=True) or {}
+    try:
+        user_ids = parse_user_ids(data.get('user_ids'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        result, status_code = UserBulkController.change_role(user_ids, data.get('role'),
+                                                             dry_run=bool(data.get('dry_run')))
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/users/bulk/delete', methods=['POST'])
+@admin_required
+def bulk_delete():
+    """
+    Da de baja a muchos usuarios en una transacción (solo para admins); sus datos se borran en
+    segundo plano, una purga por usuario (purge_ids). Cuerpo: user_ids, dry_run
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        user_ids = parse_user_ids(data.get('user_ids'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        result, status_code = UserBulkController.delete(user_ids, dry_run=bool(data.get('dry_run')))
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/users/<int:user_id>', methods=['PUT'])
-# @admin_required
+@admin_required
 def update_user(user_id):
     """Actualiza un usuario (solo para admins)"""
     data = request.get_json()
@@ -92,21 +240,44 @@ def update_user(user_id):
     try:
         result, status_code = AdminController.update_user(user_id, username, email, password, role)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
-# @admin_required
+@admin_required
 def delete_user(user_id):
-    """Elimina un usuario (solo para admins)"""
+    """
+    Da de baja un usuario (solo para admins). Responde 202: sus datos se borran en segundo plano
+    y el progreso se consulta en /purges/<purge_id>
+    """
     try:
-        result, status_code = AdminController.delete_user(user_id)
+        result, status_code = AdminController.delete_user(user_id, requested_by=g.current_user['user_id'])
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/purges', methods=['GET'])
+@admin_required
+def list_purges():
+    """Purgas de usuarios dados de baja, las más recientes primero (solo para admins). Parámetros: status, limit"""
+    try:
+        result, status_code = UserPurgeController.list_purges(request.args.get('status'), request.args.get('limit'))
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/purges/<int:purge_id>', methods=['GET'])
+@admin_required
+def get_purge(purge_id):
+    """Estado y progreso de una purga (solo para admins)"""
+    try:
+        result, status_code = UserPurgeController.get_purge(purge_id)
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/users/<int:user_id>/assign-mentor', methods=['POST'])
-# @admin_required
+@admin_required
 def assign_mentor(user_id):
     """Asigna un usuario a un mentor (solo para admins)"""
     data = request.get_json()
@@ -119,48 +290,97 @@ def assign_mentor(user_id):
     try:
         result, status_code = AdminController.assign_user_to_mentor(user_id, mentor_id)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/mentors', methods=['GET'])
-# @admin_required
+@admin_required
+@conditional(users_version)
 def get_all_mentors():
     """Obtiene todos los mentores (solo para admins)"""
     try:
         result, status_code = AdminController.get_all_mentors()
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/mentors/<int:mentor_id>/users', methods=['GET'])
-# @admin_required
+@admin_required
+@conditional(users_version)
 def get_mentor_users(mentor_id):
     """Obtiene los usuarios asignados a un mentor (solo para admins)"""
     try:
         result, status_code = AdminController.get_mentor_users(mentor_id)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
+
+@admin_bp.route('/mentors/match', methods=['POST'])
+@admin_required
+def match_mentors():
+    """
+    Asigna mentor a todas las usuarias sin mentor, balanceando la carga y priorizando la misma
+    business_category (solo para admins). Cuerpo opcional: capacity (máximo de usuarios por
+    mentor) y dry_run (solo devuelve la propuesta).
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        capacity = _optional_id(data.get('capacity'), 'capacity')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if capacity == 0:
+        return jsonify({'error': 'capacity debe ser mayor a 0'}), 400
+    try:
+        result, status_code = MentorMatchingController.match(capacity, dry_run=bool(data.get('dry_run')))
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
 
 # Endpoints de Business Intelligence
 
 @admin_bp.route('/bi/statistics', methods=['GET'])
-# @admin_required
+@admin_required
 def get_statistics():
-    """Obtiene estadísticas generales del sistema (solo para admins)"""
+    """
+    Obtiene estadísticas generales del sistema (solo para admins). Se sirven desde un snapshot de
+    hasta BI_SNAPSHOT_MAX_AGE segundos (generated_at); refresh=1 lo recalcula
+    """
     try:
-        result, status_code = BIController.get_statistics()
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        result, status_code = BIController.get_statistics(refresh=refresh)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @admin_bp.route('/bi/mentor-performance', methods=['GET'])
-# @admin_required
+@admin_required
 def get_mentor_performance():
-    """Obtiene métricas de rendimiento de mentores (solo para admins)"""
+    """
+    Métricas de rendimiento de mentores (solo para admins). El scorecard se calcula una vez por
+    día (generated_at); refresh=1 lo recalcula
+    """
     try:
-        result, status_code = BIController.get_mentor_performance()
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        result, status_code = BIController.get_mentor_performance(refresh=refresh)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
+@admin_bp.route('/bi/sales', methods=['GET'])
+@admin_required
+def get_sales_analytics():
+    """
+    Ventas de toda la plataforma desde el cubo de ventas (solo para admins). Query: group_by
+    (month,category,mentor), month_from, month_to (YYYY-MM), category, mentor_id (id o none)
+    """
+    try:
+        result, status_code = SalesAnalyticsController.get_sales_cube(
+            group_by=request.args.get('group_by'),
+            month_from=request.args.get('month_from'),
+            month_to=request.args.get('month_to'),
+            category=request.args.get('category'),
+            mentor_id=request.args.get('mentor_id'),
+        )
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
-import google.generativeai as genai
 import os
 import json
 import urllib.request
+from config.errors import internal_error
+from config.logging_config import get_logger
 
 ai_bp = Blueprint('ai', __name__)
+logger = get_logger('ai')
 
 # Usa versión con sufijo '-latest' para evitar errores 404 por versiones específicas
 GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
@@ -25,6 +27,8 @@ def call_gemini(prompt: str) -> str:
     if not GEMINI_API_KEY:
         return "Configura la variable de entorno GEMINI_API_KEY en el backend."
     try:
+        # Importación diferida: el SDK es pesado y solo se necesita al llamar a la IA
+        import google.generativeai as genai
         # Usar SDK oficial; no construir URL manualmente
         genai.configure(api_key=GEMINI_API_KEY)
         model_name = _resolve_model_name(GEMINI_MODEL or 'gemini-2.0-flash')
@@ -44,8 +48,9 @@ def call_gemini(prompt: str) -> str:
             if t:
                 fragments.append(t)
         return "\n".join(fragments).strip() or "Respuesta vacía."
-    except Exception as e:
-        return f"Error al llamar a Gemini: {str(e)}"
+    except Exception:
+        logger.exception("Error al llamar a Gemini")
+        return "No se pudo obtener respuesta de la IA."
 
 @ai_bp.route('/ai/generate-mentor-program', methods=['POST'])
 def generate_mentor_program():
@@ -102,8 +107,8 @@ REQUISITOS DEL PROGRAMA:
 """
         text = call_gemini(prompt)
         return jsonify({'program': text}), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @ai_bp.route('/ai/interpret-simulator', methods=['POST'])
 def interpret_simulator():
@@ -168,7 +173,7 @@ Formatea tu respuesta con:
             'response': interpretation
         }), 200
         
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 
@@ -1,7 +1,10 @@
-from flask import Blueprint, request, jsonify
-from controllers.auth_controller import AuthController
+from flask import Blueprint, request, jsonify, g
+from controllers.auth_controller import AuthController, token_required
+from config.errors import internal_error
+from config.logging_config import get_logger
 
 auth_bp = Blueprint('auth', __name__)
+logger = get_logger('auth')
 
 @auth_bp.route('/register', methods=['POST'])
 def register():
@@ -24,8 +27,8 @@ def register():
     try:
         result, status_code = AuthController.register(username, email, password, role)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
@@ -41,12 +44,26 @@ def login():
     try:
         result, status_code = AuthController.login(username, password)
         return jsonify(result), status_code
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @auth_bp.route('/me', methods=['GET'])
+@token_required
 def get_current_user():
     """Ruta para obtener el usuario actual (requiere autenticación)"""
-    # Esta ruta necesitaría implementación de JWT en el futuro
-    return jsonify({'message': 'Endpoint protegido - implementar JWT'}), 200
+    try:
+        result, status_code = AuthController.get_user_by_id(g.current_user['user_id'])
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
+
+@auth_bp.route('/refresh', methods=['POST'])
+@token_required
+def refresh_token():
+    """Renueva el token con el rol y mentor actuales (una consulta por renovación)"""
+    try:
+        result, status_code = AuthController.refresh(g.current_user['user_id'])
+        return jsonify(result), status_code
+    except Exception:
+        return internal_error(logger)
 
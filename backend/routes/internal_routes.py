@@ -0,0 +1,29 @@
+"""
+Rutas internas de operación (telemetría)
+Solo disponibles si INTERNAL_API_TOKEN está configurado; se envía en el header X-Internal-Token
+"""
+from flask import Blueprint, jsonify, request, current_app, abort
+from config.database import db
+from config.pool_stats import get_pool_status, pool_wait_stats
+import hmac
+
+internal_bp = Blueprint('internal', __name__)
+
+@internal_bp.before_request
+def check_internal_token():
+    """Oculta el blueprint (404) si no hay token configurado y exige el token en cada petición"""
+    expected = current_app.config.get('INTERNAL_API_TOKEN')
+    if not expected:
+        abort(404)
+    provided = request.headers.get('X-Internal-Token', '')
+    # En bytes: compare_digest rechaza (TypeError) los str con caracteres no ASCII
+    if not hmac.compare_digest(provided.encode(), expected.encode()):
+        return jsonify({'error': 'Token interno inválido'}), 403
+
+@internal_bp.route('/pool', methods=['GET'])
+def pool_status():
+    """Estado del pool de conexiones de este worker (checked-out, idle, overflow y esperas)"""
+    status = get_pool_status(db.engine)
+    if request.args.get('reset') in ('1', 'true'):
+        pool_wait_stats.reset()
+    return jsonify(status), 200
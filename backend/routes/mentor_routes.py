@@ -2,7 +2,7 @@
 Rutas para mentores
 Los mentores solo pueden ver y gestionar sus usuarios asignados
 """
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app, g
 import os
 from werkzeug.utils import secure_filename
 from pathlib import Path
@@ -10,135 +10,147 @@ import uuid
 from models.user import User
 from models.mentor_invitation import MentorInvitation
 from models.mentor_message import MentorMessage
+from models.mentor_conversation import MentorConversation
 from config.database import db
-from controllers.auth_controller import token_required
-from functools import wraps
+from controllers.auth_controller import mentor_required
 from datetime import datetime
 from sqlalchemy import func
+from config.errors import internal_error
+from config.etag import conditional
+from config.streaming import stream_requested, stream_collection
+from config.logging_config import get_logger
+from serializers import MentorInvitationSerializer, MentorMessageSerializer, UserSerializer
 
 mentor_bp = Blueprint('mentor', __name__)
+logger = get_logger('mentor')
+# Usuarios vistos por su mentor: sin el objeto mentor (es el propio mentor)
+assigned_user_serializer = UserSerializer(exclude=('mentor',))
+invitation_serializer = MentorInvitationSerializer()
+message_serializer = MentorMessageSerializer()
 
-def mentor_required(f):
-    """Decorador para requerir rol de mentor"""
-    @wraps(f)
-    @token_required
-    def decorated(*args, **kwargs):
-        # Por ahora, permitir acceso (el token_required se implementará después)
-        # En producción, verificar que el usuario tenga rol 'mentor'
-        return f(*args, **kwargs)
-    return decorated
+def current_mentor_id(requested=None):
+    """
+    Devuelve (mentor_id, error). El mentor sale del token (rol verificado por mentor_required);
+    si la petición todavía envía mentor_id debe coincidir con el del token.
+    """
+    mentor_id = g.current_user['user_id']
+    if requested not in (None, ''):
+        try:
+            requested = int(requested)
+        except (TypeError, ValueError):
+            return None, (jsonify({'error': 'ID de mentor inválido'}), 400)
+        if requested != mentor_id:
+            return None, (jsonify({'error': 'No puedes actuar en nombre de otro mentor'}), 403)
+    return mentor_id, None
+
+# Versiones para los GET condicionales (config/etag.py); el mentor es siempre el del token
+
+def my_users_version():
+    mentor_id = g.current_user['user_id']
+    return User.list_version(User.mentor_id == mentor_id, User.role == 'user')
+
+def invitations_version():
+    criteria = [MentorInvitation.mentor_id == g.current_user['user_id']]
+    status = request.args.get('status', 'pending')
+    if status:
+        criteria.append(MentorInvitation.status == status)
+    return MentorInvitation.list_version(*criteria)
+
+def messages_version():
+    try:
+        user_id = int(request.args.get('user_id'))
+    except (TypeError, ValueError):
+        return None
+    return MentorConversation.version_of(user_id, g.current_user['user_id'])
+
+def conversations_version():
+    return (my_users_version(), MentorConversation.mentor_version(g.current_user['user_id']))
 
 @mentor_bp.route('/my-users', methods=['GET'])
-# @mentor_required
+@mentor_required
+@conditional(my_users_version)
 def get_my_users():
     """Obtiene los usuarios asignados al mentor actual (solo para mentores)"""
     try:
-        # Por ahora, obtener el mentor_id desde query params o header
-        # En producción, obtener del token JWT
-        mentor_id = request.args.get('mentor_id')
-        
-        if not mentor_id:
-            return jsonify({'error': 'ID de mentor requerido'}), 400
-        
-        mentor = User.query.get(mentor_id)
-        if not mentor:
-            return jsonify({'error': 'Mentor no encontrado'}), 404
-        
-        if mentor.role != 'mentor':
-            return jsonify({'error': 'El usuario no es un mentor'}), 403
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
         
         # Obtener usuarios asignados
-        assigned_users = User.query.filter_by(mentor_id=mentor_id, role='user').all()
+        assigned_users = assigned_user_serializer.all(
+            assigned_user_serializer.select().where(User.mentor_id == mentor_id, User.role == 'user')
+        )
         
-        users_data = [user.to_dict(include_mentor=False) for user in assigned_users]
+        users_data = assigned_user_serializer.dump_many(assigned_users)
         
         return jsonify({
-            'mentor': {
-                'id': mentor.id,
-                'username': mentor.username,
-                'email': mentor.email
-            },
+            'mentor': {'id': mentor_id},
             'users': users_data,
             'total': len(users_data)
         }), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @mentor_bp.route('/my-users/<int:user_id>', methods=['GET'])
-# @mentor_required
+@mentor_required
+@conditional(lambda user_id: User.list_version(User.id == user_id))
 def get_my_user(user_id):
     """Obtiene un usuario específico asignado al mentor (solo para mentores)"""
     try:
-        mentor_id = request.args.get('mentor_id')
-        
-        if not mentor_id:
-            return jsonify({'error': 'ID de mentor requerido'}), 400
-        
-        try:
-            mentor_id = int(mentor_id)
-        except ValueError:
-            return jsonify({'error': 'ID de mentor inválido'}), 400
-        
-        mentor = User.query.get(mentor_id)
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
         
-        user = User.query.get(user_id)
+        user = assigned_user_serializer.first(assigned_user_serializer.select().where(User.id == user_id))
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
         # Verificar que el usuario esté asignado a este mentor
-        if user.mentor_id != mentor.id:
+        if user.mentor_id != mentor_id:
             return jsonify({'error': 'Este usuario no está asignado a ti'}), 403
         
-        return jsonify(user.to_dict(include_mentor=False)), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return jsonify(assigned_user_serializer.dump(user)), 200
+    except Exception:
+        return internal_error(logger)
 
 @mentor_bp.route('/invitations', methods=['GET'])
-# @mentor_required
+@mentor_required
+@conditional(invitations_version)
 def list_invitations():
     """Lista invitaciones dirigidas al mentor, opcionalmente por estado"""
     try:
-        mentor_id = request.args.get('mentor_id')
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
         status = request.args.get('status', 'pending')
-        if not mentor_id:
-            return jsonify({'error': 'ID de mentor requerido'}), 400
-        mentor = User.query.get(mentor_id)
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
 
-        query = MentorInvitation.query.filter_by(mentor_id=mentor.id)
+        query = invitation_serializer.select().where(MentorInvitation.mentor_id == mentor_id)
         if status:
-            query = query.filter_by(status=status)
-        invitations = query.order_by(MentorInvitation.created_at.desc()).all()
+            query = query.where(MentorInvitation.status == status)
+        invitations = invitation_serializer.all(query.order_by(MentorInvitation.created_at.desc()))
         return jsonify({
-            'mentor': {'id': mentor.id, 'username': mentor.username, 'email': mentor.email},
-            'invitations': [inv.to_dict() for inv in invitations],
+            'mentor': {'id': mentor_id},
+            'invitations': invitation_serializer.dump_many(invitations),
             'total': len(invitations)
         }), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @mentor_bp.route('/invitations/<int:invitation_id>/respond', methods=['POST'])
-# @mentor_required
+@mentor_required
 def respond_invitation(invitation_id):
     """Mentor acepta o rechaza una invitación"""
     try:
         data = request.get_json() or {}
-        mentor_id = data.get('mentor_id')
+        mentor_id, error = current_mentor_id(data.get('mentor_id'))
+        if error:
+            return error
         action = (data.get('action') or '').lower()
-        if not mentor_id:
-            return jsonify({'error': 'ID de mentor requerido'}), 400
         if action not in ['accept', 'reject']:
             return jsonify({'error': "Acción inválida. Use 'accept' o 'reject'"}), 400
 
-        mentor = User.query.get(mentor_id)
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
-
         invitation = MentorInvitation.query.get(invitation_id)
-        if not invitation or invitation.mentor_id != mentor.id:
+        if not invitation or invitation.mentor_id != mentor_id:
             return jsonify({'error': 'Invitación no encontrada'}), 404
         if invitation.status != 'pending':
             return jsonify({'error': 'La invitación ya fue respondida'}), 400
@@ -149,43 +161,45 @@ def respond_invitation(invitation_id):
                 return jsonify({'error': 'Usuario no encontrado'}), 404
             if user.mentor_id:
                 return jsonify({'error': 'El usuario ya tiene mentor asignado'}), 400
-            user.mentor_id = mentor.id
+            user.mentor_id = mentor_id
             invitation.status = 'accepted'
             invitation.responded_at = datetime.utcnow()
             db.session.commit()
-            return jsonify({'message': 'Invitación aceptada. Usuario asignado.', 'invitation': invitation.to_dict()}), 200
+            return jsonify({'message': 'Invitación aceptada. Usuario asignado.', 'invitation': invitation_serializer.dump(invitation)}), 200
 
         # reject
         invitation.status = 'rejected'
         invitation.responded_at = datetime.utcnow()
         db.session.commit()
-        return jsonify({'message': 'Invitación rechazada', 'invitation': invitation.to_dict()}), 200
-    except Exception as e:
+        return jsonify({'message': 'Invitación rechazada', 'invitation': invitation_serializer.dump(invitation)}), 200
+    except Exception:
         db.session.rollback()
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return internal_error(logger)
 
 @mentor_bp.route('/messages', methods=['GET'])
-# @mentor_required
+@mentor_required
+@conditional(messages_version)
 def list_messages_for_mentor():
-    """Lista mensajes entre el mentor y un usuario específico"""
+    """Lista mensajes entre el mentor y un usuario específico (?stream=1 para historiales largos)"""
     try:
-        mentor_id = request.args.get('mentor_id')
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
         user_id = request.args.get('user_id')
-        if not mentor_id or not user_id:
-            return jsonify({'error': 'mentor_id y user_id son requeridos'}), 400
-        mentor = User.query.get(int(mentor_id))
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
+        if not user_id:
+            return jsonify({'error': 'user_id es requerido'}), 400
         user = User.query.get(int(user_id))
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
-        msgs = (MentorMessage.query
-                .filter_by(user_id=user.id, mentor_id=mentor.id)
-                .order_by(MentorMessage.created_at.asc())
-                .all())
-        return jsonify({'messages': [m.to_dict() for m in msgs], 'total': len(msgs)}), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        query = (message_serializer.select()
+                 .where(MentorMessage.user_id == user.id, MentorMessage.mentor_id == mentor_id)
+                 .order_by(MentorMessage.created_at.asc()))
+        if stream_requested():
+            return stream_collection('messages', message_serializer, query)
+        msgs = message_serializer.all(query)
+        return jsonify({'messages': message_serializer.dump_many(msgs), 'total': len(msgs)}), 200
+    except Exception:
+        return internal_error(logger)
 
 def allowed_file(filename):
     """Verifica si el archivo está permitido"""
@@ -193,29 +207,28 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @mentor_bp.route('/messages', methods=['POST'])
-# @mentor_required
+@mentor_required
 def send_message_as_mentor():
     """Envía mensaje del mentor al usuario (puede incluir archivo)"""
     try:
-        mentor_id = request.form.get('mentor_id')
+        mentor_id, error = current_mentor_id(request.form.get('mentor_id'))
+        if error:
+            return error
         user_id = request.form.get('user_id')
         content = (request.form.get('content') or '').strip()
         file = request.files.get('file')
         
-        if not mentor_id or not user_id:
-            return jsonify({'error': 'mentor_id y user_id son requeridos'}), 400
+        if not user_id:
+            return jsonify({'error': 'user_id es requerido'}), 400
         
         # Debe haber contenido o archivo
         if not content and not file:
             return jsonify({'error': 'Debes enviar un mensaje de texto o un archivo'}), 400
         
-        mentor = User.query.get(int(mentor_id))
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
         user = User.query.get(int(user_id))
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
-        if user.mentor_id != mentor.id:
+        if user.mentor_id != mentor_id:
             return jsonify({'error': 'El usuario no está asignado a este mentor'}), 403
         
         # Procesar archivo si existe
@@ -248,8 +261,8 @@ def send_message_as_mentor():
         
         msg = MentorMessage(
             user_id=user.id,
-            mentor_id=mentor.id,
-            sender_id=mentor.id,
+            mentor_id=mentor_id,
+            sender_id=mentor_id,
             content=content if content else None,
             file_name=file_name,
             file_path=file_path,
@@ -257,9 +270,10 @@ def send_message_as_mentor():
             file_size=file_size
         )
         db.session.add(msg)
+        MentorConversation.touch(user.id, mentor_id)
         db.session.commit()
-        return jsonify({'message': 'Enviado', 'data': msg.to_dict()}), 201
-    except Exception as e:
+        return jsonify({'message': 'Enviado', 'data': message_serializer.dump(msg)}), 201
+    except Exception:
         db.session.rollback()
         # Limpiar archivo si hubo error
         if file_path and os.path.exists(file_path):
@@ -267,9 +281,10 @@ def send_message_as_mentor():
                 os.remove(file_path)
             except:
                 pass
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return internal_error(logger)
 
 @mentor_bp.route('/messages/files/<int:message_id>', methods=['GET'])
+@mentor_required
 def download_file_mentor(message_id):
     """Descarga un archivo adjunto de un mensaje (para mentores)"""
     try:
@@ -281,49 +296,49 @@ def download_file_mentor(message_id):
             return jsonify({'error': 'Este mensaje no tiene archivo adjunto'}), 404
         
         # Verificar que el mentor tiene acceso a este mensaje
-        mentor_id = request.args.get('mentor_id')
-        if mentor_id:
-            mentor = User.query.get(int(mentor_id))
-            if mentor and mentor.role == 'mentor' and msg.mentor_id == mentor.id:
-                # Construir ruta completa al archivo
-                # msg.file_path se guarda como "uploads/messages/nombre_archivo.extension"
-                upload_folder = Path(current_app.config['UPLOAD_FOLDER'])
-                # Si la ruta es relativa (empieza con "uploads/"), construir desde BASE_DIR
-                if msg.file_path.startswith('uploads/'):
-                    base_dir = Path(current_app.root_path).parent
-                    file_path_full = base_dir / msg.file_path
-                else:
-                    # Si es solo el nombre del archivo, buscarlo en upload_folder
-                    file_path_full = upload_folder / msg.file_path.split('/')[-1].split('\\')[-1]
-                
-                if not file_path_full.exists():
-                    return jsonify({'error': 'Archivo no encontrado en el servidor'}), 404
-                
-                return send_file(
-                    str(file_path_full),
-                    as_attachment=True,
-                    download_name=msg.file_name or 'archivo',
-                    mimetype=msg.file_type or 'application/octet-stream'
-                )
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
+        if msg.mentor_id != mentor_id:
+            return jsonify({'error': 'No tienes permiso para acceder a este archivo'}), 403
+
+        # Construir ruta completa al archivo
+        # msg.file_path se guarda como "uploads/messages/nombre_archivo.extension"
+        upload_folder = Path(current_app.config['UPLOAD_FOLDER'])
+        # Si la ruta es relativa (empieza con "uploads/"), construir desde BASE_DIR
+        if msg.file_path.startswith('uploads/'):
+            base_dir = Path(current_app.root_path).parent
+            file_path_full = base_dir / msg.file_path
+        else:
+            # Si es solo el nombre del archivo, buscarlo en upload_folder
+            file_path_full = upload_folder / msg.file_path.split('/')[-1].split('\\')[-1]
+        
+        if not file_path_full.exists():
+            return jsonify({'error': 'Archivo no encontrado en el servidor'}), 404
         
-        return jsonify({'error': 'No tienes permiso para acceder a este archivo'}), 403
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return send_file(
+            str(file_path_full),
+            as_attachment=True,
+            download_name=msg.file_name or 'archivo',
+            mimetype=msg.file_type or 'application/octet-stream'
+        )
+    except Exception:
+        return internal_error(logger)
 
 @mentor_bp.route('/conversations', methods=['GET'])
-# @mentor_required
+@mentor_required
+@conditional(conversations_version)
 def list_conversations():
     """Lista emprendedoras asignadas al mentor con conteo de no leídos"""
     try:
-        mentor_id = request.args.get('mentor_id')
-        if not mentor_id:
-            return jsonify({'error': 'ID de mentor requerido'}), 400
-        mentor = User.query.get(int(mentor_id))
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
+        mentor_id, error = current_mentor_id(request.args.get('mentor_id'))
+        if error:
+            return error
 
         # Emprendedoras asignadas
-        users = User.query.filter_by(mentor_id=mentor.id, role='user').all()
+        users = assigned_user_serializer.all(
+            assigned_user_serializer.select().where(User.mentor_id == mentor_id, User.role == 'user')
+        )
         user_ids = [u.id for u in users]
         if not user_ids:
             return jsonify({'conversations': [], 'total': 0}), 200
@@ -332,7 +347,7 @@ def list_conversations():
         unread_counts = dict(
             db.session.query(MentorMessage.user_id, func.count(MentorMessage.id))
             .filter(
-                MentorMessage.mentor_id == mentor.id,
+                MentorMessage.mentor_id == mentor_id,
                 MentorMessage.user_id.in_(user_ids),
                 MentorMessage.sender_id.in_(user_ids),
                 MentorMessage.is_read.is_(False),
@@ -344,40 +359,41 @@ def list_conversations():
         conversations = []
         for u in users:
             conversations.append({
-                'user': u.to_dict(include_mentor=False),
+                'user': assigned_user_serializer.dump(u),
                 'unread_count': int(unread_counts.get(u.id, 0))
             })
 
         return jsonify({'conversations': conversations, 'total': len(conversations)}), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @mentor_bp.route('/messages/read', methods=['POST'])
-# @mentor_required
+@mentor_required
 def mark_messages_read():
     """Marca como leídos los mensajes de una emprendedora hacia el mentor"""
     data = request.get_json() or {}
-    mentor_id = data.get('mentor_id')
+    mentor_id, error = current_mentor_id(data.get('mentor_id'))
+    if error:
+        return error
     user_id = data.get('user_id')
-    if not mentor_id or not user_id:
-        return jsonify({'error': 'mentor_id y user_id son requeridos'}), 400
+    if not user_id:
+        return jsonify({'error': 'user_id es requerido'}), 400
     try:
-        mentor = User.query.get(int(mentor_id))
-        if not mentor or mentor.role != 'mentor':
-            return jsonify({'error': 'Mentor no válido'}), 403
         user = User.query.get(int(user_id))
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
-        if user.mentor_id != mentor.id:
+        if user.mentor_id != mentor_id:
             return jsonify({'error': 'El usuario no está asignado a este mentor'}), 403
         # Marcar no leídos como leídos (mensajes de la usuaria)
         updated = (MentorMessage.query
-                   .filter_by(mentor_id=mentor.id, user_id=user.id)
+                   .filter_by(mentor_id=mentor_id, user_id=user.id)
                    .filter(MentorMessage.sender_id == user.id, MentorMessage.is_read.is_(False))
                    .update({MentorMessage.is_read: True}, synchronize_session=False))
+        if updated:
+            MentorConversation.touch(user.id, mentor_id)
         db.session.commit()
         return jsonify({'message': 'Mensajes marcados como leídos', 'updated': int(updated)}), 200
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return internal_error(logger)
 
@@ -1,23 +1,58 @@
 """
 Rutas para gestión de ventas diarias
 """
+from datetime import date
 from flask import Blueprint, request, jsonify
 from controllers.sales_controller import SalesController
+from controllers.auth_controller import owner_required
 from models.user import User
+from models.daily_sale import DailySale, MonthlyParameters, month_range
+from config.errors import internal_error
+from config.etag import conditional
+from config.streaming import stream_requested
+from config.logging_config import get_logger
 
 sales_bp = Blueprint('sales', __name__)
+logger = get_logger('sales')
+
+def requested_month():
+    """?month_year=YYYY-MM, mes actual por defecto"""
+    return request.args.get('month_year') or date.today().strftime('%Y-%m')
+
+def parameters_version(user_id):
+    # Sin parámetros la vista los crea: se responde sin ETag
+    return MonthlyParameters.version_of(user_id, requested_month())
+
+def sales_version(user_id):
+    try:
+        start, end = month_range(requested_month(), request.args.get('month_to'))
+    except ValueError:
+        return None
+    return DailySale.range_version(user_id, start, end)
+
+def report_version(user_id):
+    parameters = parameters_version(user_id)
+    if not parameters:
+        return parameters
+    # Hasta que termina el mes, los días transcurridos y la proyección cambian con la fecha
+    today = date.today()
+    ongoing = requested_month() >= today.strftime('%Y-%m')
+    return parameters, sales_version(user_id), today.isoformat() if ongoing else None
 
 @sales_bp.route('/parameters/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(parameters_version)
 def get_parameters(user_id):
     """Obtiene los parámetros mensuales del usuario"""
     try:
         month_year = request.args.get('month_year')
         result, status = SalesController.get_monthly_parameters(user_id, month_year)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @sales_bp.route('/parameters/<int:user_id>', methods=['PUT'])
+@owner_required
 def update_parameters(user_id):
     """Actualiza los parámetros mensuales del usuario"""
     try:
@@ -38,20 +73,30 @@ def update_parameters(user_id):
             default_variable_cost_per_unit=data.get('default_variable_cost_per_unit')
         )
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @sales_bp.route('/sales/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(sales_version)
 def get_sales(user_id):
-    """Obtiene las ventas diarias del usuario"""
+    """
+    Obtiene las ventas diarias del usuario: un mes (month_year) o varios (month_year..month_to).
+    Con stream=1 la lista se escribe a medida que se lee.
+    """
     try:
-        month_year = request.args.get('month_year')
-        result, status = SalesController.get_daily_sales(user_id, month_year)
-        return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        result, status = SalesController.get_daily_sales(
+            user_id,
+            request.args.get('month_year'),
+            month_to=request.args.get('month_to'),
+            stream=stream_requested()
+        )
+        return result, status
+    except Exception:
+        return internal_error(logger)
 
 @sales_bp.route('/sales/<int:user_id>', methods=['POST'])
+@owner_required
 def create_sale(user_id):
     """Crea o actualiza una venta diaria"""
     try:
@@ -75,25 +120,28 @@ def create_sale(user_id):
             product_name=data.get('product_name')
         )
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @sales_bp.route('/sales/<int:user_id>/<int:sale_id>', methods=['DELETE'])
+@owner_required
 def delete_sale(user_id, sale_id):
     """Elimina una venta diaria"""
     try:
         result, status = SalesController.delete_daily_sale(user_id, sale_id)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @sales_bp.route('/report/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(report_version)
 def get_report(user_id):
     """Obtiene el reporte completo de ventas con cálculos y proyecciones"""
     try:
         month_year = request.args.get('month_year')
         result, status = SalesController.get_sales_report(user_id, month_year)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
@@ -1,10 +1,14 @@
 """
 Rutas para gestión del propio perfil de usuario (rol 'user')
 """
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app, g
 from controllers.user_controller import UserController
+from controllers.search_controller import SearchController
+from controllers.auth_controller import token_required, owner_required
 from models.user import User
 from models.mentor_message import MentorMessage
+from models.mentor_invitation import MentorInvitation
+from models.mentor_conversation import MentorConversation
 from config.database import db
 from sqlalchemy import func
 import os
@@ -12,18 +16,60 @@ from werkzeug.utils import secure_filename
 from pathlib import Path
 from datetime import datetime
 import uuid
+from config.errors import internal_error
+from config.etag import conditional
+from config.streaming import stream_requested, stream_collection
+from config.logging_config import get_logger
+from serializers import MentorMessageSerializer
 
 user_bp = Blueprint('user', __name__)
+logger = get_logger('user')
+message_serializer = MentorMessageSerializer()
+
+def current_user_id(requested=None):
+    """
+    Devuelve (user_id, error) a partir del token. Si la petición todavía envía user_id
+    debe coincidir con el del token.
+    """
+    user_id = g.current_user['user_id']
+    if requested not in (None, ''):
+        try:
+            requested = int(requested)
+        except (TypeError, ValueError):
+            return None, (jsonify({'error': 'user_id inválido'}), 400)
+        if requested != user_id:
+            return None, (jsonify({'error': 'No puedes actuar en nombre de otro usuario'}), 403)
+    return user_id, None
+
+def assigned_mentor_id():
+    """
+    Mentor asignado, leído de la base como en send_message: el del token puede tener horas y
+    quedar viejo tras una reasignación. Una consulta por petición (el ETag y la vista la comparten).
+    """
+    if 'assigned_mentor_id' not in g:
+        g.assigned_mentor_id = (db.session.query(User.mentor_id)
+                                .filter_by(id=g.current_user['user_id']).scalar())
+    return g.assigned_mentor_id
+
+def conversation_version(user_id):
+    """Versión de la conversación con la mentora asignada (cambia al enviar o leer mensajes)"""
+    mentor_id = assigned_mentor_id()
+    if not mentor_id:
+        return (None, 0)
+    return (mentor_id, MentorConversation.version_of(user_id, mentor_id))
 
 @user_bp.route('/profile/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(User.profile_version)
 def get_profile(user_id):
     try:
         result, status = UserController.get_profile(user_id)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/profile/<int:user_id>', methods=['PUT'])
+@owner_required
 def update_profile(user_id):
     data = request.get_json() or {}
     try:
@@ -34,10 +80,11 @@ def update_profile(user_id):
             password=data.get('password')
         )
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/business/<int:user_id>', methods=['PUT'])
+@owner_required
 def update_business(user_id):
     data = request.get_json() or {}
     try:
@@ -48,47 +95,69 @@ def update_business(user_id):
             description=data.get('description')
         )
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/mentor-invitations/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(lambda user_id: MentorInvitation.list_version(MentorInvitation.user_id == user_id))
 def list_my_invitations(user_id):
     try:
         result, status = UserController.list_my_invitations(user_id)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
+
+@user_bp.route('/mentors/search', methods=['GET'])
+@token_required
+@conditional(lambda: User.list_version(User.role == 'mentor'))
+def search_mentors():
+    """Mentores para elegir mentora: q busca por nombre, email y emprendimiento; sin q, todos por nombre"""
+    try:
+        result, status = SearchController.search_mentors(
+            q=request.args.get('q'),
+            limit=request.args.get('limit'),
+            cursor=request.args.get('cursor'),
+        )
+        return jsonify(result), status
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/request-mentor', methods=['POST'])
+@token_required
 def request_mentor():
     data = request.get_json() or {}
-    user_id = data.get('user_id')
+    user_id, error = current_user_id(data.get('user_id'))
+    if error:
+        return error
     mentor_id = data.get('mentor_id')
     message = data.get('message')
-    if not user_id or not mentor_id:
-        return jsonify({'error': 'user_id y mentor_id son requeridos'}), 400
+    if not mentor_id:
+        return jsonify({'error': 'mentor_id es requerido'}), 400
     try:
         result, status = UserController.request_mentor(user_id=int(user_id), mentor_id=int(mentor_id), message=message)
         return jsonify(result), status
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/messages/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(conversation_version)
 def list_messages(user_id):
-    """Lista mensajes entre el usuario y su mentora"""
+    """Lista mensajes entre el usuario y su mentora (?stream=1 para historiales largos)"""
     try:
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({'error': 'Usuario no encontrado'}), 404
-        if not user.mentor_id:
+        mentor_id = assigned_mentor_id()
+        if not mentor_id:
             return jsonify({'messages': [], 'total': 0}), 200
-        msgs = (MentorMessage.query
-                .filter_by(user_id=user.id, mentor_id=user.mentor_id)
-                .order_by(MentorMessage.created_at.asc())
-                .all())
-        return jsonify({'messages': [m.to_dict() for m in msgs], 'total': len(msgs)}), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        query = (message_serializer.select()
+                 .where(MentorMessage.user_id == user_id, MentorMessage.mentor_id == mentor_id)
+                 .order_by(MentorMessage.created_at.asc()))
+        if stream_requested():
+            return stream_collection('messages', message_serializer, query)
+        msgs = message_serializer.all(query)
+        return jsonify({'messages': message_serializer.dump_many(msgs), 'total': len(msgs)}), 200
+    except Exception:
+        return internal_error(logger)
 
 def allowed_file(filename):
     """Verifica si el archivo está permitido"""
@@ -96,21 +165,22 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 @user_bp.route('/messages', methods=['POST'])
+@token_required
 def send_message():
     """Envía un mensaje del usuario a su mentora (puede incluir archivo)"""
     try:
-        user_id = request.form.get('user_id')
+        user_id, error = current_user_id(request.form.get('user_id'))
+        if error:
+            return error
         content = (request.form.get('content') or '').strip()
         file = request.files.get('file')
         
-        if not user_id:
-            return jsonify({'error': 'user_id es requerido'}), 400
-        
         # Debe haber contenido o archivo
         if not content and not file:
             return jsonify({'error': 'Debes enviar un mensaje de texto o un archivo'}), 400
         
-        user = User.query.get(int(user_id))
+        # Escritura: mentor vigente desde la base (el del token puede haber cambiado)
+        user = User.query.get(user_id)
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         if not user.mentor_id:
@@ -157,9 +227,10 @@ def send_message():
             is_read=False  # no leído por la mentora
         )
         db.session.add(msg)
+        MentorConversation.touch(user.id, user.mentor_id)
         db.session.commit()
-        return jsonify({'message': 'Enviado', 'data': msg.to_dict()}), 201
-    except Exception as e:
+        return jsonify({'message': 'Enviado', 'data': message_serializer.dump(msg)}), 201
+    except Exception:
         db.session.rollback()
         # Limpiar archivo si hubo error
         if file_path and os.path.exists(file_path):
@@ -167,9 +238,10 @@ def send_message():
                 os.remove(file_path)
             except:
                 pass
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return internal_error(logger)
 
 @user_bp.route('/messages/files/<int:message_id>', methods=['GET'])
+@token_required
 def download_file(message_id):
     """Descarga un archivo adjunto de un mensaje"""
     try:
@@ -180,75 +252,76 @@ def download_file(message_id):
         if not msg.file_path:
             return jsonify({'error': 'Este mensaje no tiene archivo adjunto'}), 404
         
-        # Verificar que el usuario tiene acceso a este mensaje
-        user_id = request.args.get('user_id')
-        if user_id:
-            user = User.query.get(int(user_id))
-            if user and (msg.user_id == user.id or msg.mentor_id == user.mentor_id):
-                # Construir ruta completa al archivo
-                # msg.file_path se guarda como "uploads/messages/nombre_archivo.extension"
-                upload_folder = Path(current_app.config['UPLOAD_FOLDER'])
-                # Si la ruta es relativa (empieza con "uploads/"), construir desde BASE_DIR
-                if msg.file_path.startswith('uploads/'):
-                    base_dir = Path(current_app.root_path).parent
-                    file_path_full = base_dir / msg.file_path
-                else:
-                    # Si es solo el nombre del archivo, buscarlo en upload_folder
-                    file_path_full = upload_folder / msg.file_path.split('/')[-1].split('\\')[-1]
-                
-                if not file_path_full.exists():
-                    return jsonify({'error': 'Archivo no encontrado en el servidor'}), 404
-                
-                return send_file(
-                    str(file_path_full),
-                    as_attachment=True,
-                    download_name=msg.file_name or 'archivo',
-                    mimetype=msg.file_type or 'application/octet-stream'
-                )
+        # Solo la dueña de la conversación puede descargar sus adjuntos
+        user_id, error = current_user_id(request.args.get('user_id'))
+        if error:
+            return error
+        if msg.user_id != user_id:
+            return jsonify({'error': 'No tienes permiso para acceder a este archivo'}), 403
+
+        # Construir ruta completa al archivo
+        # msg.file_path se guarda como "uploads/messages/nombre_archivo.extension"
+        upload_folder = Path(current_app.config['UPLOAD_FOLDER'])
+        # Si la ruta es relativa (empieza con "uploads/"), construir desde BASE_DIR
+        if msg.file_path.startswith('uploads/'):
+            base_dir = Path(current_app.root_path).parent
+            file_path_full = base_dir / msg.file_path
+        else:
+            # Si es solo el nombre del archivo, buscarlo en upload_folder
+            file_path_full = upload_folder / msg.file_path.split('/')[-1].split('\\')[-1]
+        
+        if not file_path_full.exists():
+            return jsonify({'error': 'Archivo no encontrado en el servidor'}), 404
         
-        return jsonify({'error': 'No tienes permiso para acceder a este archivo'}), 403
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return send_file(
+            str(file_path_full),
+            as_attachment=True,
+            download_name=msg.file_name or 'archivo',
+            mimetype=msg.file_type or 'application/octet-stream'
+        )
+    except Exception:
+        return internal_error(logger)
 
 @user_bp.route('/messages/read', methods=['POST'])
+@token_required
 def mark_messages_read_user():
     """Marca como leídos los mensajes del mentor hacia el usuario"""
     data = request.get_json() or {}
-    user_id = data.get('user_id')
-    if not user_id:
-        return jsonify({'error': 'user_id es requerido'}), 400
+    user_id, error = current_user_id(data.get('user_id'))
+    if error:
+        return error
     try:
-        user = User.query.get(int(user_id))
-        if not user:
-            return jsonify({'error': 'Usuario no encontrado'}), 404
-        if not user.mentor_id:
+        mentor_id = assigned_mentor_id()
+        if not mentor_id:
             return jsonify({'updated': 0}), 200
         updated = (MentorMessage.query
-                   .filter_by(user_id=user.id, mentor_id=user.mentor_id)
-                   .filter(MentorMessage.sender_id == user.mentor_id, MentorMessage.is_read.is_(False))
+                   .filter_by(user_id=user_id, mentor_id=mentor_id)
+                   .filter(MentorMessage.sender_id == mentor_id, MentorMessage.is_read.is_(False))
                    .update({MentorMessage.is_read: True}, synchronize_session=False))
+        if updated:
+            MentorConversation.touch(user_id, mentor_id)
         db.session.commit()
         return jsonify({'message': 'Mensajes marcados como leídos', 'updated': int(updated)}), 200
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+        return internal_error(logger)
 
 @user_bp.route('/messages/unread-count/<int:user_id>', methods=['GET'])
+@owner_required
+@conditional(conversation_version)
 def unread_count_user(user_id):
     """Devuelve la cantidad de mensajes no leídos del mentor al usuario"""
     try:
-        user = User.query.get(int(user_id))
-        if not user:
-            return jsonify({'error': 'Usuario no encontrado'}), 404
-        if not user.mentor_id:
+        mentor_id = assigned_mentor_id()
+        if not mentor_id:
             return jsonify({'unread': 0}), 200
         count = (db.session.query(func.count(MentorMessage.id))
-                 .filter_by(user_id=user.id, mentor_id=user.mentor_id)
-                 .filter(MentorMessage.sender_id == user.mentor_id, MentorMessage.is_read.is_(False))
+                 .filter_by(user_id=user_id, mentor_id=mentor_id)
+                 .filter(MentorMessage.sender_id == mentor_id, MentorMessage.is_read.is_(False))
                  .scalar()) or 0
         return jsonify({'unread': int(count)}), 200
-    except Exception as e:
-        return jsonify({'error': f'Error del servidor: {str(e)}'}), 500
+    except Exception:
+        return internal_error(logger)
 
 #
 
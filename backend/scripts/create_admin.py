@@ -2,6 +2,7 @@
 Script para crear un usuario administrador
 Uso: python scripts/create_admin.py
 """
+import logging
 import sys
 import os
 from pathlib import Path
@@ -10,28 +11,31 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from app import app
+from app import create_app
 from models.user import User
 from config.database import db
+from config.logging_config import configure_script_logging
+
+logger = logging.getLogger('scripts.create_admin')
 
 def create_admin(username, email, password):
     """Crea un usuario administrador"""
-    with app.app_context():
+    with create_app().app_context():
         # Verificar si el usuario ya existe
         existing_user = User.query.filter(
             (User.username == username) | (User.email == email)
         ).first()
         
         if existing_user:
-            print(f"[ERROR] El usuario '{username}' o email '{email}' ya existe")
+            logger.error(f"El usuario '{username}' o email '{email}' ya existe")
             if existing_user.is_admin():
-                print(f"   El usuario '{existing_user.username}' ya es administrador")
+                logger.info(f"El usuario '{existing_user.username}' ya es administrador")
             else:
-                print(f"   Actualizando usuario '{existing_user.username}' a administrador...")
+                logger.info(f"Actualizando usuario '{existing_user.username}' a administrador...")
                 existing_user.role = 'admin'
                 existing_user.set_password(password)
                 db.session.commit()
-                print(f"[OK] Usuario '{existing_user.username}' actualizado a administrador")
+                logger.info(f"Usuario '{existing_user.username}' actualizado a administrador")
             return
         
         # Crear nuevo usuario administrador
@@ -44,14 +48,15 @@ def create_admin(username, email, password):
             )
             db.session.add(admin_user)
             db.session.commit()
-            print(f"[OK] Usuario administrador '{username}' creado exitosamente")
-            print(f"   Email: {email}")
-            print(f"   Role: admin")
-        except Exception as e:
+            logger.info(f"Usuario administrador '{username}' creado exitosamente")
+            logger.info(f"Email: {email}")
+            logger.info("Role: admin")
+        except Exception:
             db.session.rollback()
-            print(f"[ERROR] Error al crear usuario administrador: {str(e)}")
+            logger.exception("Error al crear usuario administrador")
 
 if __name__ == '__main__':
+    configure_script_logging()
     print("=" * 50)
     print("Crear Usuario Administrador")
     print("=" * 50)
@@ -2,6 +2,7 @@
 Script simplificado para crear un usuario administrador
 Uso: python scripts/create_admin_simple.py
 """
+import logging
 import sys
 from pathlib import Path
 
@@ -9,28 +10,31 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from app import app
+from app import create_app
 from models.user import User
 from config.database import db
+from config.logging_config import configure_script_logging
+
+logger = logging.getLogger('scripts.create_admin_simple')
 
 def create_admin(username='admin', email='admin@proyecto.com', password='admin123'):
     """Crea un usuario administrador con valores por defecto"""
-    with app.app_context():
+    with create_app().app_context():
         # Verificar si el usuario ya existe
         existing_user = User.query.filter(
             (User.username == username) | (User.email == email)
         ).first()
         
         if existing_user:
-            print(f"[INFO] El usuario '{username}' o email '{email}' ya existe")
+            logger.info(f"El usuario '{username}' o email '{email}' ya existe")
             if existing_user.is_admin():
-                print(f"[OK] El usuario '{existing_user.username}' ya es administrador")
+                logger.info(f"El usuario '{existing_user.username}' ya es administrador")
             else:
-                print(f"[INFO] Actualizando usuario '{existing_user.username}' a administrador...")
+                logger.info(f"Actualizando usuario '{existing_user.username}' a administrador...")
                 existing_user.role = 'admin'
                 existing_user.set_password(password)
                 db.session.commit()
-                print(f"[OK] Usuario '{existing_user.username}' actualizado a administrador")
+                logger.info(f"Usuario '{existing_user.username}' actualizado a administrador")
             return existing_user
         
         # Crear nuevo usuario administrador
@@ -43,16 +47,17 @@ def create_admin(username='admin', email='admin@proyecto.com', password='admin12
             )
             db.session.add(admin_user)
             db.session.commit()
-            print(f"[OK] Usuario administrador '{username}' creado exitosamente")
-            print(f"   Email: {email}")
-            print(f"   Role: admin")
+            logger.info(f"Usuario administrador '{username}' creado exitosamente")
+            logger.info(f"Email: {email}")
+            logger.info("Role: admin")
             return admin_user
-        except Exception as e:
+        except Exception:
             db.session.rollback()
-            print(f"[ERROR] Error al crear usuario administrador: {str(e)}")
+            logger.exception("Error al crear usuario administrador")
             raise
 
 if __name__ == '__main__':
+    configure_script_logging()
     print("=" * 50)
     print("Crear Usuario Administrador")
     print("=" * 50)
@@ -2,6 +2,7 @@
 Script simplificado para crear un usuario mentor
 Uso: python scripts/create_mentor_simple.py
 """
+import logging
 import sys
 from pathlib import Path
 
@@ -9,28 +10,31 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from app import app
+from app import create_app
 from models.user import User
 from config.database import db
+from config.logging_config import configure_script_logging
+
+logger = logging.getLogger('scripts.create_mentor_simple')
 
 def create_mentor(username='mentor', email='mentor@proyecto.com', password='mentor123'):
     """Crea un usuario mentor con valores por defecto"""
-    with app.app_context():
+    with create_app().app_context():
         # Verificar si el usuario ya existe
         existing_user = User.query.filter(
             (User.username == username) | (User.email == email)
         ).first()
         
         if existing_user:
-            print(f"[INFO] El usuario '{username}' o email '{email}' ya existe")
+            logger.info(f"El usuario '{username}' o email '{email}' ya existe")
             if existing_user.is_mentor():
-                print(f"[OK] El usuario '{existing_user.username}' ya es mentor")
+                logger.info(f"El usuario '{existing_user.username}' ya es mentor")
             else:
-                print(f"[INFO] Actualizando usuario '{existing_user.username}' a mentor...")
+                logger.info(f"Actualizando usuario '{existing_user.username}' a mentor...")
                 existing_user.role = 'mentor'
                 existing_user.set_password(password)
                 db.session.commit()
-                print(f"[OK] Usuario '{existing_user.username}' actualizado a mentor")
+                logger.info(f"Usuario '{existing_user.username}' actualizado a mentor")
             return existing_user
         
         # Crear nuevo usuario mentor
@@ -43,16 +47,17 @@ def create_mentor(username='mentor', email='mentor@proyecto.com', password='ment
             )
             db.session.add(mentor_user)
             db.session.commit()
-            print(f"[OK] Usuario mentor '{username}' creado exitosamente")
-            print(f"   Email: {email}")
-            print(f"   Role: mentor")
+            logger.info(f"Usuario mentor '{username}' creado exitosamente")
+            logger.info(f"Email: {email}")
+            logger.info("Role: mentor")
             return mentor_user
-        except Exception as e:
+        except Exception:
             db.session.rollback()
-            print(f"[ERROR] Error al crear usuario mentor: {str(e)}")
+            logger.exception("Error al crear usuario mentor")
             raise
 
 if __name__ == '__main__':
+    configure_script_logging()
     print("=" * 50)
     print("Crear Usuario Mentor")
     print("=" * 50)
@@ -7,13 +7,13 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
 
-from app import app
+from app import create_app
 from models.user import User
 from config.database import db
 
 def verify_admins():
     """Muestra todos los usuarios administradores"""
-    with app.app_context():
+    with create_app().app_context():
         admins = User.query.filter_by(role='admin').all()
         
         if not admins:
@@ -0,0 +1,6 @@
+# Paquete de serializadores (forma del JSON de cada endpoint y su plan de carga)
+from .user import UserSerializer, MentorSummarySerializer
+from .mentor_invitation import MentorInvitationSerializer
+from .mentor_message import MentorMessageSerializer
+from .daily_sale import DailySaleSerializer, MonthlyParametersSerializer
+from .user_purge import UserPurgeSerializer
@@ -0,0 +1,219 @@
+"""
+Serializadores declarativos.
+
+Cada serializador declara la forma del JSON que devuelve un endpoint y, a partir de esa
+declaración, arma las opciones de carga de la consulta antes de ejecutarla:
+- Field: columna del modelo (solo se cargan las columnas declaradas, load_only).
+- Group: varias columnas del mismo modelo agrupadas en un objeto ('business': {...}).
+- Nested: relación, cargada con joinedload (muchos-a-uno) o selectinload (colecciones).
+- Computed: expresión SQL (p. ej. una subconsulta de conteo) en un atributo query_expression()
+  del modelo, calculada en la misma consulta con with_expression.
+- Method: valor derivado en Python de otras columnas ya cargadas.
+Los valores de columna se devuelven tal cual (datetime, date, Decimal): el proveedor JSON
+(config/json_provider.py) los codifica de forma nativa al escribir la respuesta.
+
+Uso:
+    serializer = UserSerializer(only=['id', 'username', 'mentor'])
+    users = serializer.all(serializer.select().where(User.role == 'user'))
+    data = serializer.dump_many(users)
+Para colecciones muy grandes, config/streaming.py escribe la respuesta a medida que
+Serializer.stream() lee las filas.
+"""
+from sqlalchemy.orm import joinedload, load_only, selectinload, with_expression
+
+from config.database import db
+
+
+class Field:
+    """Columna del modelo; default se usa cuando el valor es None"""
+
+    def __init__(self, attr=None, default=None):
+        self.attr = attr
+        self.default = default
+
+    def bind(self, model, name):
+        self.attr = self.attr or name
+        if self.attr not in model.__mapper__.columns:
+            raise AttributeError(f"{model.__name__} no tiene la columna {self.attr}")
+
+    def columns(self):
+        return [self.attr]
+
+    def options(self, model):
+        return []
+
+    def dump(self, obj):
+        value = getattr(obj, self.attr)
+        return self.default if value is None else value
+
+
+class Group:
+    """Varias columnas del mismo objeto agrupadas en un diccionario"""
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def bind(self, model, name):
+        for key, field in self.fields.items():
+            field.bind(model, key)
+
+    def columns(self):
+        return [column for field in self.fields.values() for column in field.columns()]
+
+    def options(self, model):
+        return []
+
+    def dump(self, obj):
+        return {key: field.dump(obj) for key, field in self.fields.items()}
+
+
+class Method:
+    """Valor calculado en Python; requires indica las columnas que necesita"""
+
+    def __init__(self, fn, requires=()):
+        self.fn = fn
+        self.requires = list(requires)
+
+    def bind(self, model, name):
+        pass
+
+    def columns(self):
+        return self.requires
+
+    def options(self, model):
+        return []
+
+    def dump(self, obj):
+        return self.fn(obj)
+
+
+class Computed:
+    """
+    Expresión SQL cargada en un atributo query_expression() del modelo.
+    expression es una función que construye la expresión; fallback(obj) calcula el valor
+    solo cuando el objeto no se cargó con este serializador (p. ej. recién creado).
+    """
+
+    def __init__(self, expression, fallback=None, attr=None, convert=None):
+        self.expression = expression
+        self.fallback = fallback
+        self.attr = attr
+        self.convert = convert
+
+    def bind(self, model, name):
+        self.attr = self.attr or name
+
+    def columns(self):
+        return []
+
+    def options(self, model):
+        return [with_expression(getattr(model, self.attr), self.expression())]
+
+    def dump(self, obj):
+        if self.attr in obj.__dict__:
+            # Cargado con with_expression (NULL incluido): sin consultas extra
+            value = obj.__dict__[self.attr]
+        elif self.fallback is not None:
+            value = self.fallback(obj)
+        else:
+            value = None
+        if value is None:
+            return None
+        return self.convert(value) if self.convert else value
+
+
+class Nested:
+    """
+    Relación serializada con otro serializador.
+    strategy='joined' (JOIN en la misma consulta, para muchos-a-uno) o 'selectin'
+    (una consulta extra con IN para toda la página, para colecciones).
+    """
+
+    def __init__(self, relationship, serializer, strategy='joined'):
+        if strategy not in ('joined', 'selectin'):
+            raise ValueError(f"Estrategia de carga desconocida: {strategy}")
+        self.relationship = relationship
+        self.serializer = serializer
+        self.strategy = strategy
+
+    def bind(self, model, name):
+        if self.strategy == 'joined' and any(isinstance(f, Computed) for f in self.serializer.fields.values()):
+            # with_expression no se aplica sobre el alias del JOIN
+            raise TypeError(f"{name}: los campos Computed anidados requieren strategy='selectin'")
+        self.child = self.serializer()
+
+    def columns(self):
+        return []
+
+    def options(self, model):
+        loader = joinedload if self.strategy == 'joined' else selectinload
+        return [loader(getattr(model, self.relationship)).options(*self.child.options())]
+
+    def dump(self, obj):
+        related = getattr(obj, self.relationship)
+        if related is None:
+            return None
+        if isinstance(related, (list, tuple, set)):
+            return self.child.dump_many(related)
+        return self.child.dump(related)
+
+
+class Serializer:
+    """Base de los serializadores: las subclases definen model y fields (nombre -> declaración)"""
+
+    model = None
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, field in cls.fields.items():
+            field.bind(cls.model, name)
+
+    def __init__(self, only=None, exclude=()):
+        names = list(only) if only is not None else list(self.fields)
+        unknown = [name for name in list(names) + list(exclude) if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+        self.selected = [(name, self.fields[name]) for name in names if name not in exclude]
+
+    def options(self, extra=()):
+        """
+        Opciones de carga (load_only, joinedload/selectinload, with_expression) para estos campos.
+        extra: nombres de columnas adicionales que necesita el llamador (p. ej. la clave del cursor).
+        """
+        model = self.model
+        attrs = list(extra)
+        for _, field in self.selected:
+            for column in field.columns():
+                if column not in attrs:
+                    attrs.append(column)
+        options = [load_only(*(getattr(model, attr) for attr in attrs))] if attrs else []
+        for _, field in self.selected:
+            options.extend(field.options(model))
+        return options
+
+    def select(self, extra=()):
+        """select(model) con las opciones de carga ya aplicadas"""
+        return db.select(self.model).options(*self.options(extra))
+
+    @staticmethod
+    def all(statement):
+        return db.session.execute(statement).scalars().unique().all()
+
+    @staticmethod
+    def stream(statement, batch_size):
+        """
+        Objetos leídos de a batch_size filas con un cursor del lado del servidor (yield_per).
+        Solo admite Nested 'joined' de muchos-a-uno o 'selectin'; los objetos ya recorridos se liberan.
+        """
+        return db.session.execute(statement.execution_options(yield_per=batch_size)).scalars()
+
+    @staticmethod
+    def first(statement):
+        return db.session.execute(statement.limit(1)).scalars().unique().first()
+
+    def dump(self, obj):
+        return {name: field.dump(obj) for name, field in self.selected}
+
+    def dump_many(self, objs):
+        return [self.dump(obj) for obj in objs]
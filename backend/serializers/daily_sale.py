@@ -0,0 +1,67 @@
+"""Serializadores de ventas diarias y parámetros mensuales"""
+from models.daily_sale import DailySale, MonthlyParameters
+from serializers.base import Field, Method, Serializer
+
+
+def _amount(units, price):
+    """units * price en Decimal (el proveedor JSON lo escribe como número); 0.0 si falta un valor"""
+    if not units or not price:
+        return 0.0
+    return units * price
+
+
+def _gross_profit(sale):
+    if not sale.units_sold or not sale.price_per_unit or not sale.variable_cost_per_unit:
+        return 0.0
+    return sale.units_sold * (sale.price_per_unit - sale.variable_cost_per_unit)
+
+
+class DailySaleSerializer(Serializer):
+    model = DailySale
+    fields = {
+        'id': Field(),
+        'user_id': Field(),
+        'sale_date': Field(),
+        'product_name': Field(),
+        'units_sold': Field(default=0),
+        'price_per_unit': Field(default=0.0),
+        'variable_cost_per_unit': Field(default=0.0),
+        'revenue': Method(lambda s: _amount(s.units_sold, s.price_per_unit),
+                          requires=('units_sold', 'price_per_unit')),
+        'total_variable_costs': Method(lambda s: _amount(s.units_sold, s.variable_cost_per_unit),
+                                       requires=('units_sold', 'variable_cost_per_unit')),
+        'gross_profit': Method(_gross_profit, requires=('units_sold', 'price_per_unit', 'variable_cost_per_unit')),
+        'created_at': Field(),
+        'updated_at': Field(),
+    }
+
+
+def _daily_target_units(params):
+    if not params.working_days_per_month or params.working_days_per_month <= 0:
+        return 0
+    return int(params.target_monthly_sales / params.working_days_per_month)
+
+
+def _daily_fixed_costs(params):
+    if not params.working_days_per_month or params.working_days_per_month <= 0:
+        return 0.0
+    return params.fixed_costs_monthly / params.working_days_per_month
+
+
+class MonthlyParametersSerializer(Serializer):
+    model = MonthlyParameters
+    fields = {
+        'id': Field(),
+        'user_id': Field(),
+        'target_monthly_sales': Field(default=0),
+        'fixed_costs_monthly': Field(default=0.0),
+        'loan_monthly_payment': Field(default=0.0),
+        'working_days_per_month': Field(default=30),
+        'default_price_per_unit': Field(),
+        'default_variable_cost_per_unit': Field(),
+        'month_year': Field(),
+        'daily_target_units': Method(_daily_target_units, requires=('target_monthly_sales', 'working_days_per_month')),
+        'daily_fixed_costs': Method(_daily_fixed_costs, requires=('fixed_costs_monthly', 'working_days_per_month')),
+        'created_at': Field(),
+        'updated_at': Field(),
+    }
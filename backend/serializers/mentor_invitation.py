@@ -0,0 +1,41 @@
+"""Serializadores de invitaciones a mentores"""
+from models.mentor_invitation import MentorInvitation
+from models.user import User
+from serializers.base import Field, Group, Nested, Serializer
+
+
+class InvitationUserSerializer(Serializer):
+    """Usuario que invita, con su emprendimiento para que el mentor decida"""
+    model = User
+    fields = {
+        'id': Field(),
+        'username': Field(),
+        'email': Field(),
+        'business': Group(
+            name=Field('business_name'),
+            category=Field('business_category'),
+            description=Field('business_description'),
+        ),
+    }
+
+
+class InvitationMentorSerializer(Serializer):
+    model = User
+    fields = {
+        'id': Field(),
+        'username': Field(),
+        'email': Field(),
+    }
+
+
+class MentorInvitationSerializer(Serializer):
+    model = MentorInvitation
+    fields = {
+        'id': Field(),
+        'user': Nested('user', InvitationUserSerializer),
+        'mentor': Nested('mentor', InvitationMentorSerializer),
+        'status': Field(),
+        'message': Field(),
+        'created_at': Field(),
+        'responded_at': Field(),
+    }
@@ -0,0 +1,20 @@
+"""Serializador de mensajes entre usuario y mentora"""
+from models.mentor_message import MentorMessage
+from serializers.base import Field, Serializer
+
+
+class MentorMessageSerializer(Serializer):
+    model = MentorMessage
+    fields = {
+        'id': Field(),
+        'user_id': Field(),
+        'mentor_id': Field(),
+        'sender_id': Field(),
+        'content': Field(),
+        'file_name': Field(),
+        'file_path': Field(),
+        'file_type': Field(),
+        'file_size': Field(),
+        'is_read': Field(),
+        'created_at': Field(),
+    }
@@ -0,0 +1,53 @@
+"""Serializadores de usuarios"""
+from sqlalchemy.orm import aliased
+
+from config.database import db
+from models.user import User
+from serializers.base import Computed, Field, Group, Nested, Serializer
+
+
+def _assigned_users_count():
+    """Subconsulta correlacionada: usuarios asignados, solo para mentores (índice por mentor_id)"""
+    assigned = aliased(User)
+    count = (db.select(db.func.count(assigned.id))
+             .where(assigned.mentor_id == User.id)
+             .correlate(User)
+             .scalar_subquery())
+    return db.case((User.role == 'mentor', count), else_=None)
+
+
+def _count_assigned(user):
+    if user.role != 'mentor':
+        return None
+    return db.session.query(db.func.count(User.id)).filter(User.mentor_id == user.id).scalar()
+
+
+class MentorSummarySerializer(Serializer):
+    """Mentor asignado dentro de un usuario"""
+    model = User
+    fields = {
+        'id': Field(),
+        'username': Field(),
+        'email': Field(),
+        'role': Field(),
+    }
+
+
+class UserSerializer(Serializer):
+    """Usuario completo (perfil, listados de admin y de mentor)"""
+    model = User
+    fields = {
+        'id': Field(),
+        'username': Field(),
+        'email': Field(),
+        'role': Field(),
+        'mentor_id': Field(),
+        'mentor': Nested('mentor', MentorSummarySerializer),
+        'business': Group(
+            name=Field('business_name'),
+            category=Field('business_category'),
+            description=Field('business_description'),
+        ),
+        'assigned_users_count': Computed(_assigned_users_count, fallback=_count_assigned),
+        'created_at': Field(),
+    }
@@ -0,0 +1,33 @@
+"""Serializadores de purgas de usuarios"""
+from models.user_purge import UserPurge
+from serializers.base import Field, Method, Serializer
+
+
+def _progress(purge):
+    """Porcentaje de filas dependientes ya borradas (None mientras no se contaron)"""
+    if purge.status == 'done':
+        return 100.0
+    if not purge.total_rows:
+        return None
+    return round(min(purge.deleted_rows / purge.total_rows, 1.0) * 100, 1)
+
+
+class UserPurgeSerializer(Serializer):
+    model = UserPurge
+    fields = {
+        'id': Field(),
+        'user_id': Field(),
+        'username': Field(),
+        'email': Field(),
+        'role': Field(),
+        'requested_by': Field(),
+        'status': Field(),
+        'total_rows': Field(),
+        'deleted_rows': Field(),
+        'deleted_files': Field(),
+        'progress': Method(_progress, requires=('status', 'total_rows', 'deleted_rows')),
+        'error': Field(),
+        'created_at': Field(),
+        'started_at': Field(),
+        'finished_at': Field(),
+    }
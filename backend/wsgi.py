@@ -0,0 +1,10 @@
+"""
+Punto de entrada WSGI para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+create_app() no abre conexiones, así que importar este módulo (también con preload_app) es barato.
+"""
+from app import create_app
+
+app = create_app()
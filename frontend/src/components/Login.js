@@ -85,11 +85,10 @@ const Login = () => {
           setError(response.error);
         } else {
           setSuccess('Login exitoso');
-          // Aquí guardarías el token y redirigirías
+          // Guardar usuario y token firmado; api.js lo envía como Bearer en cada petición
           if (response.user) {
             localStorage.setItem('user', JSON.stringify(response.user));
-            // En producción, aquí guardarías el token JWT
-            // localStorage.setItem('token', response.token);
+            localStorage.setItem('token', response.token);
             setTimeout(() => {
               // Redirigir al Dashboard
               window.location.href = '/dashboard';
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { userService, adminService } from '../services/api';
+import { userService } from '../services/api';
 import './UserManagement.css';
 
 const Overlay = ({ children, onClose }) => (
@@ -30,6 +30,7 @@ const ProfileModal = ({ open, onClose }) => {
   });
   const [mentors, setMentors] = useState([]);
   const [selectedMentorId, setSelectedMentorId] = useState('');
+  const [mentorQuery, setMentorQuery] = useState('');
   const [inviteMessage, setInviteMessage] = useState('');
   const [invitations, setInvitations] = useState([]);
   const [loading, setLoading] = useState(false);
@@ -42,7 +43,7 @@ const ProfileModal = ({ open, onClose }) => {
       try {
         const [profileResp, mentorsResp, invitesResp] = await Promise.all([
           userService.getProfile(storedUser.id),
-          adminService.getAllMentors(),
+          userService.searchMentors(),
           userService.listMyInvitations(storedUser.id),
         ]);
         const u = profileResp.user;
@@ -63,6 +64,21 @@ const ProfileModal = ({ open, onClose }) => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [open]);
 
+  useEffect(() => {
+    if (!open) return undefined;
+    // Busca en el servidor mientras se escribe (300 ms sin teclear)
+    const timer = setTimeout(async () => {
+      try {
+        const resp = await userService.searchMentors(mentorQuery.trim());
+        setMentors(resp.mentors || []);
+      } catch {
+        // noop
+      }
+    }, 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [mentorQuery]);
+
   if (!open) return null;
 
   const handleUpdateProfile = async (e) => {
@@ -177,6 +193,11 @@ const ProfileModal = ({ open, onClose }) => {
             <form className="form-compact" onSubmit={handleRequestMentor}>
               <div className="form-row">
                 <label>Seleccionar Mentor</label>
+                <input
+                  value={mentorQuery}
+                  onChange={(e) => setMentorQuery(e.target.value)}
+                  placeholder="Buscar por nombre, email o emprendimiento"
+                />
                 <select value={selectedMentorId} onChange={(e) => setSelectedMentorId(e.target.value)}>
                   <option value="">Seleccione un mentor</option>
                   {mentors.map(m => (
@@ -13,6 +13,7 @@ const UserManagement = () => {
   const [editingUser, setEditingUser] = useState(null);
   const [assigningUser, setAssigningUser] = useState(null);
   const [selectedMentorId, setSelectedMentorId] = useState('');
+  const [search, setSearch] = useState('');
   const [formData, setFormData] = useState({
     username: '',
     email: '',
@@ -21,15 +22,24 @@ const UserManagement = () => {
   });
 
   useEffect(() => {
-    loadUsers();
     loadMentors();
   }, []);
 
+  useEffect(() => {
+    // Con texto busca en el servidor (300 ms después de dejar de escribir); vacío lista todos
+    const timer = setTimeout(loadUsers, search ? 300 : 0);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [search]);
+
   const loadUsers = async () => {
     try {
       setLoading(true);
       setError('');
-      const response = await adminService.getAllUsers();
+      const query = search.trim();
+      const response = query
+        ? await adminService.searchUsers(query, { limit: 200 })
+        : await adminService.getAllUsers();
       if (response.error) {
         setError(response.error);
       } else {
@@ -186,6 +196,13 @@ const UserManagement = () => {
     <div className="user-management">
       <div className="management-header">
         <h2>Gestión de Emprendedores</h2>
+        <input
+          type="search"
+          className="search-input"
+          value={search}
+          onChange={(e) => setSearch(e.target.value)}
+          placeholder="Buscar por nombre, email o emprendimiento"
+        />
         <button onClick={handleCreate} className="btn-primary">
           + Crear Emprendedor
         </button>
@@ -211,7 +228,7 @@ const UserManagement = () => {
             {users.length === 0 ? (
               <tr>
                 <td colSpan="7" className="no-users">
-                  No hay emprendedores registrados
+                  {search ? 'Sin resultados para la búsqueda' : 'No hay emprendedores registrados'}
                 </td>
               </tr>
             ) : (
@@ -24,6 +24,20 @@ api.interceptors.request.use(
   }
 );
 
+// Token expirado o inválido: limpiar la sesión y volver al login
+api.interceptors.response.use(
+  (response) => response,
+  (error) => {
+    const isLogin = error.config && error.config.url === '/auth/login';
+    if (error.response && error.response.status === 401 && !isLogin && localStorage.getItem('token')) {
+      localStorage.removeItem('user');
+      localStorage.removeItem('token');
+      window.location.href = '/login';
+    }
+    return Promise.reject(error);
+  }
+);
+
 export const authService = {
   login: async (username, password) => {
     const response = await api.post('/auth/login', { username, password });
@@ -39,11 +53,34 @@ export const authService = {
     const response = await api.get('/auth/me');
     return response.data;
   },
+
+  refreshToken: async () => {
+    const response = await api.post('/auth/refresh');
+    return response.data;
+  },
 };
 
 export const adminService = {
-  getAllUsers: async () => {
-    const response = await api.get('/admin/users');
+  getUsersPage: async (params = {}) => {
+    const response = await api.get('/admin/users', { params });
+    return response.data;
+  },
+
+  getAllUsers: async (params = {}) => {
+    // Recorre todas las páginas del listado por cursor
+    const users = [];
+    let cursor = null;
+    do {
+      const page = await adminService.getUsersPage({ limit: 200, ...params, ...(cursor ? { cursor } : {}) });
+      users.push(...page.users);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return { users, total: users.length };
+  },
+
+  searchUsers: async (q, params = {}) => {
+    // Búsqueda en el servidor por nombre, email y emprendimiento, ordenada por relevancia
+    const response = await api.get('/admin/users/search', { params: { q, ...params } });
     return response.data;
   },
   
@@ -57,15 +94,37 @@ export const adminService = {
     return response.data;
   },
   
+  importUsers: async (file, { mentorId = null, dryRun = false } = {}) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    if (mentorId) formData.append('mentor_id', mentorId);
+    if (dryRun) formData.append('dry_run', '1');
+    const response = await api.post('/admin/users/import', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
   updateUser: async (userId, userData) => {
     const response = await api.put(`/admin/users/${userId}`, userData);
     return response.data;
   },
   
+  // Responde 202: la baja es inmediata y los datos se borran en segundo plano (ver getPurge)
   deleteUser: async (userId) => {
     const response = await api.delete(`/admin/users/${userId}`);
     return response.data;
   },
+
+  getPurges: async (status = null) => {
+    const response = await api.get('/admin/purges', { params: status ? { status } : {} });
+    return response.data;
+  },
+
+  getPurge: async (purgeId) => {
+    const response = await api.get(`/admin/purges/${purgeId}`);
+    return response.data;
+  },
   
   getAllMentors: async () => {
     const response = await api.get('/admin/mentors');
@@ -81,16 +140,51 @@ export const adminService = {
     const response = await api.post(`/admin/users/${userId}/assign-mentor`, { mentor_id: mentorId });
     return response.data;
   },
+
+  // Operaciones masivas (una transacción en el servidor); dryRun solo valida
+  bulkReassign: async ({ userIds = null, fromMentorId = null, mentorId = null, dryRun = false }) => {
+    const body = { mentor_id: mentorId, dry_run: dryRun };
+    if (fromMentorId) body.from_mentor_id = fromMentorId;
+    else body.user_ids = userIds;
+    const response = await api.post('/admin/users/bulk/reassign', body);
+    return response.data;
+  },
+
+  bulkChangeRole: async (userIds, role, dryRun = false) => {
+    const response = await api.post('/admin/users/bulk/role', { user_ids: userIds, role, dry_run: dryRun });
+    return response.data;
+  },
+
+  bulkDelete: async (userIds, dryRun = false) => {
+    const response = await api.post('/admin/users/bulk/delete', { user_ids: userIds, dry_run: dryRun });
+    return response.data;
+  },
+
+  // Asignación automática de mentores a las usuarias sin mentor; dryRun devuelve la propuesta
+  matchMentors: async ({ capacity = null, dryRun = false } = {}) => {
+    const response = await api.post('/admin/mentors/match', { capacity, dry_run: dryRun });
+    return response.data;
+  },
 };
 
 export const biService = {
-  getStatistics: async () => {
-    const response = await api.get('/admin/bi/statistics');
+  // Snapshot de hasta BI_SNAPSHOT_MAX_AGE segundos; refresh fuerza el recálculo
+  getStatistics: async (refresh = false) => {
+    const response = await api.get('/admin/bi/statistics', { params: refresh ? { refresh: 1 } : {} });
     return response.data;
   },
   
-  getMentorPerformance: async () => {
-    const response = await api.get('/admin/bi/mentor-performance');
+  // Scorecard calculado una vez por día; refresh fuerza el recálculo
+  getMentorPerformance: async (refresh = false) => {
+    const response = await api.get('/admin/bi/mentor-performance', { params: refresh ? { refresh: 1 } : {} });
+    return response.data;
+  },
+
+  // Ventas de la plataforma; groupBy: 'month', 'category' y/o 'mentor' separados por coma
+  getSalesAnalytics: async ({ groupBy = 'month', monthFrom, monthTo, category, mentorId } = {}) => {
+    const response = await api.get('/admin/bi/sales', {
+      params: { group_by: groupBy, month_from: monthFrom, month_to: monthTo, category, mentor_id: mentorId },
+    });
     return response.data;
   },
 };
@@ -174,6 +268,11 @@ export const userService = {
     const response = await api.get(`/user/mentor-invitations/${userId}`);
     return response.data;
   },
+  searchMentors: async (q = '', params = {}) => {
+    // Sin q devuelve la primera página de mentores por nombre
+    const response = await api.get('/user/mentors/search', { params: { ...(q ? { q } : {}), ...params } });
+    return response.data;
+  },
   requestMentor: async (userId, mentorId, message) => {
     const response = await api.post(`/user/request-mentor`, { user_id: userId, mentor_id: mentorId, message });
     return response.data;